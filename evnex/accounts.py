@@ -0,0 +1,301 @@
+"""Many EVNEX accounts, and all their organisations, in one process.
+
+An operator managing chargers for many customers holds one session per
+customer account, and each account may belong to several organisations.
+AccountManager hosts them all over a single shared connection pool:
+
+    async with AccountManager(rate=20) as manager:
+        manager.add("acme", EvnexAuth(tokens=acme_tokens))
+        manager.add("globex", EvnexAuth(tokens=globex_tokens))
+        await manager.discover()
+        summaries = await manager.summary_status()
+        for org, summary in summaries.items():
+            print(org.account, org.name, summary)
+
+- Each account gets an equal share of ``rate`` (requests per second) through
+  its own TokenBucket, so one busy account cannot starve the others.
+- While the manager is entered, a background task refreshes each account's
+  session ahead of expiry, staggered so that sessions created together do
+  not all refresh against Cognito at the same moment.
+- The fan-out calls run one call per organisation across every account, at
+  most ``concurrency`` at a time, and report a failure per organisation
+  instead of failing the whole call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from functools import partial
+from typing import Any, TypeVar
+
+from httpx import AsyncClient
+
+from evnex.api import Evnex
+from evnex.auth import EvnexAuth
+from evnex.ratelimit import TokenBucket
+from evnex.schema.charge_points import EvnexChargePoint
+from evnex.schema.org import EvnexOrgInsightEntry, EvnexOrgSummaryStatus
+
+logger = logging.getLogger("evnex.accounts")
+
+T = TypeVar("T")
+
+# How long to wait before retrying a session refresh that failed
+REFRESH_RETRY = timedelta(minutes=1)
+
+
+@dataclass(frozen=True, slots=True)
+class OrgContext:
+    """One organisation, as seen through one account."""
+
+    account: str
+    org_id: str
+    name: str
+
+
+class Account:
+    """A named session with its own client, rate share and organisations."""
+
+    def __init__(self, name: str, client: Evnex, limiter: TokenBucket) -> None:
+        self.name = name
+        self.client = client
+        self.limiter = limiter
+        self.orgs: list[OrgContext] = []
+
+    @property
+    def auth(self) -> EvnexAuth:
+        return self.client.auth
+
+    def __repr__(self) -> str:
+        return f"Account({self.name!r}, orgs={len(self.orgs)})"
+
+
+class AccountManager:
+    """Hosts many accounts over one connection pool.
+
+    :param rate: requests per second shared fairly between the accounts
+    :param concurrency: calls in flight at once in the fan-out methods
+    :param refresh_lead: refresh a session this long before it expires
+    :param httpx_client: share an existing httpx AsyncClient; otherwise the
+        manager creates one and closes it on exit
+    :param client_options: passed on to each account's Evnex (config,
+        hedging, ...)
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: float = 10.0,
+        concurrency: int = 10,
+        refresh_lead: timedelta = timedelta(minutes=5),
+        httpx_client: AsyncClient | None = None,
+        **client_options: Any,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.rate = rate
+        self.concurrency = concurrency
+        self.refresh_lead = refresh_lead
+        self._owns_client = httpx_client is None
+        self.httpx_client = httpx_client
+        self._client_options = client_options
+        self._accounts: dict[str, Account] = {}
+        self._refresher: asyncio.Task[None] | None = None
+        # Accounts whose last refresh failed, and when to try them again
+        self._retry_at: dict[str, datetime] = {}
+        self._changed = asyncio.Event()
+
+    async def __aenter__(self) -> AccountManager:
+        if self.httpx_client is None:
+            # Building the httpx client loads the CA bundle from disk
+            self.httpx_client = await asyncio.to_thread(AsyncClient)
+        self._refresher = asyncio.create_task(self._refresh_sessions())
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._refresher is not None:
+            self._refresher.cancel()
+            await asyncio.gather(self._refresher, return_exceptions=True)
+            self._refresher = None
+        if self._owns_client and self.httpx_client is not None:
+            await self.httpx_client.aclose()
+
+    # --- Accounts -----------------------------------------------------------
+
+    @property
+    def accounts(self) -> list[Account]:
+        return list(self._accounts.values())
+
+    def account(self, name: str) -> Account:
+        return self._accounts[name]
+
+    def add(self, name: str, auth: EvnexAuth) -> Account:
+        """Host another account; its org list is filled in by discover()."""
+        if self.httpx_client is None:
+            raise RuntimeError(
+                "Enter the AccountManager (or pass httpx_client) before adding accounts"
+            )
+        if name in self._accounts:
+            raise ValueError(f"Account {name!r} is already managed")
+        limiter = TokenBucket(self.rate)
+        client = Evnex(
+            auth=auth,
+            httpx_client=self.httpx_client,
+            rate_limiter=limiter,
+            **self._client_options,
+        )
+        account = Account(name, client, limiter)
+        self._accounts[name] = account
+        self._rebalance()
+        return account
+
+    def remove(self, name: str) -> None:
+        del self._accounts[name]
+        self._retry_at.pop(name, None)
+        self._rebalance()
+
+    def _rebalance(self) -> None:
+        # Each account's fair share; the burst stays at least one request
+        share = self.rate / max(1, len(self._accounts))
+        for account in self._accounts.values():
+            account.limiter.rate = share
+        self._changed.set()
+
+    async def discover(self) -> list[OrgContext]:
+        """Look up every account's organisations; returns them all.
+
+        An account whose lookup fails keeps its previous org list, and the
+        failure is logged.
+        """
+
+        async def discover_one(account: Account) -> None:
+            user = await account.client.get_user_detail()
+            account.orgs = [
+                OrgContext(account.name, org.id, org.name) for org in user.organisations
+            ]
+
+        results = await self._bounded(
+            [partial(discover_one, account) for account in self.accounts]
+        )
+        for account, result in zip(self.accounts, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.warning(
+                    f"Could not list {account.name}'s organisations: {result}"
+                )
+        return self.orgs()
+
+    def orgs(self) -> list[OrgContext]:
+        return [org for account in self._accounts.values() for org in account.orgs]
+
+    # --- Fan-out ------------------------------------------------------------
+
+    async def _bounded(
+        self, calls: list[Callable[[], Awaitable[T]]]
+    ) -> list[T | BaseException]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(call: Callable[[], Awaitable[T]]) -> T:
+            async with semaphore:
+                return await call()
+
+        return await asyncio.gather(
+            *(run(call) for call in calls), return_exceptions=True
+        )
+
+    async def fan_out(
+        self,
+        call: Callable[[Evnex, str], Awaitable[T]],
+        orgs: list[OrgContext] | None = None,
+    ) -> dict[OrgContext, T | BaseException]:
+        """Run ``await call(client, org_id)`` for every organisation.
+
+        Each result, or the exception its call raised, is keyed by its org.
+        """
+        targets = self.orgs() if orgs is None else orgs
+        results = await self._bounded(
+            [
+                partial(call, self._accounts[org.account].client, org.org_id)
+                for org in targets
+            ]
+        )
+        return dict(zip(targets, results, strict=True))
+
+    async def summary_status(
+        self, orgs: list[OrgContext] | None = None
+    ) -> dict[OrgContext, EvnexOrgSummaryStatus | BaseException]:
+        return await self.fan_out(
+            lambda client, org_id: client.get_org_summary_status(org_id), orgs
+        )
+
+    async def charge_points(
+        self, orgs: list[OrgContext] | None = None
+    ) -> dict[OrgContext, list[EvnexChargePoint] | BaseException]:
+        return await self.fan_out(
+            lambda client, org_id: client.get_org_charge_points(org_id), orgs
+        )
+
+    async def insights(
+        self, days: int, orgs: list[OrgContext] | None = None
+    ) -> dict[OrgContext, list[EvnexOrgInsightEntry] | BaseException]:
+        return await self.fan_out(
+            lambda client, org_id: client.get_org_insight(days, org_id), orgs
+        )
+
+    # --- Session refresh ----------------------------------------------------
+
+    def refresh_schedule(self) -> list[tuple[datetime, Account]]:
+        """When each account's session will next be refreshed, soonest first.
+
+        A session is due ``refresh_lead`` before it expires, brought forward
+        by a further fraction of refresh_lead that differs per account, so
+        that sessions expiring together refresh spread over that window. A
+        failed refresh is retried after REFRESH_RETRY.
+        """
+        accounts = sorted(self._accounts.values(), key=lambda account: account.name)
+        schedule = []
+        for index, account in enumerate(accounts):
+            tokens = account.auth.tokens
+            if tokens is None or tokens.expires_at is None:
+                continue
+            stagger = self.refresh_lead * (index / len(accounts))
+            when = tokens.expires_at - self.refresh_lead - stagger
+            retry_at = self._retry_at.get(account.name)
+            schedule.append((max(when, retry_at) if retry_at else when, account))
+        return sorted(schedule, key=lambda entry: entry[0])
+
+    async def _refresh_sessions(self) -> None:
+        while True:
+            self._changed.clear()
+            schedule = self.refresh_schedule()
+            now = datetime.now(UTC)
+            due = [account for when, account in schedule if when <= now]
+            # One at a time, so even overdue sessions do not refresh in a burst
+            for account in due:
+                tokens = account.auth.tokens
+                try:
+                    await account.auth.force_refresh(
+                        stale_access_token=tokens.access_token if tokens else None
+                    )
+                    self._retry_at.pop(account.name, None)
+                    logger.debug(f"Refreshed the session of {account.name}")
+                except Exception as err:
+                    # Rejected sessions and network errors alike are left for
+                    # the account's own requests to surface
+                    logger.warning(f"Could not refresh {account.name}'s session: {err}")
+                    self._retry_at[account.name] = datetime.now(UTC) + REFRESH_RETRY
+            if due:
+                continue
+            upcoming = [when for when, _ in schedule if when > now]
+            delay = (min(upcoming) - now).total_seconds() if upcoming else None
+            try:
+                # Woken early when accounts are added or removed
+                async with asyncio.timeout(delay):
+                    await self._changed.wait()
+            except TimeoutError:
+                pass
@@ -0,0 +1,352 @@
+"""Energy, cost and utilisation rollups over charging sessions.
+
+get_org_insight only reports organisation-wide daily totals for the last 7,
+14 or 30 days. SessionColumns holds any number of sessions (fetched from the
+API, loaded from a local store, or taken from a session_table.SessionTable)
+as columnar NumPy arrays, and rollup totals them by charger, location,
+connector, hour of day or day:
+
+- ``energy``: the sessions' ``totalPowerUsage`` (Wh)
+- ``cost``: the sessions' ``totalCost.amount``
+- ``plugged_time``: seconds from ``startDate`` to ``endDate`` (to now for
+  sessions still in progress)
+- ``charging_time``: seconds from ``chargingStarted`` to ``chargingStopped``
+- ``idle_time``: plugged in but not charging
+
+Every rollup is a handful of vectorised passes over the arrays, so years of
+fleet history take milliseconds; only building the columns touches each
+session in Python. Install the ``numpy`` extra to use it:
+
+    columns = await fetch_session_columns(evnex, charge_points)
+    for row in rollup(columns, GroupBy.LOCATION).rows():
+        print(row["key"], row["energy"], row["idleTime"])
+
+Hour of day and day rollups attribute a session to the hour or day it
+started, in the time zone given.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from enum import StrEnum
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from evnex.api import Evnex
+from evnex.schema.charge_points import EvnexChargePoint
+from evnex.schema.v3.charge_points import EvnexChargePointSession
+from evnex.session_table import SessionTable
+
+
+class GroupBy(StrEnum):
+    CHARGE_POINT = "chargePoint"
+    LOCATION = "location"
+    CONNECTOR = "connector"
+    HOUR = "hour"
+    DAY = "day"
+
+
+def _seconds(value: datetime | None) -> float:
+    return value.timestamp() if value is not None else np.nan
+
+
+def _codes(labels: list[str]) -> tuple[np.ndarray, tuple[str, ...]]:
+    """Integer codes for labels, and the distinct labels in code order."""
+    distinct, codes = np.unique(np.asarray(labels, dtype=str), return_inverse=True)
+    return codes.astype(np.intp), tuple(distinct.tolist())
+
+
+@dataclass(frozen=True, slots=True)
+class SessionColumns:
+    """Sessions as parallel arrays, one element per session.
+
+    Charge points, locations and connectors are integer codes into the
+    matching tuple of labels. Times are POSIX seconds, NaN where unknown.
+    """
+
+    ids: tuple[str, ...]
+    charge_point: np.ndarray
+    charge_points: tuple[str, ...]
+    location: np.ndarray
+    locations: tuple[str, ...]
+    connector: np.ndarray
+    connectors: tuple[str, ...]
+    start: np.ndarray
+    end: np.ndarray
+    charging_started: np.ndarray
+    charging_stopped: np.ndarray
+    energy: np.ndarray
+    cost: np.ndarray
+    currencies: frozenset[str]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_sessions(
+        cls,
+        sessions: Mapping[str, Iterable[EvnexChargePointSession]],
+        locations: Mapping[str, str] | None = None,
+    ) -> SessionColumns:
+        """Columns for each charge point's sessions.
+
+        :param sessions: sessions by charge point id
+        :param locations: location ids by charge point id; sessions of
+            charge points not listed fall under location ""
+        """
+        locations = locations or {}
+        ids: list[str] = []
+        charge_points: list[str] = []
+        connectors: list[str] = []
+        rows: list[tuple[float, ...]] = []
+        currencies: set[str] = set()
+        for cp_id, cp_sessions in sessions.items():
+            for session in cp_sessions:
+                attributes = session.attributes
+                total_cost = attributes.totalCost
+                if total_cost is not None:
+                    currencies.add(total_cost.currency)
+                ids.append(session.id)
+                charge_points.append(cp_id)
+                connectors.append(f"{cp_id}/{attributes.connectorId or '1'}")
+                rows.append(
+                    (
+                        _seconds(attributes.startDate),
+                        _seconds(attributes.endDate),
+                        _seconds(attributes.chargingStarted),
+                        _seconds(attributes.chargingStopped),
+                        attributes.totalPowerUsage or 0.0,
+                        total_cost.amount if total_cost is not None else np.nan,
+                    )
+                )
+        table = np.array(rows, dtype=float).reshape(len(rows), 6)
+        charge_point, charge_point_labels = _codes(charge_points)
+        location, location_labels = _codes(
+            [locations.get(cp_id, "") for cp_id in charge_points]
+        )
+        connector, connector_labels = _codes(connectors)
+        start, end, charging_started, charging_stopped, energy, cost = (
+            np.ascontiguousarray(column) for column in table.T
+        )
+        return cls(
+            tuple(ids),
+            charge_point,
+            charge_point_labels,
+            location,
+            location_labels,
+            connector,
+            connector_labels,
+            start,
+            end,
+            charging_started,
+            charging_stopped,
+            energy,
+            cost,
+            frozenset(currencies),
+        )
+
+    @classmethod
+    def from_table(
+        cls, table: SessionTable, locations: Mapping[str, str] | None = None
+    ) -> SessionColumns:
+        """Columns for the sessions of a SessionTable, without building models.
+
+        :param locations: location ids by charge point id, as for
+            from_sessions
+        """
+        locations = locations or {}
+        charge_points = [cp_id or "" for cp_id in table.charge_point.values()]
+        charge_point, charge_point_labels = _codes(charge_points)
+        location, location_labels = _codes(
+            [locations.get(cp_id, "") for cp_id in charge_points]
+        )
+        connector, connector_labels = _codes(
+            [
+                f"{cp_id}/{connector_id or '1'}"
+                for cp_id, connector_id in zip(
+                    charge_points, table.connector.values(), strict=True
+                )
+            ]
+        )
+        used = np.unique(table.currency.codes)
+        return cls(
+            tuple(session_id.decode() for session_id in table.ids.tolist()),
+            charge_point,
+            charge_point_labels,
+            location,
+            location_labels,
+            connector,
+            connector_labels,
+            table.start,
+            table.end,
+            table.charging_started,
+            table.charging_stopped,
+            np.nan_to_num(table.energy),
+            table.cost,
+            frozenset(table.currency.labels[code] for code in used if code >= 0),
+        )
+
+    def plugged_time(self, now: float | None = None) -> np.ndarray:
+        """Seconds each session has been plugged in for."""
+        end = np.where(np.isnan(self.end), now or time.time(), self.end)
+        plugged: np.ndarray = np.nan_to_num(np.clip(end - self.start, 0, None))
+        return plugged
+
+    def charging_time(self, now: float | None = None) -> np.ndarray:
+        """Seconds each session spent charging."""
+        # Still charging when the session has not stopped charging or ended
+        stopped = np.where(
+            np.isnan(self.charging_stopped),
+            np.where(np.isnan(self.end), now or time.time(), self.end),
+            self.charging_stopped,
+        )
+        charging: np.ndarray = np.nan_to_num(
+            np.clip(stopped - self.charging_started, 0, None)
+        )
+        return charging
+
+
+@dataclass(frozen=True, slots=True)
+class Rollup:
+    """Totals for each group, in the order of ``keys``."""
+
+    by: GroupBy
+    keys: tuple[str, ...]
+    sessions: np.ndarray
+    energy: np.ndarray
+    cost: np.ndarray
+    plugged_time: np.ndarray
+    charging_time: np.ndarray
+
+    @property
+    def idle_time(self) -> np.ndarray:
+        idle: np.ndarray = np.clip(self.plugged_time - self.charging_time, 0, None)
+        return idle
+
+    def rows(self) -> list[dict[str, Any]]:
+        """One JSON-ready dict per group."""
+        return [
+            {
+                "key": key,
+                "sessions": int(sessions),
+                "energy": float(energy),
+                "cost": round(float(cost), 2),
+                "pluggedTime": float(plugged),
+                "chargingTime": float(charging),
+                "idleTime": float(idle),
+            }
+            for key, sessions, energy, cost, plugged, charging, idle in zip(
+                self.keys,
+                self.sessions,
+                self.energy,
+                self.cost,
+                self.plugged_time,
+                self.charging_time,
+                self.idle_time,
+                strict=True,
+            )
+        ]
+
+
+def local_seconds(start: np.ndarray, tz: str) -> np.ndarray:
+    """POSIX seconds shifted into ``tz``'s wall clock time.
+
+    The zone's offset is looked up once per distinct hour, not per session.
+    """
+    zone = ZoneInfo(tz)
+    hours = np.floor(start / 3600)
+    distinct, inverse = np.unique(hours, return_inverse=True)
+    offsets = np.array(
+        [
+            (
+                datetime.fromtimestamp(hour * 3600, zone).utcoffset() or timedelta()
+            ).total_seconds()
+            for hour in distinct.tolist()
+        ]
+    )
+    local: np.ndarray = start + offsets[inverse.reshape(start.shape)]
+    return local
+
+
+def rollup(
+    columns: SessionColumns,
+    by: GroupBy,
+    *,
+    tz: str = "UTC",
+    now: float | None = None,
+) -> Rollup:
+    """Total the sessions in ``columns`` for each group of ``by``.
+
+    :param tz: the time zone for hour of day and day groups
+    :param now: the end of sessions still in progress; defaults to now
+    """
+    now = now or time.time()
+    keep = np.ones(len(columns), dtype=bool)
+    if by == GroupBy.CHARGE_POINT:
+        codes, keys = columns.charge_point, columns.charge_points
+    elif by == GroupBy.LOCATION:
+        codes, keys = columns.location, columns.locations
+    elif by == GroupBy.CONNECTOR:
+        codes, keys = columns.connector, columns.connectors
+    else:
+        # Sessions without a start cannot be placed in time
+        keep = ~np.isnan(columns.start)
+        local = local_seconds(columns.start[keep], tz)
+        if by == GroupBy.HOUR:
+            codes = (local // 3600 % 24).astype(np.intp)
+            keys = tuple(f"{hour:02d}:00" for hour in range(24))
+        else:
+            days, codes = np.unique(local // 86400, return_inverse=True)
+            keys = tuple(
+                datetime.fromtimestamp(day * 86400, UTC).date().isoformat()
+                for day in days.tolist()
+            )
+        codes = codes.reshape(-1)
+
+    def total(values: np.ndarray | None = None) -> np.ndarray:
+        weights = None if values is None else np.nan_to_num(values[keep])
+        return np.bincount(codes, weights=weights, minlength=len(keys)).astype(
+            float if values is not None else int
+        )
+
+    return Rollup(
+        by,
+        keys,
+        total(),
+        total(columns.energy),
+        total(columns.cost),
+        total(columns.plugged_time(now)),
+        total(columns.charging_time(now)),
+    )
+
+
+async def fetch_session_columns(
+    client: Evnex,
+    charge_points: list[EvnexChargePoint],
+    *,
+    concurrency: int = 10,
+) -> SessionColumns:
+    """Fetch every charge point's sessions, at most ``concurrency`` at once."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def sessions_of(charge_point_id: str) -> list[EvnexChargePointSession]:
+        async with semaphore:
+            sessions: list[
+                EvnexChargePointSession
+            ] = await client.get_charge_point_sessions(charge_point_id)
+            return sessions
+
+    sessions = await asyncio.gather(*(sessions_of(cp.id) for cp in charge_points))
+    return SessionColumns.from_sessions(
+        {
+            cp.id: cp_sessions
+            for cp, cp_sessions in zip(charge_points, sessions, strict=True)
+        },
+        {cp.id: cp.location.id for cp in charge_points},
+    )
@@ -1,9 +1,19 @@
+import asyncio
 import logging
+import time
+from collections.abc import AsyncIterator, Awaitable
+from contextlib import asynccontextmanager, nullcontext
 from importlib.metadata import PackageNotFoundError, version
+from typing import Any
 from warnings import warn
 
-import pydantic
-from httpx import AsyncClient, HTTPStatusError, ReadTimeout, Response
+from httpx import (
+    AsyncClient,
+    HTTPStatusError,
+    ReadTimeout,
+    Response,
+    TimeoutException,
+)
 from pydantic import ValidationError
 from pydantic_core import from_json
 from tenacity import (
@@ -20,6 +30,10 @@ from evnex.errors import (
     EvnexConfigurationError,
     ReauthenticationRequiredError,
 )
+from evnex.hedging import HedgingPolicy, RequestHedger
+from evnex.profiles import ChargingProfile
+from evnex.ratelimit import TokenBucket
+from evnex.scheduler import Priority, RequestScheduler, current_priority
 from evnex.schema.charge_points import (
     EvnexChargePoint,
     EvnexChargePointDetail,
@@ -53,6 +67,7 @@ from evnex.schema.v3.commands import EvnexCommandResponse as EvnexCommandRespons
 from evnex.schema.v3.generic import EvnexV3APIResponse
 from evnex.schema.v3.locations import EvnexGetLocationsResponse, EvnexLocation
 from evnex.schema.v3.org import EvnexGetOrgConnectorSummaryResponse
+from evnex.timeouts import CommandTimeouts
 
 logger = logging.getLogger("evnex.api")
 
@@ -66,6 +81,9 @@ NON_RETRYABLE_EXCEPTIONS = (
     ValidationError,
     EvnexAuthError,
     EvnexConfigurationError,
+    # tenacity catches BaseException; a cancelled call (e.g. a deadline
+    # expiring around it) must stop, not back off and try again
+    asyncio.CancelledError,
 )
 
 
@@ -87,6 +105,19 @@ def api_retry(*extra_non_retryable: type[BaseException]):
     )
 
 
+def _compiled(
+    segments: list[EvnexChargeProfileSegment | dict[str, int]] | ChargingProfile,
+    duration: int,
+) -> ChargingProfile:
+    if isinstance(segments, ChargingProfile):
+        if segments.duration == duration:
+            return segments
+        # Laid over the duration asked for; periods that do not fit raise
+        return ChargingProfile.compile(segments.periods, duration=duration)
+    # Sorted, merged and checked against the duration before sending
+    return ChargingProfile.compile(segments, duration=duration)
+
+
 class Evnex:
     def __init__(
         self,
@@ -94,6 +125,10 @@ class Evnex:
         auth: EvnexAuth,
         httpx_client: AsyncClient | None = None,
         config: EvnexConfig | None = None,
+        hedging: HedgingPolicy | None = None,
+        command_timeouts: CommandTimeouts | None = None,
+        rate_limiter: TokenBucket | None = None,
+        scheduler: RequestScheduler | None = None,
     ):
         """
         Create an Evnex API client.
@@ -101,6 +136,17 @@ class Evnex:
         :param auth: the authentication component owning the session tokens
         :param httpx_client: optionally share an httpx AsyncClient
         :param config: override API endpoints or the default org
+        :param hedging: opt in to hedged reads: a slow GET is duplicated once
+            it outlives the endpoint's usual latency, and the first success
+            wins. Commands are never hedged.
+        :param command_timeouts: learn each charger's command round-trip
+            latency and derive command timeouts from it, instead of using
+            fixed ones. Its stats() report what has been observed.
+        :param rate_limiter: every request waits for this bucket first (see
+            evnex.ratelimit); AccountManager gives each account one
+        :param scheduler: admit requests by priority (see evnex.scheduler):
+            commands first, then reads, then reads made under
+            request_priority(Priority.BACKGROUND)
         """
         self.httpx_client = httpx_client or AsyncClient()
         if config is None:
@@ -110,6 +156,10 @@ class Evnex:
         self.version = EVNEX_VERSION
         self._base_url = config.EVNEX_BASE_URL.rstrip("/")
         self._httpx_auth = EvnexHttpxAuth(auth)
+        self.hedger = RequestHedger(hedging) if hedging is not None else None
+        self.command_timeouts = command_timeouts
+        self.rate_limiter = rate_limiter
+        self.scheduler = scheduler
 
     @property
     def _common_headers(self):
@@ -120,21 +170,100 @@ class Evnex:
             "User-Agent": f"python-evnex/{self.version}",
         }
 
-    async def _request(self, method: str, path: str, **kwargs) -> Response:
-        """Single request path: base URL, headers, auth, and 401 recovery."""
-        return await self.httpx_client.request(
-            method,
-            f"{self._base_url}{path}",
-            headers=self._common_headers,
-            auth=self._httpx_auth,
-            **kwargs,
-        )
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        hedge: str | None = None,
+        priority: Priority | None = None,
+        admitted: bool = False,
+        **kwargs,
+    ) -> Response:
+        """Single request path: base URL, headers, auth, and 401 recovery.
+
+        hedge names the endpoint for latency tracking and marks the request
+        as an idempotent read that may be hedged; it only takes effect for
+        GETs on a client created with a HedgingPolicy. priority overrides
+        the scheduling class of the current context (see request_priority);
+        admitted=True skips the scheduler and rate limiter, for callers
+        already admitted by them.
+        """
+
+        def send() -> Awaitable[Response]:
+            return self.httpx_client.request(
+                method,
+                f"{self._base_url}{path}",
+                headers=self._common_headers,
+                auth=self._httpx_auth,
+                **kwargs,
+            )
+
+        if admitted:
+            if hedge is not None and self.hedger is not None and method == "GET":
+                return await self.hedger.run(hedge, send)
+            return await send()
+        async with self._admission(priority or current_priority()):
+            return await self._request(
+                method, path, hedge=hedge, admitted=True, **kwargs
+            )
+
+    @asynccontextmanager
+    async def _admission(self, priority: Priority) -> AsyncIterator[None]:
+        """Wait for a scheduler slot of this priority, then the rate limiter."""
+        async with (
+            self.scheduler.slot(priority)
+            if self.scheduler is not None
+            else nullcontext()
+        ):
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+            yield
+
+    async def _command(
+        self,
+        charge_point_id: str,
+        path: str,
+        *,
+        timeout: float | None = None,
+        default_timeout: float | None = None,
+        **kwargs,
+    ) -> Response:
+        """POST a command to a charge point, timing its round trip.
+
+        An explicit timeout always wins. Otherwise, with adaptive command
+        timeouts enabled the charger's learned timeout is used (seeded from
+        default_timeout); without them default_timeout applies, or the httpx
+        client's own default when that is None.
+        """
+        tracker = self.command_timeouts
+        if timeout is None and tracker is not None:
+            timeout = tracker.timeout_for(charge_point_id, default_timeout)
+        elif timeout is None:
+            timeout = default_timeout
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+
+        # Admitted before timing, so queueing is not mistaken for a slow
+        # charger
+        async with self._admission(Priority.COMMAND):
+            started = time.monotonic()
+            try:
+                r = await self._request("POST", path, admitted=True, **kwargs)
+            except TimeoutException:
+                if tracker is not None:
+                    tracker.observe_timeout(charge_point_id)
+                raise
+        if tracker is not None:
+            tracker.observe(charge_point_id, time.monotonic() - started)
+        return r
 
     @api_retry()
     async def get_user_detail(self) -> EvnexUserDetail:
         response = await self._request(
             "GET",
             "/v2/apps/user",
+            hedge="user",
         )
         response_json = await self._check_api_response(response)
         data = EvnexGetUserResponse.model_validate(response_json).data
@@ -194,6 +323,7 @@ class Evnex:
         r = await self._request(
             "GET",
             f"/v2/apps/organisations/{org_id}/charge-points",
+            hedge="org-charge-points",
         )
         json_data = await self._check_api_response(r)
         return EvnexGetChargePointsResponse.model_validate(json_data).data.items
@@ -206,6 +336,7 @@ class Evnex:
         r = await self._request(
             "GET",
             f"/organisations/{org_id}/summary/insights",
+            hedge="org-insights",
             params={"days": days, "tz-offset": tz_offset},
         )
         json_data = await self._check_api_response(r)
@@ -221,6 +352,7 @@ class Evnex:
         r = await self._request(
             "GET",
             f"/v2/apps/organisations/{org_id}/summary/status",
+            hedge="org-summary-status",
         )
         json_data = await self._check_api_response(r)
         return EvnexGetOrgSummaryStatusResponse.model_validate(json_data).data
@@ -231,6 +363,7 @@ class Evnex:
         r = await self._request(
             "GET",
             f"/v2/apps/organisations/{org_id}/locations",
+            hedge="org-locations",
         )
         json_data = await self._check_api_response(r)
         return EvnexGetLocationsResponse.model_validate(json_data).data
@@ -250,13 +383,13 @@ class Evnex:
         r = await self._request(
             "GET",
             f"/organisations/{org_id}/summary/status",
+            hedge="org-connector-summary",
         )
         json_data = await self._check_api_response(r)
         return EvnexGetOrgConnectorSummaryResponse.model_validate(
             json_data
         ).data.attributes.connectors
 
-    @api_retry()
     async def get_charge_point_detail(
         self, charge_point_id: str
     ) -> EvnexChargePointDetail:
@@ -265,6 +398,27 @@ class Evnex:
             DeprecationWarning,
             stacklevel=2,
         )
+        detail: EvnexChargePointDetail = await self._get_charge_point_detail_v2(
+            charge_point_id
+        )
+        return detail
+
+    async def get_charger_load_profile(
+        self, charge_point_id: str
+    ) -> EvnexChargePointLoadSchedule:
+        """The load management profile set by set_charger_load_profile.
+
+        Only the older v2 charge point detail reports it.
+        """
+        detail: EvnexChargePointDetail = await self._get_charge_point_detail_v2(
+            charge_point_id
+        )
+        return detail.loadSchedule
+
+    @api_retry()
+    async def _get_charge_point_detail_v2(
+        self, charge_point_id: str
+    ) -> EvnexChargePointDetail:
         r = await self._request(
             "GET",
             f"/v2/apps/charge-points/{charge_point_id}",
@@ -279,10 +433,17 @@ class Evnex:
         r = await self._request(
             "GET",
             f"/charge-points/{charge_point_id}",
+            hedge="charge-point-detail",
         )
         json_data = await self._check_api_response(r)
 
-        return EvnexV3APIResponse[EvnexChargePointDetailV3].model_validate(json_data)
+        detail = EvnexV3APIResponse[EvnexChargePointDetailV3].model_validate(json_data)
+        connection = detail.data.attributes.connectionConfiguration
+        if self.command_timeouts is not None and connection is not None:
+            self.command_timeouts.note_connection(
+                charge_point_id, connection.preferredConnectionType
+            )
+        return detail
 
     @api_retry(ReadTimeout)
     async def get_charge_point_solar_config(
@@ -292,8 +453,8 @@ class Evnex:
         :param charge_point_id:
         :raises: ReadTimeout if the charge point is offline.
         """
-        r = await self._request(
-            "POST",
+        r = await self._command(
+            charge_point_id,
             f"/charge-points/{charge_point_id}/commands/get-solar",
         )
         json_data = await self._check_api_response(r)
@@ -309,10 +470,10 @@ class Evnex:
         :param charge_point_id:
         :raises: ReadTimeout if the charge point is offline.
         """
-        r = await self._request(
-            "POST",
+        r = await self._command(
+            charge_point_id,
             f"/charge-points/{charge_point_id}/commands/get-override",
-            timeout=15,
+            default_timeout=15,
         )
         json_data = await self._check_api_response(r)
         return EvnexChargePointOverrideConfig.model_validate(json_data)
@@ -325,11 +486,11 @@ class Evnex:
         # in time (typically offline or not responding); fail fast rather than
         # retrying, which only prolongs the hang and could resubmit the command.
         # Matches stop_charge_point's policy for the same reason.
-        r = await self._request(
-            "POST",
+        r = await self._command(
+            charge_point_id,
             f"/charge-points/{charge_point_id}/commands/set-override",
             json={"connectorId": connector_id, "chargeNow": charge_now},
-            timeout=10,
+            default_timeout=10,
         )
         self._ensure_success(r)
         return True
@@ -342,8 +503,8 @@ class Evnex:
         :param charge_point_id:
         :raises: ReadTimeout if the charge point is offline.
         """
-        r = await self._request(
-            "POST",
+        r = await self._command(
+            charge_point_id,
             f"/charge-points/{charge_point_id}/commands/get-status",
         )
         json_data = await self._check_api_response(r)
@@ -358,8 +519,8 @@ class Evnex:
         :param charge_point_id:
         :raises: ReadTimeout if the charge point is offline.
         """
-        r = await self._request(
-            "POST",
+        r = await self._command(
+            charge_point_id,
             f"/charge-points/{charge_point_id}/commands/get-energy-meter-reading",
         )
         json_data = await self._check_api_response(r)
@@ -392,17 +553,36 @@ class Evnex:
         r = await self._request(
             "GET",
             f"/charge-points/{charge_point_id}/sessions",
+            hedge="charge-point-sessions",
         )
         json_data = await self._check_api_response(r)
         return EvnexGetChargePointSessionsResponse.model_validate(json_data).data
 
+    @api_retry()
+    async def get_charge_point_sessions_json(
+        self, charge_point_id: str
+    ) -> list[dict[str, Any]]:
+        """The charge point's sessions as the API's raw JSON objects.
+
+        Skips model validation, for callers that keep sessions in their own
+        compact form (see evnex.session_table).
+        """
+        r = await self._request(
+            "GET",
+            f"/charge-points/{charge_point_id}/sessions",
+            hedge="charge-point-sessions",
+        )
+        json_data = await self._check_api_response(r)
+        sessions: list[dict[str, Any]] = json_data["data"]
+        return sessions
+
     @api_retry(HTTPStatusError, ReadTimeout)
     async def stop_charge_point(
         self,
         charge_point_id: str,
         org_id: str | None = None,
         connector_id: str = "1",
-        timeout=10,
+        timeout: float | None = None,
     ) -> EvnexCommandResponse:
         """
         Stop an active charging session.
@@ -417,12 +597,13 @@ class Evnex:
         """
         org_id = self._resolve_org_id(org_id)
         logger.info("Stopping charging session")
-        r = await self._request(
-            "POST",
+        r = await self._command(
+            charge_point_id,
             f"/v2/apps/organisations/{org_id}/charge-points/{charge_point_id}/commands/remote-stop-transaction",
             # 'Connection': 'Keep-Alive'
             json={"connectorId": connector_id},
             timeout=timeout,
+            default_timeout=10,
         )
         json_data = await self._check_api_response(r)
 
@@ -454,7 +635,7 @@ class Evnex:
         charge_point_id: str,
         available: bool = True,
         connector_id: int | str = 1,
-        timeout=10,
+        timeout: float | None = None,
     ) -> EvnexCommandResponseV3:
         """
         Change availability of charger.
@@ -467,11 +648,12 @@ class Evnex:
         """
         availability = "Operative" if available else "Inoperative"
         logger.info(f"Changing connector {connector_id} to {availability}")
-        r = await self._request(
-            "POST",
+        r = await self._command(
+            charge_point_id,
             f"/v2/apps/organisations/{org_id}/charge-points/{charge_point_id}/commands/change-availability",
             json={"connectorId": connector_id, "changeAvailabilityType": availability},
             timeout=timeout,
+            default_timeout=10,
         )
         json_data = await self._check_api_response(r)
 
@@ -482,7 +664,7 @@ class Evnex:
         charge_point_id: str,
         available: bool = True,
         connector_id: str = "0",
-        timeout=10,
+        timeout: float | None = None,
     ) -> EvnexCommandResponse:
         """
         Unlock charger.
@@ -496,11 +678,12 @@ class Evnex:
         """
         availability = "Operative" if available else "Inoperative"
         logger.info(f"Changing connector {connector_id} to {availability}")
-        r = await self._request(
-            "POST",
+        r = await self._command(
+            charge_point_id,
             f"/v2/apps/organisations/{self.org_id}/charge-points/{charge_point_id}/commands/unlock-connector",
             json={"connectorId": connector_id, "changeAvailabilityType": availability},
             timeout=timeout,
+            default_timeout=10,
         )
         json_data = await self._check_api_response(r)
         return EvnexCommandResponse.model_validate(json_data["data"])
@@ -508,7 +691,8 @@ class Evnex:
     async def set_charger_load_profile(
         self,
         charge_point_id: str,
-        charging_profile_periods: list[EvnexChargeProfileSegment | dict[str, int]],
+        charging_profile_periods: list[EvnexChargeProfileSegment | dict[str, int]]
+        | ChargingProfile,
         enabled: bool = True,
         duration: int = 86400,
         units: str = "A",
@@ -517,25 +701,22 @@ class Evnex:
         """
         Set a load management profile for the charger.
 
-        Used to control the maximum output of a charge point.
+        Used to control the maximum output of a charge point. The segments
+        are compiled to a canonical ChargingProfile (see evnex.profiles)
+        before sending.
         """
         logger.info("Applying load management profile")
-        # Parse and validate the input
-        schedule = [
-            segment.dict()
-            for segment in pydantic.parse_obj_as(
-                list[EvnexChargeProfileSegment], charging_profile_periods
-            )
-        ]
+        profile = _compiled(charging_profile_periods, duration)
 
         r = await self._request(
             "PUT",
             f"/v2/apps/charge-points/{charge_point_id}/load-management",
+            priority=Priority.COMMAND,
             json={
-                "chargingProfilePeriods": schedule,
+                "chargingProfilePeriods": profile.to_v2(),
                 "enabled": enabled,
                 "units": units,
-                "duration": duration,
+                "duration": profile.duration,
             },
             timeout=timeout,
         )
@@ -545,7 +726,8 @@ class Evnex:
     async def set_charge_point_schedule(
         self,
         charge_point_id: str,
-        charging_profile_periods: list[EvnexChargeProfileSegment | dict[str, int]],
+        charging_profile_periods: list[EvnexChargeProfileSegment | dict[str, int]]
+        | ChargingProfile,
         enabled: bool = True,
         duration: int = 86400,
         timeout=10,
@@ -559,24 +741,22 @@ class Evnex:
           {"start": 3600, "limit": 32},
           {"start": 4500, "limit": 0}
         ]
+
+        The segments are compiled to a canonical ChargingProfile (see
+        evnex.profiles) before sending.
         """
         logger.info("Applying load management profile")
-        # Parse and validate the input
-        schedule = [
-            segment.dict()
-            for segment in pydantic.parse_obj_as(
-                list[EvnexChargeProfileSegment], charging_profile_periods
-            )
-        ]
+        profile = _compiled(charging_profile_periods, duration)
 
         r = await self._request(
             "PUT",
             f"/v2/apps/charge-points/{charge_point_id}/charge-schedule",
+            priority=Priority.COMMAND,
             json={
-                "chargingProfilePeriods": schedule,
+                "chargingProfilePeriods": profile.to_v2(),
                 "enabled": enabled,
                 # "units": "A",
-                "duration": duration,
+                "duration": profile.duration,
                 # "timezone": timezone,
             },
             timeout=timeout,
@@ -664,7 +664,10 @@ class EvnexHttpxAuth(httpx.Auth):
             yield request
 
     def sync_auth_flow(self, request: httpx.Request):
-        raise RuntimeError("EvnexHttpxAuth only supports async clients")
+        raise RuntimeError(
+            "EvnexHttpxAuth only supports async clients; use evnex.sync.EvnexSync"
+            " from synchronous code"
+        )
 
 
 def _error_message(err: botocore.exceptions.ClientError) -> str:
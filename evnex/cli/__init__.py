@@ -7,6 +7,7 @@ Run without installing anything via uv:
     uvx evnex charge-points list
     uvx evnex sessions list
     uvx evnex charge now
+    uvx evnex daemon      # keep a signed-in client warm for the commands above
 
 Credentials come from EVNEX_CLIENT_USERNAME / EVNEX_CLIENT_PASSWORD (or are
 prompted for). Session tokens are cached with 0600 permissions so an MFA
@@ -24,6 +25,7 @@ from pathlib import Path
 import httpx
 from pydantic import ValidationError
 
+from evnex.cli._apply import add_apply_commands
 from evnex.cli._auth import (
     _challenge_code,
     _default_cache,
@@ -40,7 +42,9 @@ from evnex.cli._auth import (
     cmd_status,
     signed_in_auth,
 )
+from evnex.cli._daemon import add_daemon_commands, failure_message, forward
 from evnex.cli._resources import add_resource_commands
+from evnex.cli._serve import add_serve_commands
 from evnex.errors import EvnexAuthError
 
 __all__ = [
@@ -71,6 +75,11 @@ def build_parser() -> argparse.ArgumentParser:
         action="version",
         version=f"evnex {version('evnex')}",
     )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="run the command in this process even if `evnex daemon` is running",
+    )
     parser.set_defaults(func=None, print_group_help=parser.print_help)
 
     # Flags for commands that read or write the token cache.
@@ -98,31 +107,29 @@ def build_parser() -> argparse.ArgumentParser:
     sub = parser.add_subparsers(dest="command")
     add_auth_commands(sub, cache_flags, otp_flags)
     add_resource_commands(sub, cache_flags, otp_flags)
+    add_apply_commands(sub, cache_flags, otp_flags)
+    add_daemon_commands(sub, cache_flags, otp_flags)
+    add_serve_commands(sub, cache_flags, otp_flags)
 
     return parser
 
 
 def main(argv: list[str] | None = None) -> None:
+    if argv is None:
+        argv = sys.argv[1:]
     args = build_parser().parse_args(argv)
     handler = getattr(args, "func", None)
     if handler is None:
         # No (leaf) subcommand: print the most specific help and exit cleanly.
         args.print_group_help()
         sys.exit(0)
+    forwarded = forward(argv, args)
+    if forwarded is not None:
+        sys.exit(forwarded)
     try:
         asyncio.run(handler(args))
-    except EvnexAuthError as err:
-        print(f"Authentication error: {err}", file=sys.stderr)
-        sys.exit(1)
-    except httpx.HTTPError as err:
-        print(f"API request failed: {err}", file=sys.stderr)
-        sys.exit(1)
-    except ValidationError:
-        print(
-            "The API returned a response this client version does not"
-            " understand; try upgrading evnex",
-            file=sys.stderr,
-        )
+    except (EvnexAuthError, httpx.HTTPError, ValidationError) as err:
+        print(failure_message(err), file=sys.stderr)
         sys.exit(1)
     except KeyboardInterrupt:
         sys.exit(130)
@@ -0,0 +1,149 @@
+"""`evnex apply`: reconcile charger configuration with a desired state file.
+
+Prints the plan (every setting that differs, current -> desired) before
+changing anything, asks for confirmation unless --yes, then writes only the
+changed settings. --dry-run and --json stop after the plan. Chargers whose
+settings could not be read are reported and make the command exit 1, as do
+failed writes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from evnex.cli._resources import (
+    _abort,
+    _list_charge_points,
+    _positive_int,
+    _print_json,
+    _print_table,
+    add_json_flags,
+    open_client,
+)
+from evnex.jobs import JobState
+from evnex.reconcile import (
+    DesiredStateError,
+    apply_changes,
+    load_desired_state,
+    plan_changes,
+)
+
+
+async def cmd_apply(args: argparse.Namespace) -> None:
+    try:
+        state = await asyncio.to_thread(load_desired_state, args.file)
+    except OSError as err:
+        _abort(f"Could not read {args.file}: {err.strerror}", 2)
+    except DesiredStateError as err:
+        _abort(str(err), 2)
+
+    async with open_client(args) as client:
+        charge_points = await _list_charge_points(client)
+        names = {cp.id: cp.name for cp in charge_points}
+        try:
+            plan = await plan_changes(
+                client,
+                state,
+                charge_points=charge_points,
+                concurrency=args.concurrency,
+            )
+        except DesiredStateError as err:
+            _abort(str(err), 2)
+
+        if args.json:
+            document = {
+                "changes": [
+                    {
+                        "chargePointId": change.charge_point_id,
+                        "setting": change.setting,
+                        "current": change.current.describe(),
+                        "desired": change.desired.describe(),
+                    }
+                    for change in plan.changes
+                ],
+                "inSync": list(plan.in_sync),
+                "errors": dict(plan.errors),
+            }
+            _print_json(args, document)
+            if plan.errors:
+                sys.exit(1)
+            return
+
+        for cp_id, error in plan.errors.items():
+            print(f"Could not read {names[cp_id]}: {error}", file=sys.stderr)
+        if plan.changes:
+            _print_table(
+                ["Charge point", "Setting", "Current", "Desired"],
+                [
+                    [
+                        names[change.charge_point_id],
+                        change.setting,
+                        change.current.describe(),
+                        change.desired.describe(),
+                    ]
+                    for change in plan.changes
+                ],
+            )
+        print(
+            f"{len(plan.changes)} change(s); "
+            f"{len(plan.in_sync)} charge point(s) already match",
+            file=sys.stderr,
+        )
+
+        if plan.changes and not args.dry_run:
+            if not args.yes:
+                # See the _resources module note: blocking on input() is fine
+                answer = input(f"Apply {len(plan.changes)} change(s)? [y/N] ")
+                if answer.strip().lower() not in ("y", "yes"):
+                    _abort("Aborted.", 1)
+            results = await apply_changes(client, plan, concurrency=args.concurrency)
+            rows = []
+            for change, result in zip(plan.changes, results, strict=True):
+                if result.state == JobState.ACKED:
+                    outcome = "ok"
+                else:
+                    outcome = f"{result.state}: {result.error}"
+                rows.append([names[change.charge_point_id], change.setting, outcome])
+            _print_table(["Charge point", "Setting", "Result"], rows)
+            failures = sum(1 for result in results if not result.ok)
+            if failures:
+                _abort(f"{failures} of {len(results)} changes did not succeed", 1)
+
+        if plan.errors:
+            _abort(f"Could not read {len(plan.errors)} charge point(s)", 1)
+
+
+def add_apply_commands(
+    sub: argparse._SubParsersAction,
+    cache_flags: argparse.ArgumentParser,
+    otp_flags: argparse.ArgumentParser,
+) -> None:
+    apply = sub.add_parser(
+        "apply",
+        parents=[cache_flags, otp_flags],
+        help="make charger schedules and load management match a file",
+        description=(
+            "Read each targeted charger's charge schedule and load management "
+            "profile, show how they differ from the desired state in FILE "
+            "(JSON, or YAML with PyYAML installed), and write only the "
+            "settings that differ."
+        ),
+    )
+    apply.add_argument("file", type=Path, metavar="FILE", help="desired state file")
+    apply.add_argument(
+        "--dry-run", action="store_true", help="show the plan without applying it"
+    )
+    apply.add_argument(
+        "--yes", "-y", action="store_true", help="skip the confirmation prompt"
+    )
+    add_json_flags(apply, "emit the plan as JSON on stdout instead of applying it")
+    apply.add_argument(
+        "--concurrency",
+        type=_positive_int,
+        default=10,
+        help="chargers read, and changes written, in parallel (default 10)",
+    )
+    apply.set_defaults(func=cmd_apply)
@@ -0,0 +1,313 @@
+"""A local daemon that keeps a signed-in client warm for CLI invocations.
+
+Every `evnex` run otherwise pays for interpreter start-up, reading the token
+cache, a TLS handshake, and looking up the user and the charge point listing
+before doing anything useful. `evnex daemon` does that once and then serves
+resource commands (status, charge, sessions, ...) over a Unix domain socket.
+The CLI forwards to it whenever the socket answers, and quietly runs the
+command in-process when it does not.
+
+The protocol is one JSON line each way per connection:
+
+    -> {"argv": ["status", "--json"], "token_cache": "/home/me/.cache/..."}
+    <- {"stdout": "...", "stderr": "...", "exit": 0}
+
+A reply of {"fallback": true} asks the CLI to run the command itself: the
+daemon does that for commands it cannot serve (ones that prompt, or that
+sign in with a different token cache than its own).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import socket
+import sys
+from collections.abc import Iterator
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+
+import httpx
+from pydantic import ValidationError
+
+from evnex.api import Evnex
+from evnex.cli import _resources
+from evnex.cli._auth import signed_in_auth
+from evnex.cli._resources import SharedClient, shared_client
+from evnex.errors import EvnexAuthError
+
+DEFAULT_SOCKET = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    / "evnex"
+    / "daemon.sock"
+)
+
+# A forwarded command gets this long to produce its reply before the CLI
+# gives up; commands that wait on a charger can legitimately take a while.
+FORWARD_TIMEOUT = 300
+
+
+def _default_socket() -> Path:
+    override = os.environ.get("EVNEX_DAEMON_SOCKET")
+    return Path(override) if override else DEFAULT_SOCKET
+
+
+def failure_message(err: BaseException) -> str:
+    """The one-line diagnostic the CLI prints for an expected failure."""
+    if isinstance(err, EvnexAuthError):
+        return f"Authentication error: {err}"
+    if isinstance(err, httpx.HTTPError):
+        return f"API request failed: {err}"
+    if isinstance(err, ValidationError):
+        return (
+            "The API returned a response this client version does not"
+            " understand; try upgrading evnex"
+        )
+    return str(err) or type(err).__name__
+
+
+def can_forward(args: argparse.Namespace) -> bool:
+    """Whether the daemon can run this command on the CLI's behalf.
+
+    Only resource commands are served; charge stop only with --yes, as the
+    daemon has no terminal to ask for confirmation on. Session exports run
+    in the CLI, which streams them to its own stdout or working directory
+    rather than the daemon buffering the whole export. Snapshot saves and
+    --offline reads run in the CLI too, as they need no API session and
+    their paths are relative to the CLI's working directory.
+    """
+    handler = getattr(args, "func", None)
+    if handler is None or handler.__module__ != _resources.__name__:
+        return False
+    if handler in (_resources.cmd_sessions_export, _resources.cmd_snapshot_save):
+        return False
+    if getattr(args, "offline", False):
+        return False
+    return not (handler is _resources.cmd_charge_stop and not args.yes)
+
+
+# The stdout/stderr buffers of the forwarded command the current task runs
+_captured: ContextVar[dict[str, io.StringIO] | None] = ContextVar(
+    "evnex_daemon_output", default=None
+)
+
+
+class _Router:
+    """Sends writes to the current command's buffer, else the real stream."""
+
+    def __init__(self, name: str, stream: Any) -> None:
+        self._name = name
+        self._stream = stream
+
+    def _target(self) -> Any:
+        captured = _captured.get()
+        return captured[self._name] if captured is not None else self._stream
+
+    def write(self, text: str) -> int:
+        written: int = self._target().write(text)
+        return written
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def isatty(self) -> bool:
+        return False if _captured.get() is not None else self._stream.isatty()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target(), name)
+
+
+@contextlib.contextmanager
+def route_output() -> Iterator[None]:
+    """Route print() to per-command buffers while the daemon is serving."""
+    stdout, stderr = sys.stdout, sys.stderr
+    sys.stdout = _Router("stdout", stdout)  # type: ignore[assignment]
+    sys.stderr = _Router("stderr", stderr)  # type: ignore[assignment]
+    try:
+        yield
+    finally:
+        sys.stdout, sys.stderr = stdout, stderr
+
+
+def _exit_code(code: Any) -> int:
+    # Mirror the interpreter: None is success, a message is printed and is 1
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+async def run_forwarded(
+    shared: SharedClient, request: dict[str, Any], token_cache: Path
+) -> dict[str, Any]:
+    """Run one forwarded command on the warm client and capture its output."""
+    # Imported here: the package imports this module to build its parser
+    from evnex.cli import build_parser
+
+    buffers = {"stdout": io.StringIO(), "stderr": io.StringIO()}
+    output = _captured.set(buffers)
+    client = shared_client.set(shared)
+    try:
+        try:
+            # build_parser() reads package metadata from disk
+            args = await asyncio.to_thread(
+                lambda: build_parser().parse_args(request["argv"])
+            )
+            same_session = Path(request["token_cache"]) == token_cache
+            if not can_forward(args) or not same_session:
+                return {"fallback": True}
+            await args.func(args)
+            code = 0
+        except SystemExit as exit:
+            code = _exit_code(exit.code)
+        except Exception as err:
+            # Any failure gets a reply: without one the CLI cannot tell
+            # whether the command ran
+            print(failure_message(err), file=sys.stderr)
+            code = 1
+    finally:
+        shared_client.reset(client)
+        _captured.reset(output)
+    return {
+        "stdout": buffers["stdout"].getvalue(),
+        "stderr": buffers["stderr"].getvalue(),
+        "exit": code,
+    }
+
+
+def _socket_answers(path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(path))
+        except OSError:
+            return False
+    return True
+
+
+def _prepare_socket(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        if _socket_answers(path):
+            raise RuntimeError(f"An evnex daemon is already listening on {path}")
+        # Left behind by a daemon that did not shut down cleanly
+        path.unlink()
+
+
+async def serve(shared: SharedClient, path: Path, token_cache: Path) -> None:
+    """Serve forwarded commands on a Unix socket until cancelled."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = json.loads(await reader.readline())
+            reply = await run_forwarded(shared, request, token_cache)
+        except (ValueError, KeyError, TypeError):
+            reply = {"stdout": "", "stderr": "Malformed daemon request\n", "exit": 2}
+        try:
+            writer.write(json.dumps(reply).encode() + b"\n")
+            await writer.drain()
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    await asyncio.to_thread(_prepare_socket, path)
+    # Only this user may talk to a daemon holding their session
+    umask = os.umask(0o177)
+    try:
+        server = await asyncio.start_unix_server(handle, path=str(path))
+    finally:
+        os.umask(umask)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await asyncio.to_thread(path.unlink, missing_ok=True)
+
+
+def forward(argv: list[str], args: argparse.Namespace) -> int | None:
+    """Run a command through a running daemon, returning its exit status.
+
+    Returns None, having printed nothing, when there is no daemon to connect
+    to or it asks the CLI to run the command itself. Once the command has
+    been sent it may have run, so a lost or garbled reply is reported as a
+    failure rather than running the command again.
+    """
+    if getattr(args, "no_daemon", False) or not can_forward(args):
+        return None
+    path = _default_socket()
+    request = {"argv": argv, "token_cache": str(args.token_cache)}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(FORWARD_TIMEOUT)
+        try:
+            conn.connect(str(path))
+        except OSError:
+            return None
+        try:
+            conn.sendall(json.dumps(request).encode() + b"\n")
+            with conn.makefile("rb") as replies:
+                reply = json.loads(replies.readline())
+            if reply.get("fallback"):
+                return None
+            stdout, stderr, code = reply["stdout"], reply["stderr"], int(reply["exit"])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as err:
+            print(
+                f"No reply from the evnex daemon on {path}"
+                f" ({failure_message(err)}); the command may have run",
+                file=sys.stderr,
+            )
+            return 1
+    sys.stdout.write(stdout)
+    sys.stderr.write(stderr)
+    return code
+
+
+async def cmd_daemon(args: argparse.Namespace) -> None:
+    path: Path = args.socket
+    auth = await signed_in_auth(args)
+    # Building the httpx client loads the CA bundle from disk
+    client = await asyncio.to_thread(Evnex, auth=auth)
+    try:
+        await client.get_user_detail()
+        shared = SharedClient(client, listing_ttl=args.cache_ttl)
+        print(f"Serving evnex commands on {path}", file=sys.stderr)
+        with route_output():
+            await serve(shared, path, Path(args.token_cache))
+    finally:
+        await client.httpx_client.aclose()
+
+
+def add_daemon_commands(
+    sub: argparse._SubParsersAction,
+    cache_flags: argparse.ArgumentParser,
+    otp_flags: argparse.ArgumentParser,
+) -> None:
+    daemon = sub.add_parser(
+        "daemon",
+        parents=[cache_flags, otp_flags],
+        help="keep a signed-in client running for faster commands",
+        description=(
+            "Sign in once and serve resource commands over a Unix socket. "
+            "While it runs, other evnex commands are forwarded to it instead "
+            "of signing in and connecting afresh. Stop it with Ctrl-C."
+        ),
+    )
+    daemon.add_argument(
+        "--socket",
+        type=Path,
+        default=_default_socket(),
+        help=f"where to listen (default: {_default_socket()}, or $EVNEX_DAEMON_SOCKET)",
+    )
+    daemon.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=30.0,
+        help="seconds to reuse the charge point listing between commands (default 30)",
+    )
+    daemon.set_defaults(func=cmd_daemon)
@@ -0,0 +1,116 @@
+"""A minimal HTTP/1.1 server for the local read-only endpoints the CLI serves.
+
+Only what `evnex serve` and similar commands need: GET requests, one
+response per connection, JSON or plain-text bodies, and long-lived event
+streams. Binding to localhost is the caller's choice and the default; there
+is no authentication.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+# Requests are a line and a few headers; anything bigger is not for us
+MAX_REQUEST_LINE = 8192
+
+
+@dataclass(frozen=True, slots=True)
+class Request:
+    method: str
+    path: str
+    query: dict[str, str]
+
+
+Handler = Callable[[Request, asyncio.StreamWriter], Awaitable[None]]
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Request | None:
+    line = await reader.readline()
+    if not line or len(line) > MAX_REQUEST_LINE:
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        return None
+    # Drain the headers; none of them change what we serve
+    while await reader.readline() not in (b"\r\n", b"\n", b""):
+        pass
+    url = urlsplit(target)
+    return Request(
+        method.upper(), url.path.rstrip("/") or "/", dict(parse_qsl(url.query))
+    )
+
+
+def _head(status: HTTPStatus, content_type: str, extra: str = "") -> bytes:
+    return (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Connection: close\r\n{extra}\r\n"
+    ).encode()
+
+
+async def respond(
+    writer: asyncio.StreamWriter,
+    body: bytes,
+    content_type: str,
+    status: HTTPStatus = HTTPStatus.OK,
+) -> None:
+    writer.write(_head(status, content_type, f"Content-Length: {len(body)}\r\n"))
+    writer.write(body)
+    await writer.drain()
+
+
+async def respond_json(
+    writer: asyncio.StreamWriter, payload: Any, status: HTTPStatus = HTTPStatus.OK
+) -> None:
+    body = json.dumps(payload, indent=2).encode() + b"\n"
+    await respond(writer, body, "application/json", status)
+
+
+async def respond_error(writer: asyncio.StreamWriter, status: HTTPStatus) -> None:
+    await respond_json(writer, {"error": status.phrase}, status)
+
+
+async def start_event_stream(writer: asyncio.StreamWriter) -> None:
+    """Send the head of a Server-Sent Events response."""
+    writer.write(
+        _head(HTTPStatus.OK, "text/event-stream", "Cache-Control: no-cache\r\n")
+    )
+    await writer.drain()
+
+
+async def send_event(writer: asyncio.StreamWriter, event: str, data: Any) -> None:
+    writer.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode())
+    await writer.drain()
+
+
+async def start_server(handler: Handler, host: str, port: int) -> asyncio.Server:
+    """Serve GET requests with handler; other methods get 405."""
+
+    async def on_connection(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            request = await _read_request(reader)
+            if request is None:
+                await respond_error(writer, HTTPStatus.BAD_REQUEST)
+            elif request.method != "GET":
+                await respond_error(writer, HTTPStatus.METHOD_NOT_ALLOWED)
+            else:
+                await handler(request, writer)
+        except ConnectionError:
+            # The client went away, e.g. closing an event stream
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    return await asyncio.start_server(on_connection, host, port)
@@ -3,7 +3,17 @@
 These commands talk to the EVNEX Cloud API through an authenticated Evnex
 client. Human output is aligned plain text on stdout; with ``--json`` the same
 data is emitted as a single JSON document on stdout (built from the pydantic
-models) while diagnostics stay on stderr.
+models) while diagnostics stay on stderr. ``--compact`` prints the document
+on one line, and ``--jsonl`` prints list output one record per line, each
+serialised by pydantic and flushed as soon as it is ready, so a pipeline
+into jq or a log shipper starts on the first record rather than the last.
+
+``evnex insights --from`` reports any range of days through
+evnex.insights, caching settled days in a file.
+
+``evnex snapshot save`` saves the listing, locations and (with --sessions)
+every session to a memory-mapped snapshot (see evnex.snapshot), which the
+listing commands read with ``--offline`` instead of calling the API.
 """
 
 from __future__ import annotations
@@ -11,19 +21,62 @@ from __future__ import annotations
 import argparse
 import asyncio
 import json
+import os
 import sys
+import time
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
-from datetime import UTC, datetime
-from typing import NoReturn
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime
+from enum import StrEnum
+from pathlib import Path
+from typing import Any, NoReturn, TypeVar
 
 import httpx
+from pydantic import BaseModel
 
 from evnex.api import Evnex
 from evnex.cli._auth import signed_in_auth
+from evnex.fleet import ChargePointStatus, get_fleet_status
+from evnex.insights import InsightCache, fetch_insights
+from evnex.jobs import CommandJobs, JobResult, JobState
+from evnex.occupancy import (
+    Interval,
+    clipped,
+    session_intervals,
+    time_in_state,
+    timeline,
+)
 from evnex.schema.charge_points import EvnexChargePoint
+from evnex.schema.cost import EvnexCost
+from evnex.schema.org import EvnexOrgInsightEntry
 from evnex.schema.v3.charge_points import EvnexChargePointSession
 from evnex.schema.v3.locations import EvnexLocation
+from evnex.session_export import (
+    CsvWriter,
+    NdjsonWriter,
+    ParquetWriter,
+    SessionWriter,
+    session_row,
+    stream_sessions,
+)
+from evnex.snapshot import Snapshot, SnapshotError, open_snapshot, write_snapshot
+
+DEFAULT_SNAPSHOT = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    / "evnex"
+    / "snapshot.evnx"
+)
+# Settled days of `evnex insights --from`, which no longer change
+DEFAULT_INSIGHT_CACHE = DEFAULT_SNAPSHOT.with_name("insights.json")
+
+_T = TypeVar("_T")
+
+
+def _default_snapshot() -> Path:
+    override = os.environ.get("EVNEX_SNAPSHOT")
+    return Path(override) if override else DEFAULT_SNAPSHOT
 
 
 def _positive_int(value: str) -> int:
@@ -33,15 +86,181 @@ def _positive_int(value: str) -> int:
     return number
 
 
+def _since(value: str) -> datetime:
+    """An ISO date or date-time; without an offset it is taken as UTC."""
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "expected an ISO date or date-time, e.g. 2024-06-01"
+        ) from None
+    return moment if moment.tzinfo is not None else moment.replace(tzinfo=UTC)
+
+
+def _date(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "expected an ISO date, e.g. 2024-06-01"
+        ) from None
+
+
 def _abort(message: str, code: int) -> NoReturn:
     """Print a diagnostic to stderr and exit with the given status."""
     print(message, file=sys.stderr)
     sys.exit(code)
 
 
+class JsonStyle(StrEnum):
+    PRETTY = "pretty"  # --json: one indented document
+    COMPACT = "compact"  # --compact: one single-line document
+    LINES = "lines"  # --jsonl: one record per line
+
+
+class _JsonStyleAction(argparse.Action):
+    """--compact / --jsonl: JSON output (args.json) in another layout."""
+
+    def __init__(self, option_strings: list[str], dest: str, **kwargs: Any) -> None:
+        super().__init__(option_strings, dest, nargs=0, **kwargs)
+
+    def __call__(
+        self,
+        parser: argparse.ArgumentParser,
+        namespace: argparse.Namespace,
+        values: Any,
+        option_string: str | None = None,
+    ) -> None:
+        namespace.json = True
+        setattr(namespace, self.dest, self.const)
+
+
+def add_json_flags(parser: argparse.ArgumentParser, help: str) -> None:
+    """Add --json, --compact and --jsonl, which set args.json and args.json_style."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--json", action="store_true", help=help)
+    group.add_argument(
+        "--compact",
+        dest="json_style",
+        action=_JsonStyleAction,
+        const=JsonStyle.COMPACT,
+        help="as --json, on a single line",
+    )
+    group.add_argument(
+        "--jsonl",
+        dest="json_style",
+        action=_JsonStyleAction,
+        const=JsonStyle.LINES,
+        help="as --json, one record per line, each written as soon as it is ready",
+    )
+    parser.set_defaults(json_style=JsonStyle.PRETTY)
+
+
+def _jsonable(value: Any) -> Any:
+    """Plain JSON types, with pydantic models dumped in JSON mode."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, list | tuple):
+        return [_jsonable(item) for item in value]
+    return value
+
+
+def _compact_json(value: Any) -> str:
+    """Single-line JSON, with pydantic models serialising themselves natively."""
+    if isinstance(value, BaseModel):
+        return value.model_dump_json()
+    if isinstance(value, dict):
+        members = (f"{json.dumps(key)}:{_compact_json(v)}" for key, v in value.items())
+        return "{" + ",".join(members) + "}"
+    if isinstance(value, list | tuple):
+        return "[" + ",".join(_compact_json(item) for item in value) + "]"
+    return json.dumps(value, separators=(",", ":"))
+
+
+def _print_json(args: argparse.Namespace, document: Any) -> None:
+    """Print one JSON document in the chosen --json style."""
+    if args.json_style == JsonStyle.PRETTY:
+        print(json.dumps(_jsonable(document), indent=2))
+    else:
+        print(_compact_json(document), flush=True)
+
+
+class _JsonRecords:
+    """Prints a JSON array record by record in the chosen --json style.
+
+    --jsonl and --compact write each record as it is added; --json collects
+    them for one indented document on close().
+    """
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        self._style = args.json_style
+        self._pretty: list[Any] = []
+        self._started = False
+
+    def add(self, record: Any) -> None:
+        if self._style == JsonStyle.PRETTY:
+            self._pretty.append(_jsonable(record))
+        elif self._style == JsonStyle.LINES:
+            print(_compact_json(record), flush=True)
+        else:
+            sys.stdout.write(("," if self._started else "[") + _compact_json(record))
+            sys.stdout.flush()
+        self._started = True
+
+    def close(self) -> None:
+        if self._style == JsonStyle.PRETTY:
+            print(json.dumps(self._pretty, indent=2))
+        elif self._style == JsonStyle.COMPACT:
+            print("]" if self._started else "[]", flush=True)
+
+
+def _print_json_records(args: argparse.Namespace, records: Any) -> None:
+    output = _JsonRecords(args)
+    for record in records:
+        output.add(record)
+    output.close()
+
+
+@dataclass
+class SharedClient:
+    """A signed-in client kept warm across commands by ``evnex daemon``.
+
+    The charge point listing, which nearly every command starts with, is
+    reused for listing_ttl seconds.
+    """
+
+    client: Evnex
+    listing_ttl: float = 30.0
+    _listing: list[EvnexChargePoint] | None = field(default=None, repr=False)
+    _fetched_at: float = field(default=0.0, repr=False)
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+    async def charge_points(self) -> list[EvnexChargePoint]:
+        async with self._lock:
+            age = time.monotonic() - self._fetched_at
+            if self._listing is None or age > self.listing_ttl:
+                if not self.client.org_id:
+                    await self.client.get_user_detail()
+                self._listing = await self.client.get_org_charge_points()
+                self._fetched_at = time.monotonic()
+            return self._listing
+
+
+# Set while the daemon runs a command, so the command reuses its warm client
+shared_client: ContextVar[SharedClient | None] = ContextVar(
+    "evnex_shared_client", default=None
+)
+
+
 @asynccontextmanager
 async def open_client(args: argparse.Namespace) -> AsyncIterator[Evnex]:
     """Sign in and yield an Evnex client, closing its HTTP client on exit."""
+    shared = shared_client.get()
+    if shared is not None:
+        yield shared.client
+        return
     auth = await signed_in_auth(args)
     # Building the httpx client loads the CA bundle from disk; do that off the
     # event loop so the blocking file I/O does not stall it.
@@ -52,8 +271,18 @@ async def open_client(args: argparse.Namespace) -> AsyncIterator[Evnex]:
         await client.httpx_client.aclose()
 
 
+async def _ensure_org(client: Evnex) -> None:
+    """Resolve the client's default org id (already done on a warm client)."""
+    shared = shared_client.get()
+    if shared is None or not client.org_id:
+        await client.get_user_detail()
+
+
 async def _list_charge_points(client: Evnex) -> list[EvnexChargePoint]:
     """Fetch the account's charge points (and set the client's org id)."""
+    shared = shared_client.get()
+    if shared is not None:
+        return await shared.charge_points()
     await client.get_user_detail()
     # The retry decorator erases the annotated return type to Any; pin it back.
     charge_points: list[EvnexChargePoint] = await client.get_org_charge_points()
@@ -101,6 +330,74 @@ def _resolve_one(
     _abort("\n".join(lines), 2)
 
 
+def _resolve_targets(
+    charge_points: list[EvnexChargePoint], args: argparse.Namespace
+) -> list[EvnexChargePoint]:
+    """Resolve --all / --location / repeated --charge-point to charge points.
+
+    The selections combine (a location plus extra chargers elsewhere); with
+    none given this falls back to _resolve_one's sole-charger default.
+    """
+    if args.all:
+        if not charge_points:
+            _abort("No charge points found", 2)
+        return charge_points
+
+    targets: dict[str, EvnexChargePoint] = {}
+    if args.location is not None:
+        wanted = args.location.casefold()
+        at_location = [
+            cp
+            for cp in charge_points
+            if cp.location.id == args.location or cp.location.name.casefold() == wanted
+        ]
+        if not at_location:
+            _abort(f"No charge points at location {args.location!r}", 2)
+        targets.update((cp.id, cp) for cp in at_location)
+    for selector in args.charge_point or []:
+        charge_point = _match_charge_point(charge_points, selector)
+        targets[charge_point.id] = charge_point
+    if targets:
+        return list(targets.values())
+    return [_resolve_one(charge_points, None)]
+
+
+async def _dispatch(
+    client: Evnex,
+    targets: list[EvnexChargePoint],
+    concurrency: int,
+    command: str,
+    **kwargs,
+) -> dict[str, JobResult]:
+    """Send one command to every target concurrently; results by charger id."""
+    async with CommandJobs(client, concurrency=concurrency) as jobs:
+        for charge_point in targets:
+            jobs.submit(charge_point.id, command, **kwargs)
+        return {r.charge_point_id: r async for r in jobs.as_completed()}
+
+
+def _print_results(
+    targets: list[EvnexChargePoint],
+    results: dict[str, JobResult],
+    timed_out: str = "timed out",
+) -> None:
+    """Tabulate per-charger command outcomes; exit 1 if any did not succeed."""
+    rows = []
+    for charge_point in targets:
+        result = results[charge_point.id]
+        if result.state == JobState.ACKED:
+            outcome = "ok"
+        elif result.state == JobState.TIMED_OUT:
+            outcome = timed_out
+        else:
+            outcome = f"{result.state}: {result.error}"
+        rows.append([charge_point.name, charge_point.serial, outcome])
+    _print_table(["Charge point", "Serial", "Result"], rows)
+    failures = sum(1 for r in results.values() if not r.ok)
+    if failures:
+        _abort(f"{failures} of {len(targets)} charge points did not succeed", 1)
+
+
 def _kw(watts: float | None) -> str:
     return "-" if watts is None else f"{watts / 1000:.2f} kW"
 
@@ -147,6 +444,54 @@ def _newest_first(
     return sorted(sessions, key=lambda s: s.attributes.startDate or epoch, reverse=True)
 
 
+def _fast_status_lines(status: ChargePointStatus) -> list[str]:
+    lines = [f"{status.name} ({status.serial})"]
+    lines.append(f"  Network: {status.network_status}")
+    for connector in status.connectors:
+        lines.append(f"  Connector {connector.connector_id}: {connector.ocpp_status}")
+        if connector.power is not None:
+            lines.append(f"    Charging power: {_kw(connector.power)}")
+        if connector.supply_active_power is not None:
+            lines.append(f"    Grid power: {_kw(connector.supply_active_power)}")
+    if status.active_session is not None:
+        session = status.active_session.attributes
+        summary = f"  Active session: {_kwh(session.totalPowerUsage)}"
+        if session.totalCost is not None:
+            summary += f", {session.totalCost.amount:.2f} {session.totalCost.currency}"
+        lines.append(summary)
+    return lines
+
+
+async def _fast_live_status(
+    client: Evnex,
+    charge_points: list[EvnexChargePoint],
+    args: argparse.Namespace,
+) -> None:
+    """Render status from the org listing, skipping per-charger detail calls.
+
+    The org-wide connector summary is only shown for the whole fleet, not
+    when a single charge point is selected.
+    """
+    fleet = await get_fleet_status(
+        client,
+        charge_points=charge_points,
+        include_summary=args.charge_point is None,
+    )
+    if args.json:
+        _print_json(args, fleet.to_dict())
+        return
+    if not fleet.charge_points:
+        print("No charge points found", file=sys.stderr)
+        return
+    blocks = [_fast_status_lines(status) for status in fleet.charge_points]
+    if fleet.summary is not None:
+        counts = fleet.summary.model_dump()
+        blocks.append(
+            ["Connectors: " + ", ".join(f"{n} {state}" for state, n in counts.items())]
+        )
+    print("\n\n".join("\n".join(block) for block in blocks))
+
+
 async def cmd_live_status(args: argparse.Namespace) -> None:
     async with open_client(args) as client:
         charge_points = await _list_charge_points(client)
@@ -154,8 +499,11 @@ async def cmd_live_status(args: argparse.Namespace) -> None:
             targets = [_match_charge_point(charge_points, args.charge_point)]
         else:
             targets = charge_points
+        if args.fast:
+            await _fast_live_status(client, targets, args)
+            return
 
-        payload = []
+        records = _JsonRecords(args) if args.json else None
         blocks: list[list[str]] = []
         for charge_point in targets:
             detail = await client.get_charge_point_detail_v3(charge_point.id)
@@ -163,13 +511,8 @@ async def cmd_live_status(args: argparse.Namespace) -> None:
             attributes = detail.data.attributes
             latest = _latest_session(sessions)
 
-            if args.json:
-                payload.append(
-                    {
-                        "chargePoint": attributes.model_dump(mode="json"),
-                        "sessions": [s.model_dump(mode="json") for s in sessions],
-                    }
-                )
+            if records is not None:
+                records.add({"chargePoint": attributes, "sessions": sessions})
                 continue
 
             lines = [f"{attributes.name} ({attributes.serial})"]
@@ -194,8 +537,8 @@ async def cmd_live_status(args: argparse.Namespace) -> None:
                 lines.append(summary)
             blocks.append(lines)
 
-        if args.json:
-            print(json.dumps(payload, indent=2))
+        if records is not None:
+            records.close()
             return
         if not blocks:
             print("No charge points found", file=sys.stderr)
@@ -203,18 +546,44 @@ async def cmd_live_status(args: argparse.Namespace) -> None:
         print("\n\n".join("\n".join(block) for block in blocks))
 
 
-async def cmd_charge_points_list(args: argparse.Namespace) -> None:
+async def _open_offline(args: argparse.Namespace) -> Snapshot:
+    try:
+        return await asyncio.to_thread(open_snapshot, args.snapshot)
+    except FileNotFoundError:
+        _abort(
+            f"No snapshot at {args.snapshot}; save one with `evnex snapshot save`", 2
+        )
+    except SnapshotError as err:
+        _abort(str(err), 2)
+
+
+def _offline_section(section: _T | None, what: str, flag: str = "") -> _T:
+    """A section of the --offline snapshot, aborting if it was not saved."""
+    if section is None:
+        _abort(
+            f"The snapshot has no {what}; save one with `evnex snapshot save{flag}`",
+            2,
+        )
+    return section
+
+
+async def _charge_points_of(
+    args: argparse.Namespace, snapshot: Snapshot | None
+) -> list[EvnexChargePoint]:
+    if snapshot is not None:
+        return _offline_section(snapshot.charge_points, "charge points")
     async with open_client(args) as client:
-        charge_points = await _list_charge_points(client)
-        if args.json:
-            print(
-                json.dumps(
-                    [cp.model_dump(mode="json") for cp in charge_points], indent=2
-                )
-            )
-            return
-        rows = [[cp.id, cp.name, cp.serial, cp.networkStatus] for cp in charge_points]
-        _print_table(["ID", "Name", "Serial", "Network"], rows)
+        return await _list_charge_points(client)
+
+
+async def cmd_charge_points_list(args: argparse.Namespace) -> None:
+    snapshot = await _open_offline(args) if args.offline else None
+    charge_points = await _charge_points_of(args, snapshot)
+    if args.json:
+        _print_json_records(args, charge_points)
+        return
+    rows = [[cp.id, cp.name, cp.serial, cp.networkStatus] for cp in charge_points]
+    _print_table(["ID", "Name", "Serial", "Network"], rows)
 
 
 async def cmd_charge_points_show(args: argparse.Namespace) -> None:
@@ -225,7 +594,7 @@ async def cmd_charge_points_show(args: argparse.Namespace) -> None:
         attributes = detail.data.attributes
 
         if args.json:
-            print(json.dumps(attributes.model_dump(mode="json"), indent=2))
+            _print_json(args, attributes)
             return
 
         print(f"{attributes.name} ({attributes.serial})")
@@ -248,100 +617,399 @@ async def cmd_charge_points_show(args: argparse.Namespace) -> None:
 
 
 async def cmd_sessions_list(args: argparse.Namespace) -> None:
+    sessions: list[EvnexChargePointSession]
+    if args.offline:
+        snapshot = await _open_offline(args)
+        charge_points = _offline_section(snapshot.charge_points, "charge points")
+        charge_point = _resolve_one(charge_points, args.charge_point)
+        table = _offline_section(snapshot.sessions, "sessions", " --sessions")
+        of_charger = table.charge_point.codes == table.charge_point.code_of(
+            charge_point.id
+        )
+        sessions = table.take(of_charger).to_sessions()
+    else:
+        async with open_client(args) as client:
+            charge_points = await _list_charge_points(client)
+            charge_point = _resolve_one(charge_points, args.charge_point)
+            sessions = await client.get_charge_point_sessions(charge_point.id)
+    sessions = _newest_first(sessions)[: args.limit]
+
+    if args.json:
+        _print_json_records(args, sessions)
+        return
+
+    rows = []
+    for session in sessions:
+        attributes = session.attributes
+        end = "active" if attributes.endDate is None else _fmt_dt(attributes.endDate)
+        cost = "-"
+        if attributes.totalCost is not None:
+            cost = f"{attributes.totalCost.amount:.2f} {attributes.totalCost.currency}"
+        rows.append(
+            [
+                _fmt_dt(attributes.startDate),
+                end,
+                _kwh(attributes.totalPowerUsage),
+                cost,
+            ]
+        )
+    _print_table(["Start", "End", "Energy", "Cost"], rows)
+
+
+def _hours(seconds: float, window: float) -> str:
+    return f"{seconds / 3600:.1f} h ({seconds / window:.0%})"
+
+
+async def cmd_sessions_occupancy(args: argparse.Namespace) -> None:
     async with open_client(args) as client:
         charge_points = await _list_charge_points(client)
-        charge_point = _resolve_one(charge_points, args.charge_point)
-        sessions = await client.get_charge_point_sessions(charge_point.id)
-        sessions = _newest_first(sessions)[: args.limit]
+        targets = _resolve_targets(charge_points, args)
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def sessions_of(cp_id: str) -> list[EvnexChargePointSession]:
+            async with semaphore:
+                sessions: list[
+                    EvnexChargePointSession
+                ] = await client.get_charge_point_sessions(cp_id)
+            return sessions
+
+        fetched = await asyncio.gather(*(sessions_of(cp.id) for cp in targets))
+
+    end = time.time()
+    start = end - args.days * 86400
+    by_location: dict[str, list[Interval]] = {}
+    intervals: list[Interval] = []
+    for charge_point, sessions in zip(targets, fetched, strict=True):
+        charger_intervals = session_intervals(charge_point.id, sessions, now=end)
+        intervals += charger_intervals
+        by_location.setdefault(charge_point.location.id, []).extend(charger_intervals)
+    location_names = {cp.location.id: cp.location.name for cp in targets}
+    lines = {
+        location: timeline(clipped(found, start, end))
+        for location, found in by_location.items()
+    }
+    states = time_in_state(intervals, start, end)
+
+    def when(moment: float | None) -> str | None:
+        return (
+            None if moment is None else datetime.fromtimestamp(moment, UTC).isoformat()
+        )
 
-        if args.json:
-            print(json.dumps([s.model_dump(mode="json") for s in sessions], indent=2))
-            return
+    if args.json:
+        document = {
+            "from": when(start),
+            "to": when(end),
+            "locations": [
+                {
+                    "id": location,
+                    "name": location_names[location],
+                    "peakOccupied": line.peak_occupied[0],
+                    "peakOccupiedAt": when(line.peak_occupied[1]),
+                    "peakCharging": line.peak_charging[0],
+                    "peakChargingAt": when(line.peak_charging[1]),
+                    "series": [
+                        {
+                            "time": when(moment),
+                            "occupied": occupied,
+                            "charging": charging,
+                        }
+                        for moment, occupied, charging in line.series(
+                            start, end, args.step * 60
+                        )
+                    ],
+                }
+                for location, line in lines.items()
+            ],
+            "chargePoints": [
+                {
+                    "id": charge_point.id,
+                    "occupiedSeconds": round(state.occupied),
+                    "chargingSeconds": round(state.charging),
+                    "idleSeconds": round(state.idle),
+                }
+                for charge_point in targets
+                if (state := states.get(charge_point.id)) is not None
+            ],
+        }
+        _print_json(args, document)
+        return
+
+    def peak(count: int, moment: float | None) -> str:
+        if moment is None:
+            return "0"
+        return f"{count} at {_fmt_dt(datetime.fromtimestamp(moment, UTC))}"
+
+    print(f"Last {args.days} day(s)")
+    _print_table(
+        ["Location", "Peak occupied", "Peak charging"],
+        [
+            [
+                location_names[location],
+                peak(*line.peak_occupied),
+                peak(*line.peak_charging),
+            ]
+            for location, line in lines.items()
+        ],
+    )
+    print()
+    window = end - start
+    rows = []
+    for charge_point in targets:
+        state = states.get(charge_point.id)
+        if state is None:
+            rows.append([charge_point.name, "-", "-", "-"])
+            continue
+        rows.append(
+            [
+                charge_point.name,
+                _hours(state.occupied, window),
+                _hours(state.charging, window),
+                _hours(state.idle, window),
+            ]
+        )
+    _print_table(["Charge point", "Occupied", "Charging", "Idle"], rows)
 
-        rows = []
-        for session in sessions:
-            attributes = session.attributes
-            end = (
-                "active" if attributes.endDate is None else _fmt_dt(attributes.endDate)
-            )
-            cost = "-"
-            if attributes.totalCost is not None:
-                cost = (
-                    f"{attributes.totalCost.amount:.2f} {attributes.totalCost.currency}"
-                )
-            rows.append(
-                [
-                    _fmt_dt(attributes.startDate),
-                    end,
-                    _kwh(attributes.totalPowerUsage),
-                    cost,
-                ]
+
+def _open_export(args: argparse.Namespace) -> SessionWriter:
+    """The writer for --format, on --output or stdout (called in a thread).
+
+    :raises ImportError: for parquet, if pyarrow is not installed.
+    """
+    if args.format == "parquet":
+        return ParquetWriter(args.output)
+    text = CsvWriter if args.format == "csv" else NdjsonWriter
+    if args.output is None:
+        return text(sys.stdout)
+    stream = open(args.output, "w", newline="", encoding="utf-8")
+    return text(stream, close_stream=True)
+
+
+async def cmd_sessions_export(args: argparse.Namespace) -> None:
+    if args.format == "parquet" and args.output is None:
+        _abort("Parquet export needs --output FILE", 2)
+    async with open_client(args) as client:
+        charge_points = await _list_charge_points(client)
+        if args.charge_point or args.location:
+            targets = _resolve_targets(charge_points, args)
+        elif charge_points:
+            # An export covers the whole fleet unless narrowed down
+            targets = charge_points
+        else:
+            _abort("No charge points found", 2)
+        try:
+            writer = await asyncio.to_thread(_open_export, args)
+        except ImportError:
+            _abort("Parquet export needs pyarrow: pip install 'evnex[parquet]'", 2)
+        exported = 0
+        failed: dict[str, Exception] = {}
+        try:
+            async for charge_point, sessions in stream_sessions(
+                client,
+                targets,
+                since=args.since,
+                concurrency=args.concurrency,
+                failed=failed,
+            ):
+                rows = [session_row(charge_point, session) for session in sessions]
+                # Writes go to a thread, so a slow disk never stalls the fetches
+                await asyncio.to_thread(writer.write, rows)
+                exported += len(rows)
+        finally:
+            await asyncio.to_thread(writer.close)
+    print(
+        f"Exported {exported} session(s) from "
+        f"{len(targets) - len(failed)} charge point(s)",
+        file=sys.stderr,
+    )
+    if failed:
+        names = {cp.id: cp.name for cp in targets}
+        for cp_id, err in failed.items():
+            print(f"Failed {names[cp_id]} ({cp_id}): {err}", file=sys.stderr)
+        if not args.skip_errors:
+            _abort(
+                f"The sessions of {len(failed)} charge point(s) are missing "
+                "from the export; rerun, or pass --skip-errors to accept it",
+                1,
             )
-        _print_table(["Start", "End", "Energy", "Cost"], rows)
 
 
 async def cmd_locations_list(args: argparse.Namespace) -> None:
+    locations: list[EvnexLocation]
+    if args.offline:
+        snapshot = await _open_offline(args)
+        locations = _offline_section(snapshot.locations, "locations")
+    else:
+        async with open_client(args) as client:
+            await _ensure_org(client)
+            # The retry decorator erases the annotated return type to Any; pin it
+            # back.
+            locations = await client.get_org_locations()
+
+    if args.json:
+        _print_json_records(args, locations)
+        return
+
+    rows = []
+    for location in locations:
+        attributes = location.attributes
+        city = attributes.address.city if attributes.address else None
+        retailer = (
+            attributes.icpDetails.electricityRetailer if attributes.icpDetails else None
+        )
+        rows.append(
+            [
+                attributes.name,
+                city or "-",
+                attributes.icpNumber or "-",
+                retailer or "-",
+                attributes.timeZone or "-",
+            ]
+        )
+    _print_table(["Name", "City", "ICP", "Retailer", "Timezone"], rows)
+
+
+async def cmd_snapshot_save(args: argparse.Namespace) -> None:
     async with open_client(args) as client:
-        await client.get_user_detail()
-        # The retry decorator erases the annotated return type to Any; pin it back.
+        charge_points = await _list_charge_points(client)
         locations: list[EvnexLocation] = await client.get_org_locations()
-
-        if args.json:
-            print(
-                json.dumps([loc.model_dump(mode="json") for loc in locations], indent=2)
+        sessions = None
+        if args.sessions:
+            try:
+                from evnex.session_table import fetch_session_table
+            except ImportError:
+                _abort(
+                    "Saving sessions needs NumPy: pip install 'evnex[numpy]'",
+                    2,
+                )
+            sessions = await fetch_session_table(
+                client, charge_points, concurrency=args.concurrency
             )
-            return
+        await asyncio.to_thread(
+            write_snapshot,
+            args.snapshot,
+            charge_points=charge_points,
+            locations=locations,
+            sessions=sessions,
+            org_id=client.org_id,
+        )
+    saved = f"{len(charge_points)} charge point(s), {len(locations)} location(s)"
+    if sessions is not None:
+        saved += f" and {len(sessions)} session(s)"
+    print(f"Saved {saved} to {args.snapshot}")
 
-        rows = []
-        for location in locations:
-            attributes = location.attributes
-            city = attributes.address.city if attributes.address else None
-            retailer = (
-                attributes.icpDetails.electricityRetailer
-                if attributes.icpDetails
-                else None
-            )
-            rows.append(
-                [
-                    attributes.name,
-                    city or "-",
-                    attributes.icpNumber or "-",
-                    retailer or "-",
-                    attributes.timeZone or "-",
-                ]
+
+def _fmt_cost(cost: EvnexCost) -> str:
+    if cost.cost is None:
+        return "-"
+    return f"{cost.cost:.2f} {cost.currency or ''}".strip()
+
+
+async def _insight_range(args: argparse.Namespace) -> None:
+    cache = (
+        InsightCache()
+        if args.no_cache
+        else await asyncio.to_thread(InsightCache.open, args.cache)
+    )
+    async with open_client(args) as client:
+        await _ensure_org(client)
+        try:
+            insights = await fetch_insights(
+                client,
+                args.start,
+                args.end or date.max,
+                tz_offset=args.tz_offset,
+                cache=cache,
+                by_charge_point=args.by_charge_point,
+                concurrency=args.concurrency,
             )
-        _print_table(["Name", "City", "ICP", "Retailer", "Timezone"], rows)
+        except ValueError as err:
+            _abort(str(err), 2)
+        names = {}
+        if args.by_charge_point and not args.json:
+            names = {cp.id: cp.name for cp in await _list_charge_points(client)}
+
+    by_day = [
+        {cp_id: entries[index] for cp_id, entries in insights.charge_points.items()}
+        for index in range(len(insights.days))
+    ]
+    if args.json:
+        if not args.by_charge_point:
+            _print_json_records(args, insights.days)
+            return
+        _print_json_records(
+            args,
+            [
+                {**entry.model_dump(mode="json"), "chargePoints": _jsonable(chargers)}
+                for entry, chargers in zip(insights.days, by_day, strict=True)
+            ],
+        )
+        return
+
+    _print_insight_table(insights.days)
+    if not args.by_charge_point:
+        return
+    rows = [
+        [
+            entry.startDate.strftime("%Y-%m-%d"),
+            names.get(cp_id, cp_id),
+            _kwh(entry.powerUsage),
+            _fmt_cost(entry.cost),
+            str(entry.sessions),
+        ]
+        for chargers in by_day
+        for cp_id, entry in chargers.items()
+        if entry.sessions
+    ]
+    print()
+    _print_table(["Date", "Charge point", "Energy", "Cost", "Sessions"], rows)
+
+
+def _print_insight_table(insights: list[EvnexOrgInsightEntry]) -> None:
+    rows = [
+        [
+            entry.startDate.strftime("%Y-%m-%d"),
+            _kwh(entry.powerUsage),
+            _fmt_cost(entry.cost),
+            str(entry.sessions),
+        ]
+        for entry in insights
+    ]
+    _print_table(["Date", "Energy", "Cost", "Sessions"], rows)
 
 
 async def cmd_insights(args: argparse.Namespace) -> None:
+    if args.start is not None:
+        await _insight_range(args)
+        return
+    if args.end is not None or args.by_charge_point:
+        _abort("--to and --by-charge-point need --from", 2)
     async with open_client(args) as client:
-        await client.get_user_detail()
-        insights = await client.get_org_insight(days=args.days)
-
-        if args.json:
-            print(json.dumps([i.model_dump(mode="json") for i in insights], indent=2))
-            return
+        await _ensure_org(client)
+        insights: list[EvnexOrgInsightEntry] = await client.get_org_insight(
+            days=args.days, tz_offset=args.tz_offset
+        )
 
-        rows = []
-        for entry in insights:
-            cost = "-"
-            if entry.cost.cost is not None:
-                cost = f"{entry.cost.cost:.2f} {entry.cost.currency or ''}".strip()
-            rows.append(
-                [
-                    entry.startDate.strftime("%Y-%m-%d"),
-                    _kwh(entry.powerUsage),
-                    cost,
-                    str(entry.sessions),
-                ]
-            )
-        _print_table(["Date", "Energy", "Cost", "Sessions"], rows)
+    if args.json:
+        _print_json_records(args, insights)
+        return
+    _print_insight_table(insights)
 
 
 async def cmd_charge_now(args: argparse.Namespace) -> None:
     async with open_client(args) as client:
         charge_points = await _list_charge_points(client)
-        charge_point = _resolve_one(charge_points, args.charge_point)
+        targets = _resolve_targets(charge_points, args)
+        if len(targets) > 1:
+            results = await _dispatch(
+                client,
+                targets,
+                args.concurrency,
+                "set_charge_point_override",
+                charge_now=True,
+            )
+            _print_results(targets, results)
+            return
+        charge_point = targets[0]
         await client.set_charge_point_override(charge_point.id, charge_now=True)
         print(f"Charging now on {charge_point.name} ({charge_point.serial})")
 
@@ -349,7 +1017,18 @@ async def cmd_charge_now(args: argparse.Namespace) -> None:
 async def cmd_charge_auto(args: argparse.Namespace) -> None:
     async with open_client(args) as client:
         charge_points = await _list_charge_points(client)
-        charge_point = _resolve_one(charge_points, args.charge_point)
+        targets = _resolve_targets(charge_points, args)
+        if len(targets) > 1:
+            results = await _dispatch(
+                client,
+                targets,
+                args.concurrency,
+                "set_charge_point_override",
+                charge_now=False,
+            )
+            _print_results(targets, results)
+            return
+        charge_point = targets[0]
         await client.set_charge_point_override(charge_point.id, charge_now=False)
         print(
             f"Returned {charge_point.name} ({charge_point.serial}) "
@@ -360,14 +1039,25 @@ async def cmd_charge_auto(args: argparse.Namespace) -> None:
 async def cmd_charge_stop(args: argparse.Namespace) -> None:
     async with open_client(args) as client:
         charge_points = await _list_charge_points(client)
-        charge_point = _resolve_one(charge_points, args.charge_point)
+        targets = _resolve_targets(charge_points, args)
         if not args.yes:
             # See the module note: blocking on input() is fine for this CLI.
-            answer = input(
-                f"Stop the active charging session on {charge_point.name}? [y/N] "
+            where = (
+                targets[0].name
+                if len(targets) == 1
+                else f"{len(targets)} charge points"
             )
+            answer = input(f"Stop the active charging session on {where}? [y/N] ")
             if answer.strip().lower() not in ("y", "yes"):
                 _abort("Aborted.", 1)
+        if len(targets) > 1:
+            results = await _dispatch(
+                client, targets, args.concurrency, "stop_charge_point"
+            )
+            # A stop with no active session surfaces as a read timeout
+            _print_results(targets, results, timed_out="no active session")
+            return
+        charge_point = targets[0]
         try:
             await client.stop_charge_point(charge_point.id)
         except httpx.ReadTimeout:
@@ -385,8 +1075,7 @@ async def cmd_schedule_show(args: argparse.Namespace) -> None:
         schedule = detail.data.attributes.profiles.chargeSchedule
 
         if args.json:
-            dumped = None if schedule is None else schedule.model_dump(mode="json")
-            print(json.dumps(dumped, indent=2))
+            _print_json(args, schedule)
             return
 
         if schedule is None:
@@ -409,17 +1098,61 @@ def add_resource_commands(
     sign_in = [cache_flags, otp_flags]
 
     json_flag = argparse.ArgumentParser(add_help=False)
-    json_flag.add_argument(
-        "--json",
-        action="store_true",
-        help="emit machine-readable JSON on stdout",
-    )
+    add_json_flags(json_flag, "emit machine-readable JSON on stdout")
     cp_flag = argparse.ArgumentParser(add_help=False)
     cp_flag.add_argument(
         "--charge-point",
         metavar="ID",
         help="charge point id, or a part of its name or serial of its name or serial",
     )
+    # Listings that can be read from a saved snapshot instead of the API
+    offline_flag = argparse.ArgumentParser(add_help=False)
+    offline_flag.add_argument(
+        "--offline",
+        action="store_true",
+        help="read from the snapshot saved by `evnex snapshot save` instead of the API",
+    )
+    snapshot_flag = argparse.ArgumentParser(add_help=False)
+    snapshot_flag.add_argument(
+        "--snapshot",
+        type=Path,
+        default=_default_snapshot(),
+        metavar="PATH",
+        help=f"snapshot file (default $EVNEX_SNAPSHOT or {DEFAULT_SNAPSHOT})",
+    )
+    # Charge control and fleet-wide session reads act on many charge points
+    selection_flags = argparse.ArgumentParser(add_help=False)
+    selection_flags.add_argument(
+        "--charge-point",
+        metavar="ID",
+        action="append",
+        help="charge point id, or a part of its name or serial; repeat to "
+        "select several",
+    )
+    selection_flags.add_argument(
+        "--location",
+        metavar="NAME",
+        help="every charge point at this location (name or id)",
+    )
+    selection_flags.add_argument(
+        "--all", action="store_true", help="every charge point in the organisation"
+    )
+    targets_flag = argparse.ArgumentParser(add_help=False, parents=[selection_flags])
+    targets_flag.add_argument(
+        "--concurrency",
+        type=_positive_int,
+        default=10,
+        help="commands sent in parallel when several are selected (default 10)",
+    )
+    sessions_targets_flag = argparse.ArgumentParser(
+        add_help=False, parents=[selection_flags]
+    )
+    sessions_targets_flag.add_argument(
+        "--concurrency",
+        type=_positive_int,
+        default=10,
+        help="charge points whose sessions are fetched in parallel (default 10)",
+    )
 
     status = sub.add_parser(
         "status",
@@ -431,6 +1164,12 @@ def add_resource_commands(
             "power, and any active charging session's energy and cost."
         ),
     )
+    status.add_argument(
+        "--fast",
+        action="store_true",
+        help="build the view from the organisation listing, only looking up "
+        "chargers with a session in progress in detail",
+    )
     status.set_defaults(func=cmd_live_status)
 
     charge_points = sub.add_parser(
@@ -443,7 +1182,7 @@ def add_resource_commands(
 
     cp_list = charge_points_sub.add_parser(
         "list",
-        parents=[json_flag, *sign_in],
+        parents=[json_flag, offline_flag, snapshot_flag, *sign_in],
         help="list charge points (id, name, serial, network status)",
     )
     cp_list.set_defaults(func=cmd_charge_points_list)
@@ -463,15 +1202,18 @@ def add_resource_commands(
 
     sessions = sub.add_parser(
         "sessions",
-        help="list charging sessions",
-        description="List recent charging sessions for a charge point.",
+        help="list, export, and chart charging sessions",
+        description=(
+            "List recent charging sessions for a charge point, export the "
+            "sessions of many, or show connector occupancy over time."
+        ),
     )
     sessions.set_defaults(print_group_help=sessions.print_help)
     sessions_sub = sessions.add_subparsers(dest="sessions_command")
 
     sessions_list = sessions_sub.add_parser(
         "list",
-        parents=[cp_flag, json_flag, *sign_in],
+        parents=[cp_flag, json_flag, offline_flag, snapshot_flag, *sign_in],
         help="list recent charging sessions for a charge point",
     )
     sessions_list.add_argument(
@@ -482,6 +1224,73 @@ def add_resource_commands(
     )
     sessions_list.set_defaults(func=cmd_sessions_list)
 
+    occupancy = sessions_sub.add_parser(
+        "occupancy",
+        parents=[sessions_targets_flag, json_flag, *sign_in],
+        help="show how many connectors were occupied and charging over time",
+        description=(
+            "Show each location's peak number of connectors occupied (plugged "
+            "in) and charging at once, and how long each charge point spent "
+            "occupied, charging and idle, over the last few days of sessions. "
+            "--json adds each location's occupancy series."
+        ),
+    )
+    occupancy.add_argument(
+        "--days",
+        type=_positive_int,
+        default=7,
+        help="how many days back to look (default 7)",
+    )
+    occupancy.add_argument(
+        "--step",
+        type=_positive_int,
+        default=15,
+        metavar="MINUTES",
+        help="minutes between points of the --json series (default 15)",
+    )
+    occupancy.set_defaults(func=cmd_sessions_occupancy)
+
+    export = sessions_sub.add_parser(
+        "export",
+        parents=[sessions_targets_flag, *sign_in],
+        help="export every session of many charge points as CSV, NDJSON or Parquet",
+        description=(
+            "Write one flat row per session (charge point, location, connector, "
+            "start and end, energy, cost, currency and authorization method) "
+            "for every charge point, or those selected. Rows are written as "
+            "each charge point's sessions arrive, so exports of large fleets "
+            "stream in constant memory. If any charge point's sessions cannot "
+            "be fetched, it is named on stderr and the export exits 1 unless "
+            "--skip-errors. Parquet needs pyarrow (pip install "
+            "'evnex[parquet]')."
+        ),
+    )
+    export.add_argument(
+        "--format",
+        choices=("csv", "ndjson", "parquet"),
+        default="csv",
+        help="output format (default csv)",
+    )
+    export.add_argument(
+        "--output",
+        "-o",
+        metavar="FILE",
+        help="file to write (default stdout; required for parquet)",
+    )
+    export.add_argument(
+        "--since",
+        type=_since,
+        metavar="DATE",
+        help="only sessions started on or after this ISO date or date-time "
+        "(UTC unless it has an offset)",
+    )
+    export.add_argument(
+        "--skip-errors",
+        action="store_true",
+        help="exit 0 even if some charge points' sessions could not be fetched",
+    )
+    export.set_defaults(func=cmd_sessions_export)
+
     locations = sub.add_parser(
         "locations",
         help="list locations",
@@ -492,7 +1301,7 @@ def add_resource_commands(
 
     locations_list = locations_sub.add_parser(
         "list",
-        parents=[json_flag, *sign_in],
+        parents=[json_flag, offline_flag, snapshot_flag, *sign_in],
         help="list locations (name, city, ICP number, retailer, timezone)",
     )
     locations_list.set_defaults(func=cmd_locations_list)
@@ -502,40 +1311,89 @@ def add_resource_commands(
         parents=[json_flag, *sign_in],
         help="show daily energy, cost, and session counts for the organisation",
     )
-    insights.add_argument(
+    window = insights.add_mutually_exclusive_group()
+    window.add_argument(
         "--days",
         type=int,
         choices=(7, 14, 30),
         default=7,
-        help="reporting window in days (default 7)",
+        help="reporting window in days, ending today (default 7)",
+    )
+    window.add_argument(
+        "--from",
+        dest="start",
+        type=_date,
+        metavar="DATE",
+        help="first day of any range of days; settled days are cached",
+    )
+    insights.add_argument(
+        "--to",
+        dest="end",
+        type=_date,
+        metavar="DATE",
+        help="last day of the --from range (default today)",
+    )
+    insights.add_argument(
+        "--by-charge-point",
+        action="store_true",
+        help="also total each charge point's days from its sessions (--from only)",
+    )
+    insights.add_argument(
+        "--tz-offset",
+        type=int,
+        default=12,
+        metavar="HOURS",
+        help="hours east of UTC where each day starts (default 12)",
+    )
+    insights.add_argument(
+        "--cache",
+        type=Path,
+        default=DEFAULT_INSIGHT_CACHE,
+        metavar="PATH",
+        help=f"cache of settled days for --from (default {DEFAULT_INSIGHT_CACHE})",
+    )
+    insights.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="fetch every day of the --from range, reading and saving no cache",
+    )
+    insights.add_argument(
+        "--concurrency",
+        type=_positive_int,
+        default=10,
+        help="charge points whose sessions are fetched in parallel (default 10)",
     )
     insights.set_defaults(func=cmd_insights)
 
     charge = sub.add_parser(
         "charge",
-        help="control charging on a charge point",
-        description="Start charging now, return to the schedule, or stop charging.",
+        help="control charging on one or many charge points",
+        description=(
+            "Start charging now, return to the schedule, or stop charging. "
+            "Select several charge points with --all, --location, or repeated "
+            "--charge-point to act on them concurrently."
+        ),
     )
     charge.set_defaults(print_group_help=charge.print_help)
     charge_sub = charge.add_subparsers(dest="charge_command")
 
     charge_now = charge_sub.add_parser(
         "now",
-        parents=[cp_flag, *sign_in],
+        parents=[targets_flag, *sign_in],
         help="start charging immediately, overriding the schedule",
     )
     charge_now.set_defaults(func=cmd_charge_now)
 
     charge_auto = charge_sub.add_parser(
         "auto",
-        parents=[cp_flag, *sign_in],
+        parents=[targets_flag, *sign_in],
         help="return control to the configured charging schedule",
     )
     charge_auto.set_defaults(func=cmd_charge_auto)
 
     charge_stop = charge_sub.add_parser(
         "stop",
-        parents=[cp_flag, *sign_in],
+        parents=[targets_flag, *sign_in],
         help="stop the active charging session",
     )
     charge_stop.add_argument(
@@ -557,3 +1415,33 @@ def add_resource_commands(
         help="show the charging schedule (enabled state and periods)",
     )
     schedule_show.set_defaults(func=cmd_schedule_show)
+
+    snapshot = sub.add_parser(
+        "snapshot",
+        help="save fleet state for --offline reads",
+        description=(
+            "Save the charge point listing, locations and optionally every "
+            "session to a memory-mapped snapshot file, which `charge-points "
+            "list`, `locations list` and `sessions list` read with --offline."
+        ),
+    )
+    snapshot.set_defaults(print_group_help=snapshot.print_help)
+    snapshot_sub = snapshot.add_subparsers(dest="snapshot_command")
+
+    snapshot_save = snapshot_sub.add_parser(
+        "save",
+        parents=[snapshot_flag, *sign_in],
+        help="fetch the fleet and replace the snapshot file",
+    )
+    snapshot_save.add_argument(
+        "--sessions",
+        action="store_true",
+        help="also save every charge point's sessions (needs the numpy extra)",
+    )
+    snapshot_save.add_argument(
+        "--concurrency",
+        type=_positive_int,
+        default=10,
+        help="charge points whose sessions are fetched in parallel (default 10)",
+    )
+    snapshot_save.set_defaults(func=cmd_snapshot_save)
@@ -0,0 +1,195 @@
+"""`evnex serve` and `evnex exporter`: one shared poller fanned out over HTTP.
+
+`evnex serve` endpoints
+ (all GET, JSON unless noted):
+
+    /                 every resource's freshness, without the data
+    /charge-points    each charge point's name, serial and network status
+    /connectors       each connector's status and power
+    /sessions         the sessions in progress
+    /summary          org-wide connector counts per status
+    /events           Server-Sent Events: each resource's state on connect,
+                      then again whenever it changes (text/event-stream)
+
+Resource responses carry the data with its freshness: version, fetchedAt,
+changedAt, ageSeconds, stale and the error of the last failed poll.
+
+`evnex exporter` serves the same poller's snapshot as Prometheus metrics on
+/metrics. With --snapshot PATH either one saves its state to a snapshot
+file (evnex.snapshot) and restores from it on restart.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from http import HTTPStatus
+
+from evnex.cli._http import (
+    Request,
+    respond,
+    respond_error,
+    respond_json,
+    send_event,
+    start_event_stream,
+    start_server,
+)
+from evnex.cli._resources import _ensure_org, _positive_int, open_client
+from evnex.exporter import CONTENT_TYPE, render_metrics
+from evnex.poller import RESOURCES, FleetPoller
+
+# An event stream with no changes gets a comment this often, so clients and
+# proxies can tell a quiet fleet from a dead connection
+HEARTBEAT = 15.0
+
+
+def fleet_handler(poller: FleetPoller, heartbeat: float = HEARTBEAT):
+    """The request handler serving a poller's state."""
+
+    async def handle(request: Request, writer: asyncio.StreamWriter) -> None:
+        name = request.path.lstrip("/")
+        if request.path == "/":
+            await respond_json(
+                writer,
+                {
+                    "interval": poller.interval,
+                    "resources": {
+                        state.name: state.freshness(poller.stale_after)
+                        for state in poller.states()
+                    },
+                },
+            )
+        elif name in RESOURCES:
+            await respond_json(writer, poller.state(name).to_dict(poller.stale_after))
+        elif name == "events":
+            # Subscribe before sending the current state so no change is lost
+            with poller.subscribe() as changes:
+                await start_event_stream(writer)
+                for state in poller.states():
+                    await send_event(
+                        writer, state.name, state.to_dict(poller.stale_after)
+                    )
+                while True:
+                    try:
+                        state = await asyncio.wait_for(changes.get(), heartbeat)
+                    except TimeoutError:
+                        writer.write(b": keepalive\n\n")
+                        await writer.drain()
+                        continue
+                    await send_event(
+                        writer, state.name, state.to_dict(poller.stale_after)
+                    )
+        else:
+            await respond_error(writer, HTTPStatus.NOT_FOUND)
+
+    return handle
+
+
+def metrics_handler(poller: FleetPoller):
+    """The request handler serving a poller's snapshot as Prometheus metrics."""
+
+    async def handle(request: Request, writer: asyncio.StreamWriter) -> None:
+        if request.path != "/metrics":
+            await respond_error(writer, HTTPStatus.NOT_FOUND)
+            return
+        await respond(writer, render_metrics(poller).encode(), CONTENT_TYPE)
+
+    return handle
+
+
+async def _serve_poller(args: argparse.Namespace, handler_for, *, full_detail=False):
+    async with open_client(args) as client:
+        await _ensure_org(client)
+        poller = FleetPoller(
+            client,
+            interval=args.interval,
+            concurrency=args.concurrency,
+            full_detail=full_detail,
+            snapshot=args.snapshot,
+        )
+        server = await start_server(handler_for(poller), args.host, args.port)
+        print(
+            f"Serving on http://{args.host}:{args.port}/ "
+            f"(polling every {args.interval:g} s)",
+            file=sys.stderr,
+        )
+        async with server:
+            await asyncio.gather(poller.run(), server.serve_forever())
+
+
+async def cmd_serve(args: argparse.Namespace) -> None:
+    await _serve_poller(args, fleet_handler)
+
+
+async def cmd_exporter(args: argparse.Namespace) -> None:
+    # Per-phase readings and temperature are only in the v3 detail
+    await _serve_poller(args, metrics_handler, full_detail=not args.listing_only)
+
+
+def add_serve_commands(
+    sub: argparse._SubParsersAction,
+    cache_flags: argparse.ArgumentParser,
+    otp_flags: argparse.ArgumentParser,
+) -> None:
+    poll_flags = argparse.ArgumentParser(add_help=False)
+    poll_flags.add_argument(
+        "--host", default="127.0.0.1", help="address to listen on (default 127.0.0.1)"
+    )
+    poll_flags.add_argument(
+        "--interval",
+        type=float,
+        default=30.0,
+        help="seconds between polls of the API (default 30)",
+    )
+    poll_flags.add_argument(
+        "--concurrency",
+        type=_positive_int,
+        default=10,
+        help="per-charger lookups in flight at once (default 10)",
+    )
+    poll_flags.add_argument(
+        "--snapshot",
+        metavar="PATH",
+        help="save the fleet state here when it changes, and serve it (marked "
+        "stale) from here on restart until the first poll",
+    )
+    serve = sub.add_parser(
+        "serve",
+        parents=[poll_flags, cache_flags, otp_flags],
+        help="poll once and serve fleet state to local consumers over HTTP",
+        description=(
+            "Poll the organisation's charge points, connectors, sessions and "
+            "connector summary on an interval, and serve the latest state as "
+            "JSON (with freshness metadata) and as Server-Sent Events at "
+            "/events. Any number of dashboards can read it for the cost of one "
+            "poller."
+        ),
+    )
+    serve.add_argument(
+        "--port", type=int, default=8765, help="port to listen on (default 8765)"
+    )
+    serve.set_defaults(func=cmd_serve)
+
+    exporter = sub.add_parser(
+        "exporter",
+        parents=[poll_flags, cache_flags, otp_flags],
+        help="serve charger telemetry as Prometheus metrics",
+        description=(
+            "Collect connector status, power, grid power, per-phase currents "
+            "and voltages, temperature, active session energy and org "
+            "connector counts on an interval, and serve them as Prometheus "
+            "gauges on /metrics. Scrapes are answered from the last "
+            "collection and never call the API."
+        ),
+    )
+    exporter.add_argument(
+        "--port", type=int, default=9330, help="port to listen on (default 9330)"
+    )
+    exporter.add_argument(
+        "--listing-only",
+        action="store_true",
+        help="collect from the organisation listing alone: far fewer calls, "
+        "but no per-phase, grid power or temperature readings",
+    )
+    exporter.set_defaults(func=cmd_exporter)
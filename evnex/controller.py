@@ -0,0 +1,365 @@
+"""Closed-loop control of a site's chargers from its supply meter.
+
+A site with a power sensor (CT clamp) on its supply reports the grid draw as
+``supplyActivePower`` alongside each charger's own ``chargingActivePower``.
+SiteController holds that supply power near a target by adjusting the
+chargers' load management limits, once every ``interval`` seconds:
+
+- target 0 W charges only from surplus solar; a negative target keeps that
+  much exporting; a positive target is an import budget
+- within ``deadband`` watts of the target nothing is written
+- limits rise by at most ``ramp`` amps a cycle (in total), but fall at once,
+  so a limit is never overshot for more than one cycle
+- a vehicle cannot charge below ``min_current``: a charger is started only
+  once there is ``start_margin`` amps to spare beyond its minimum, and stopped
+  only after ``stop_delay`` cycles without enough, so passing clouds do not
+  toggle charging
+
+Every cycle samples all the chargers concurrently, each bounded by
+``sample_timeout`` so one slow or offline charger cannot stall the loop (its
+previous sample is used), and writes only the limits that changed, also
+concurrently. Each cycle's end-to-end latency (first sample sent to last
+limit acknowledged) is reported:
+
+    controller = SiteController(
+        evnex, {"cp-1": 32, "cp-2": 32}, ControlPolicy(target_power=0)
+    )
+    asyncio.create_task(controller.run())
+    ...
+    print(controller.stats().max_latency)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import StrEnum
+
+from evnex.api import Evnex
+from evnex.jobs import CommandJobs
+from evnex.profiles import ChargingProfile
+from evnex.schema.v3.charge_points import EvnexChargePointDetail
+
+logger = logging.getLogger("evnex.controller")
+
+
+class MeterSource(StrEnum):
+    # The get-energy-meter-reading command: read from the charger on demand
+    COMMAND = "command"
+    # The connector meter in the v3 charge point detail: as last reported
+    DETAIL = "detail"
+
+
+@dataclass(frozen=True, slots=True)
+class ControlPolicy:
+    """How a SiteController samples and steers its site.
+
+    Powers are in watts, currents in amps per phase.
+    """
+
+    interval: float = 5.0
+    target_power: float = 0.0
+    deadband: float = 230.0
+    ramp: float = 4.0
+    min_current: int = 6
+    start_margin: float = 2.0
+    stop_delay: int = 3
+    voltage: float = 230.0
+    phases: int = 1
+    sample_timeout: float = 4.0
+    source: MeterSource = MeterSource.COMMAND
+
+    def __post_init__(self) -> None:
+        if self.interval <= 0 or self.sample_timeout <= 0:
+            raise ValueError("interval and sample_timeout must be positive")
+        if self.ramp <= 0:
+            raise ValueError("ramp must be positive")
+        if self.phases not in (1, 3):
+            raise ValueError("phases must be 1 or 3")
+
+    def amps(self, watts: float) -> float:
+        return watts / (self.voltage * self.phases)
+
+
+@dataclass(frozen=True, slots=True)
+class Sample:
+    charge_point_id: str
+    charging_power: float
+    # None when the charger has no power sensor
+    supply_power: float | None
+    sampled_at: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class CycleReport:
+    """What one control cycle saw and did."""
+
+    supply_power: float | None
+    charging_power: float
+    # The total current the site's chargers were allowed
+    total_current: float
+    limits: Mapping[str, int]
+    # Charge point ids whose limit was written this cycle
+    written: tuple[str, ...]
+    # Chargers that did not answer in time (their last sample was used)
+    missed: tuple[str, ...]
+    sample_latency: float
+    latency: float
+    # Why control was skipped or a write failed, if either happened
+    errors: Mapping[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class ControllerStats:
+    cycles: int
+    writes: int
+    failed_writes: int
+    last_latency: float | None
+    max_latency: float | None
+    mean_latency: float | None
+
+
+class SiteController:
+    """Steers a site's chargers to keep its supply power near a target.
+
+    :param client: the Evnex client
+    :param charge_points: the site's chargers, as their maxCurrent by id
+    :param policy: the target and how to approach it
+    :param meter_charge_point_id: the charger whose power sensor measures
+        the supply; by default the freshest reading of any charger is used
+    """
+
+    def __init__(
+        self,
+        client: Evnex,
+        charge_points: Mapping[str, float],
+        policy: ControlPolicy | None = None,
+        *,
+        meter_charge_point_id: str | None = None,
+    ) -> None:
+        if not charge_points:
+            raise ValueError("A site needs at least one charge point")
+        if meter_charge_point_id not in (None, *charge_points):
+            raise ValueError(f"{meter_charge_point_id} is not one of the site's")
+        self.client = client
+        self.max_current = dict(charge_points)
+        self.policy = policy or ControlPolicy()
+        self.meter_charge_point_id = meter_charge_point_id
+        self.samples: dict[str, Sample] = {}
+        # The limit each charger was last written, once known
+        self.limits: dict[str, int] = {}
+        self.last_report: CycleReport | None = None
+        self._total: float | None = None
+        self._short_cycles = 0
+        self._cycles = 0
+        self._writes = 0
+        self._failed_writes = 0
+        self._latencies: list[float] = []
+
+    def stats(self) -> ControllerStats:
+        latencies = self._latencies
+        return ControllerStats(
+            cycles=self._cycles,
+            writes=self._writes,
+            failed_writes=self._failed_writes,
+            last_latency=latencies[-1] if latencies else None,
+            max_latency=max(latencies) if latencies else None,
+            mean_latency=sum(latencies) / len(latencies) if latencies else None,
+        )
+
+    async def _sample(self, charge_point_id: str) -> Sample:
+        if self.policy.source == MeterSource.COMMAND:
+            response = await self.client.get_charge_point_energy_meter_reading(
+                charge_point_id
+            )
+            reading = response.data
+            return Sample(
+                charge_point_id,
+                reading.chargingActivePower,
+                reading.supplyActivePower,
+                reading.timestamp,
+            )
+        response_v3 = await self.client.get_charge_point_detail_v3(charge_point_id)
+        detail: EvnexChargePointDetail = response_v3.data.attributes
+        meters = [c.meter for c in detail.connectors if c.meter is not None]
+        if not meters:
+            raise ValueError(f"{charge_point_id} reports no meter")
+        supply = [
+            m.supplyActivePower for m in meters if m.supplyActivePower is not None
+        ]
+        return Sample(
+            charge_point_id,
+            sum(m.power for m in meters),
+            supply[0] if supply else None,
+            max(m.updatedDate for m in meters),
+        )
+
+    async def sample(self) -> list[str]:
+        """Sample every charger at once; returns the ids that missed out."""
+
+        async def bounded(charge_point_id: str) -> Sample:
+            async with asyncio.timeout(self.policy.sample_timeout):
+                return await self._sample(charge_point_id)
+
+        ids = list(self.max_current)
+        results = await asyncio.gather(
+            *(bounded(cp_id) for cp_id in ids), return_exceptions=True
+        )
+        missed = []
+        for cp_id, result in zip(ids, results, strict=True):
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, BaseException):
+                logger.debug(f"No meter reading from {cp_id}: {result!r}")
+                missed.append(cp_id)
+            else:
+                self.samples[cp_id] = result
+        return missed
+
+    def supply_power(self) -> float | None:
+        """The site's supply power, from the meter charger or the freshest."""
+        if self.meter_charge_point_id is not None:
+            sample = self.samples.get(self.meter_charge_point_id)
+            return sample.supply_power if sample else None
+        metered = [s for s in self.samples.values() if s.supply_power is not None]
+        if not metered:
+            return None
+        return max(metered, key=lambda s: s.sampled_at).supply_power
+
+    def plan(self, supply_power: float) -> tuple[float, dict[str, int]]:
+        """The total current to allow and each charger's limit within it."""
+        policy = self.policy
+        charging = policy.amps(sum(s.charging_power for s in self.samples.values()))
+        previous = self._total if self._total is not None else charging
+        error = policy.target_power - supply_power
+        if abs(error) <= policy.deadband:
+            total = previous
+        else:
+            # Chargers draw at most their limit, so steer from what they
+            # actually draw; a limit above it would only wind up
+            total = min(charging + policy.amps(error), previous + policy.ramp)
+        total = max(0.0, min(total, sum(self.max_current.values())))
+
+        # Hysteresis on how many chargers run at all
+        running = [cp_id for cp_id, limit in self.limits.items() if limit > 0]
+        fits = min(len(self.max_current), math.floor(total / policy.min_current))
+        count = len(running)
+        if fits < count:
+            self._short_cycles += 1
+            if self._short_cycles > policy.stop_delay:
+                count, self._short_cycles = fits, 0
+            else:
+                # Hold the minimum a little longer rather than stop
+                total = max(total, count * policy.min_current)
+        else:
+            self._short_cycles = 0
+            while (
+                count < len(self.max_current)
+                and total >= (count + 1) * policy.min_current + policy.start_margin
+            ):
+                count += 1
+
+        # Keep the running chargers running; start the others in id order
+        order = running + sorted(set(self.max_current) - set(running))
+        chosen = order[:count]
+        limits = dict.fromkeys(self.max_current, 0)
+        # Share equally, handing what a charger cannot use to the rest
+        remaining = total
+        for index, cp_id in enumerate(sorted(chosen, key=self.max_current.__getitem__)):
+            share = remaining / (count - index)
+            limits[cp_id] = max(
+                policy.min_current, math.floor(min(share, self.max_current[cp_id]))
+            )
+            remaining -= limits[cp_id]
+        return total, limits
+
+    async def _write(self, limits: dict[str, int]) -> tuple[list[str], dict[str, str]]:
+        changed = {
+            cp_id: limit
+            for cp_id, limit in limits.items()
+            if self.limits.get(cp_id) != limit
+        }
+        written, errors = [], {}
+        async with CommandJobs(self.client, concurrency=len(changed) or 1) as jobs:
+            for cp_id, limit in changed.items():
+                jobs.submit(
+                    cp_id,
+                    "set_charger_load_profile",
+                    charging_profile_periods=ChargingProfile(((0, limit),)),
+                    enabled=True,
+                )
+            async for result in jobs.as_completed():
+                cp_id = result.charge_point_id
+                if result.ok:
+                    self.limits[cp_id] = changed[cp_id]
+                    written.append(cp_id)
+                else:
+                    # Unknown now, so it is written again next cycle
+                    self.limits.pop(cp_id, None)
+                    errors[cp_id] = f"{result.state}: {result.error}"
+        self._writes += len(written)
+        self._failed_writes += len(errors)
+        return sorted(written), errors
+
+    async def step(self) -> CycleReport:
+        """Run one control cycle: sample, plan and write."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        missed = await self.sample()
+        sample_latency = loop.time() - started
+        supply = self.supply_power()
+        charging = sum(s.charging_power for s in self.samples.values())
+        if supply is None:
+            report = CycleReport(
+                None,
+                charging,
+                self._total or 0.0,
+                dict(self.limits),
+                (),
+                tuple(missed),
+                sample_latency,
+                sample_latency,
+                {"supply": "No supply power reading; limits left as they are"},
+            )
+        else:
+            total, limits = self.plan(supply)
+            written, errors = await self._write(limits)
+            self._total = total
+            report = CycleReport(
+                supply,
+                charging,
+                total,
+                limits,
+                tuple(written),
+                tuple(missed),
+                sample_latency,
+                loop.time() - started,
+                errors,
+            )
+        self._cycles += 1
+        self._latencies = [*self._latencies[-99:], report.latency]
+        self.last_report = report
+        logger.debug(
+            f"Supply {report.supply_power} W, {report.total_current:.1f} A allowed, "
+            f"{len(report.written)} limit(s) written in {report.latency:.3f} s"
+        )
+        return report
+
+    async def run(self) -> None:
+        """Control every interval until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            report = await self.step()
+            if report.latency > self.policy.interval:
+                logger.warning(
+                    f"A control cycle took {report.latency:.1f} s, longer than "
+                    f"the {self.policy.interval} s interval"
+                )
+            await asyncio.sleep(
+                max(0.0, self.policy.interval - (loop.time() - started))
+            )
@@ -0,0 +1,163 @@
+"""Prometheus metrics for a fleet, rendered from the poller's latest snapshot.
+
+A scrape never touches the API: render_metrics formats whatever FleetPoller
+last collected, so Grafana can scrape as often as it likes while upstream
+load stays at one poll per interval. The output is the Prometheus text
+exposition format (version 0.0.4), written directly so no client library is
+needed:
+
+    evnex_connector_power_watts{charge_point_id="cp-1",connector_id="1"} 7200
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from evnex.poller import FleetPoller
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+PHASES = ("L1", "L2", "L3")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    # int() of NaN or infinity raises; the format has its own spellings
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+@dataclass(slots=True)
+class MetricFamily:
+    """One metric name, its help and type, and its labelled samples."""
+
+    name: str
+    help: str
+    type: str = "gauge"
+    samples: list[tuple[dict[str, str], float]] = field(default_factory=list)
+
+    def add(self, value: float | None, **labels: str) -> None:
+        # A reading the charger did not report is left out, not exported as 0
+        if value is not None:
+            self.samples.append((labels, value))
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.type}"
+        for labels, value in self.samples:
+            rendered = ",".join(
+                f'{key}="{_escape(label)}"' for key, label in labels.items()
+            )
+            suffix = f"{{{rendered}}}" if rendered else ""
+            yield f"{self.name}{suffix} {_format_value(value)}"
+
+
+def collect(poller: FleetPoller) -> list[MetricFamily]:
+    """Build the metric families from the poller's latest fleet snapshot."""
+    info = MetricFamily(
+        "evnex_charge_point_info",
+        "Charge point name and serial; always 1",
+    )
+    online = MetricFamily(
+        "evnex_charge_point_online",
+        "Whether the charge point is connected to the EVNEX cloud",
+    )
+    status = MetricFamily(
+        "evnex_connector_status",
+        "Connector OCPP status; 1 for the current status",
+    )
+    power = MetricFamily("evnex_connector_power_watts", "Charging power")
+    supply = MetricFamily(
+        "evnex_connector_supply_active_power_watts",
+        "Grid power measured by the power sensor",
+    )
+    current = MetricFamily("evnex_connector_current_amperes", "Current per phase")
+    voltage = MetricFamily(
+        "evnex_connector_voltage_volts", "Phase to neutral voltage per phase"
+    )
+    temperature = MetricFamily(
+        "evnex_connector_temperature_celsius", "Connector temperature"
+    )
+    frequency = MetricFamily("evnex_connector_frequency_hertz", "Supply frequency")
+    energy = MetricFamily(
+        "evnex_session_energy_watt_hours",
+        "Energy delivered so far in the active charging session",
+    )
+    connectors = MetricFamily(
+        "evnex_org_connectors", "Connectors in the organisation per status"
+    )
+    families = [
+        info,
+        online,
+        status,
+        power,
+        supply,
+        current,
+        voltage,
+        temperature,
+        frequency,
+        energy,
+        connectors,
+    ]
+
+    fleet = poller.fleet
+    if fleet is not None:
+        for cp in fleet.charge_points:
+            info.add(1, charge_point_id=cp.id, name=cp.name, serial=cp.serial)
+            online.add(cp.network_status.upper() == "ONLINE", charge_point_id=cp.id)
+            for connector in cp.connectors:
+                labels = {
+                    "charge_point_id": cp.id,
+                    "connector_id": connector.connector_id,
+                }
+                status.add(1, **labels, status=connector.ocpp_status.upper())
+                power.add(connector.power, **labels)
+                supply.add(connector.supply_active_power, **labels)
+                temperature.add(connector.temperature, **labels)
+                frequency.add(connector.frequency, **labels)
+                for phase, amps, volts in zip(
+                    PHASES, connector.currents, connector.voltages, strict=True
+                ):
+                    current.add(amps, **labels, phase=phase)
+                    voltage.add(volts, **labels, phase=phase)
+            if cp.active_session is not None:
+                energy.add(
+                    cp.active_session.attributes.totalPowerUsage,
+                    charge_point_id=cp.id,
+                )
+        if fleet.summary is not None:
+            for name, count in fleet.summary.model_dump().items():
+                connectors.add(count, status=name)
+
+    last_success = MetricFamily(
+        "evnex_exporter_last_success_timestamp_seconds",
+        "When the fleet was last collected successfully",
+    )
+    if poller.last_success is not None:
+        last_success.add(poller.last_success.timestamp())
+    duration = MetricFamily(
+        "evnex_exporter_collection_duration_seconds",
+        "How long the last successful collection took",
+    )
+    duration.add(poller.last_duration)
+    failures = MetricFamily(
+        "evnex_exporter_collection_failures_total",
+        "Collections that failed since the exporter started",
+        type="counter",
+    )
+    failures.add(poller.failures)
+    return [*families, last_success, duration, failures]
+
+
+def render_metrics(poller: FleetPoller) -> str:
+    """The poller's latest snapshot in the Prometheus text format."""
+    lines = [line for family in collect(poller) for line in family.render()]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,293 @@
+"""A fleet-wide status view built from as few API calls as possible.
+
+The org charge point listing already carries each connector's OCPP status
+and charging power, so a fleet view needs one listing call (plus the org
+connector summary) rather than a detail and a sessions call per charger.
+get_fleet_status only goes back to the per-charger endpoints where the
+listing falls short: chargers listed without connectors, and chargers with
+a session in progress, whose grid power (v3 meter only) and session energy
+and cost are worth showing. Callers that want every charger's full v3 meter
+(per-phase currents and voltages, temperature) ask for full_detail.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from evnex.api import Evnex
+from evnex.schema.charge_points import EvnexChargePoint
+from evnex.schema.org import EvnexOrgSummaryStatus
+from evnex.schema.v3.charge_points import (
+    EvnexChargePointDetail as EvnexChargePointDetailV3,
+)
+from evnex.schema.v3.charge_points import EvnexChargePointSession
+from evnex.status import DeviceStatus
+
+# Connector states in which a session is in progress
+IN_SESSION_STATES = frozenset(
+    {DeviceStatus.CHARGING, DeviceStatus.SUSPENDED_EV, DeviceStatus.SUSPENDED_EVSE}
+)
+
+
+def _phases(
+    values: list[float | None] | None,
+) -> tuple[float | None, float | None, float | None]:
+    l1, l2, l3 = values or (None, None, None)
+    return l1, l2, l3
+
+
+@dataclass(frozen=True, slots=True)
+class ConnectorStatus:
+    connector_id: str
+    ocpp_status: str
+    # Watts; None when the connector reported no meter
+    power: float | None = None
+    # Grid draw from a power sensor; this and the readings below are only
+    # reported by the v3 detail endpoint
+    supply_active_power: float | None = None
+    currents: tuple[float | None, float | None, float | None] = (None, None, None)
+    voltages: tuple[float | None, float | None, float | None] = (None, None, None)
+    temperature: float | None = None
+    frequency: float | None = None
+    updated: datetime | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "connectorId": self.connector_id,
+            "ocppStatus": self.ocpp_status,
+            "power": self.power,
+            "supplyActivePower": self.supply_active_power,
+            "currents": list(self.currents),
+            "voltages": list(self.voltages),
+            "temperature": self.temperature,
+            "frequency": self.frequency,
+            "updatedDate": self.updated.isoformat() if self.updated else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ConnectorStatus:
+        updated = data.get("updatedDate")
+        return cls(
+            connector_id=data["connectorId"],
+            ocpp_status=data["ocppStatus"],
+            power=data.get("power"),
+            supply_active_power=data.get("supplyActivePower"),
+            currents=_phases(data.get("currents")),
+            voltages=_phases(data.get("voltages")),
+            temperature=data.get("temperature"),
+            frequency=data.get("frequency"),
+            updated=datetime.fromisoformat(updated) if updated else None,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ChargePointStatus:
+    id: str
+    name: str
+    serial: str
+    network_status: str
+    connectors: tuple[ConnectorStatus, ...]
+    # The in-progress session, when the charger was looked up in detail
+    active_session: EvnexChargePointSession | None = None
+    # Whether the per-charger detail endpoints were consulted
+    detailed: bool = False
+
+    @property
+    def in_session(self) -> bool:
+        return any(
+            connector.ocpp_status.upper() in IN_SESSION_STATES
+            for connector in self.connectors
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "serial": self.serial,
+            "networkStatus": self.network_status,
+            "connectors": [connector.to_dict() for connector in self.connectors],
+            "activeSession": (
+                self.active_session.model_dump(mode="json")
+                if self.active_session is not None
+                else None
+            ),
+            "detailed": self.detailed,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ChargePointStatus:
+        session = data.get("activeSession")
+        return cls(
+            id=data["id"],
+            name=data["name"],
+            serial=data["serial"],
+            network_status=data["networkStatus"],
+            connectors=tuple(
+                ConnectorStatus.from_dict(connector)
+                for connector in data.get("connectors") or ()
+            ),
+            active_session=(
+                EvnexChargePointSession.model_validate(session)
+                if session is not None
+                else None
+            ),
+            detailed=data.get("detailed", False),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class FleetStatus:
+    charge_points: tuple[ChargePointStatus, ...]
+    # Org-wide connector counts per status
+    summary: EvnexOrgSummaryStatus | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "chargePoints": [cp.to_dict() for cp in self.charge_points],
+            "summary": (
+                self.summary.model_dump(mode="json")
+                if self.summary is not None
+                else None
+            ),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> FleetStatus:
+        """The fleet status to_dict described; the inverse of to_dict."""
+        summary = data.get("summary")
+        return cls(
+            charge_points=tuple(
+                ChargePointStatus.from_dict(cp) for cp in data["chargePoints"]
+            ),
+            summary=(
+                EvnexOrgSummaryStatus.model_validate(summary)
+                if summary is not None
+                else None
+            ),
+        )
+
+
+def _from_listing(charge_point: EvnexChargePoint) -> ChargePointStatus:
+    connectors = tuple(
+        ConnectorStatus(
+            connector_id=connector.connectorId,
+            ocpp_status=connector.ocppStatus,
+            power=connector.meter.power if connector.meter is not None else None,
+            frequency=(
+                connector.meter.frequency if connector.meter is not None else None
+            ),
+            updated=connector.updatedDate,
+        )
+        for connector in charge_point.connectors or ()
+    )
+    return ChargePointStatus(
+        id=charge_point.id,
+        name=charge_point.name,
+        serial=charge_point.serial,
+        network_status=charge_point.networkStatus,
+        connectors=connectors,
+    )
+
+
+def _from_detail(
+    charge_point_id: str,
+    detail: EvnexChargePointDetailV3,
+    sessions: list[EvnexChargePointSession],
+) -> ChargePointStatus:
+    connectors = []
+    for connector in detail.connectors:
+        meter = connector.meter
+        if meter is None:
+            connectors.append(
+                ConnectorStatus(
+                    connector_id=connector.connectorId,
+                    ocpp_status=connector.ocppStatus,
+                    updated=connector.updatedDate,
+                )
+            )
+            continue
+        connectors.append(
+            ConnectorStatus(
+                connector_id=connector.connectorId,
+                ocpp_status=connector.ocppStatus,
+                power=meter.power,
+                supply_active_power=meter.supplyActivePower,
+                currents=(meter.currentL1, meter.currentL2, meter.currentL3),
+                voltages=(meter.voltageL1N, meter.voltageL2N, meter.voltageL3N),
+                temperature=meter.temperature,
+                frequency=meter.frequency,
+                updated=connector.updatedDate,
+            )
+        )
+    active = [s for s in sessions if s.attributes.endDate is None]
+    return ChargePointStatus(
+        id=charge_point_id,
+        name=detail.name,
+        serial=detail.serial,
+        network_status=detail.networkStatus,
+        connectors=tuple(connectors),
+        active_session=max(
+            active,
+            key=lambda s: s.attributes.startDate or datetime.min.replace(tzinfo=UTC),
+            default=None,
+        ),
+        detailed=True,
+    )
+
+
+def needs_detail(charge_point: EvnexChargePoint) -> bool:
+    """Whether the listing alone is not enough to report this charger."""
+    return not charge_point.connectors or _from_listing(charge_point).in_session
+
+
+async def get_fleet_status(
+    client: Evnex,
+    org_id: str | None = None,
+    *,
+    charge_points: list[EvnexChargePoint] | None = None,
+    concurrency: int = 10,
+    include_summary: bool = True,
+    full_detail: bool = False,
+) -> FleetStatus:
+    """Report every charge point's status from the org listing.
+
+    One listing call (and, with include_summary, one connector summary call)
+    covers the fleet; only chargers needing more (see needs_detail) cost a
+    detail and a sessions call each, at most ``concurrency`` at a time.
+    Pass charge_points to reuse a listing already fetched (or a subset of it).
+    With full_detail, every other charger costs a detail call too.
+    """
+    summary: EvnexOrgSummaryStatus | None = None
+    if charge_points is None and include_summary:
+        charge_points, summary = await asyncio.gather(
+            client.get_org_charge_points(org_id),
+            client.get_org_connector_summary(org_id),
+        )
+    elif charge_points is None:
+        charge_points = await client.get_org_charge_points(org_id)
+    elif include_summary:
+        summary = await client.get_org_connector_summary(org_id)
+    assert charge_points is not None
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def status_of(charge_point: EvnexChargePoint) -> ChargePointStatus:
+        if not needs_detail(charge_point):
+            if not full_detail:
+                return _from_listing(charge_point)
+            # Idle per the listing, so there is no session worth fetching
+            async with semaphore:
+                idle = await client.get_charge_point_detail_v3(charge_point.id)
+            return _from_detail(charge_point.id, idle.data.attributes, [])
+        async with semaphore:
+            detail, sessions = await asyncio.gather(
+                client.get_charge_point_detail_v3(charge_point.id),
+                client.get_charge_point_sessions(charge_point.id),
+            )
+        return _from_detail(charge_point.id, detail.data.attributes, sessions)
+
+    statuses = await asyncio.gather(*(status_of(cp) for cp in charge_points))
+    return FleetStatus(charge_points=tuple(statuses), summary=summary)
@@ -0,0 +1,178 @@
+"""Hedged requests for idempotent reads.
+
+A hedged request sends a duplicate of a slow GET once the first attempt has
+been outstanding longer than usual for its endpoint, then keeps whichever
+answers first and cancels the other. It trades a small amount of extra load
+for a large cut in tail latency: the slow tail is usually a stalled
+connection or a slow backend instance, not a slow query.
+
+Only reads are ever hedged. Commands (``/commands/*`` POSTs) act on a
+physical charger and must never be sent twice, so the Evnex client only
+routes GETs through the hedger, and only for endpoints it names explicitly.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+import httpx
+
+logger = logging.getLogger("evnex.hedging")
+
+
+@dataclass(frozen=True, slots=True)
+class HedgingPolicy:
+    """When to send a duplicate read, and how many duplicates are affordable.
+
+    The hedge delay is the ``percentile`` of recently observed latencies for
+    the endpoint, clamped to [min_delay, max_delay]. Until ``min_samples``
+    latencies have been seen, ``initial_delay`` is used instead.
+
+    ``budget`` caps hedges as a fraction of requests: each request earns
+    ``budget`` credit, each hedge spends one, and at most ``burst`` credit is
+    banked. The default hedges at most one request in twenty.
+    """
+
+    percentile: float = 0.95
+    min_delay: float = 0.05
+    max_delay: float = 5.0
+    initial_delay: float = 1.0
+    min_samples: int = 20
+    window: int = 200
+    budget: float = 0.05
+    burst: float = 3.0
+
+    def __post_init__(self) -> None:
+        if not 0 < self.percentile < 1:
+            raise ValueError("percentile must be between 0 and 1")
+        if not 0 <= self.budget <= 1:
+            raise ValueError("budget must be between 0 and 1")
+        if self.min_delay > self.max_delay:
+            raise ValueError("min_delay must not exceed max_delay")
+
+
+@dataclass(frozen=True, slots=True)
+class HedgingStats:
+    """Counters describing how often hedging fired and whether it paid off."""
+
+    requests: int
+    hedged: int
+    hedge_wins: int
+
+
+class LatencyWindow:
+    """The most recent latencies observed for one endpoint, in seconds."""
+
+    def __init__(self, size: int) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def quantile(self, q: float) -> float | None:
+        """The q-quantile of the window (nearest rank), or None when empty."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))
+        return ordered[index]
+
+
+class RequestHedger:
+    """Runs reads under a HedgingPolicy, tracking latency per endpoint key."""
+
+    def __init__(self, policy: HedgingPolicy) -> None:
+        self.policy = policy
+        self._windows: defaultdict[str, LatencyWindow] = defaultdict(
+            lambda: LatencyWindow(policy.window)
+        )
+        self._credit = 0.0
+        self._requests = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+
+    @property
+    def stats(self) -> HedgingStats:
+        return HedgingStats(
+            requests=self._requests,
+            hedged=self._hedged,
+            hedge_wins=self._hedge_wins,
+        )
+
+    def delay_for(self, key: str) -> float:
+        """Seconds to wait on the first attempt before hedging this endpoint."""
+        policy = self.policy
+        window = self._windows[key]
+        observed = window.quantile(policy.percentile)
+        if observed is None or len(window) < policy.min_samples:
+            delay = policy.initial_delay
+        else:
+            delay = observed
+        return min(policy.max_delay, max(policy.min_delay, delay))
+
+    def _spend_budget(self) -> bool:
+        if self._credit >= 1:
+            self._credit -= 1
+            return True
+        return False
+
+    async def run(
+        self, key: str, send: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """Send a read, hedging it once if it outlives the endpoint's delay.
+
+        The first successful (2xx) response wins and the other attempt is
+        cancelled. If both attempts fail, the last failure is surfaced — a
+        non-2xx response is returned for the caller's usual status handling,
+        an exception is re-raised.
+        """
+        loop = asyncio.get_running_loop()
+        self._requests += 1
+        self._credit = min(self.policy.burst, self._credit + self.policy.budget)
+        window = self._windows[key]
+
+        started = loop.time()
+        primary = asyncio.ensure_future(send())
+        attempts: dict[asyncio.Future[httpx.Response], float] = {primary: started}
+        try:
+            answered, _ = await asyncio.wait({primary}, timeout=self.delay_for(key))
+            if answered or not self._spend_budget():
+                response = await primary
+                window.observe(loop.time() - started)
+                return response
+
+            logger.debug(f"Hedging slow read {key}")
+            self._hedged += 1
+            hedge = asyncio.ensure_future(send())
+            attempts[hedge] = loop.time()
+
+            pending: set[asyncio.Future[httpx.Response]] = {primary, hedge}
+            failure: asyncio.Future[httpx.Response] | None = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for attempt in done:
+                    if attempt.exception() is None and attempt.result().is_success:
+                        window.observe(loop.time() - attempts[attempt])
+                        if attempt is hedge:
+                            self._hedge_wins += 1
+                        return attempt.result()
+                    failure = attempt
+            assert failure is not None
+            return failure.result()
+        finally:
+            for attempt in attempts:
+                if not attempt.done():
+                    attempt.cancel()
+                elif not attempt.cancelled():
+                    # Mark a losing attempt's error as retrieved so asyncio
+                    # does not log it as unhandled
+                    attempt.exception()
@@ -0,0 +1,336 @@
+"""Daily insights over any range of days, cached a day at a time.
+
+get_org_insight only answers for the trailing 7, 14 or 30 days, organisation
+wide, and every call fetches each day again. fetch_insights assembles the
+daily totals for any range of days from the org endpoint and the chargers'
+sessions:
+
+    cache = await asyncio.to_thread(InsightCache.open, path)
+    insights = await fetch_insights(
+        evnex, date(2024, 1, 1), date(2024, 6, 30), cache=cache,
+        by_charge_point=True,
+    )
+    insights.days                       # one EvnexOrgInsightEntry per day
+    insights.charge_points["cp-1"]      # the same days for one charger
+
+A day's totals stop changing once its sessions have ended and been costed.
+InsightCache keeps settled days for good, keyed by organisation,
+``tz_offset`` (which decides where a day starts) and date. A day counts as
+settled once it is SETTLING_DAYS behind today, and, where its sessions were
+read, once every session started on it has ended. Only the days the cache
+lacks are fetched, so later reads fetch just the recent, unsettled ones. Days
+within the org endpoint's reach come from the smallest window that covers
+them. Older days, and the per-charger breakdown the endpoint cannot give,
+are totalled from each charger's sessions. Those are fetched concurrently
+with the window, ``concurrency`` chargers at a time, and only when needed.
+
+Session totals attribute a session to the day it started. Sessions carry no
+carbon offset, so days totalled from them report a carbonOffset of 0.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, time, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from evnex.api import Evnex
+from evnex.schema.charge_points import EvnexChargePoint
+from evnex.schema.cost import EvnexCost
+from evnex.schema.org import EvnexOrgInsightEntry
+from evnex.schema.v3.charge_points import EvnexChargePointSession
+
+logger = logging.getLogger("evnex.insights")
+
+# The trailing windows, in days and including today, get_org_insight accepts
+WINDOWS = (7, 14, 30)
+# Days before today whose totals may still change while sessions are costed
+SETTLING_DAYS = 1
+CACHE_VERSION = 1
+
+
+def _key(org_id: str, tz_offset: int, day: date) -> str:
+    return f"{org_id}|{tz_offset}|{day.isoformat()}"
+
+
+class InsightCache:
+    """Insights for settled days, by organisation, offset and date.
+
+    Kept in memory, and in a JSON file when given a path. open and save do
+    blocking file I/O: from async code run them with asyncio.to_thread.
+    fetch_insights saves the cache itself after adding days to it.
+    """
+
+    def __init__(self, path: str | os.PathLike[str] | None = None) -> None:
+        self.path = None if path is None else Path(path)
+        self._days: dict[str, dict[str, Any]] = {}
+        self._charge_points: dict[str, dict[str, dict[str, Any]]] = {}
+
+    @classmethod
+    def open(cls, path: str | os.PathLike[str]) -> InsightCache:
+        """The cache saved at ``path``; empty if there is none or it is
+        unreadable."""
+        cache = cls(path)
+        try:
+            saved = json.loads(Path(path).read_text())
+            if saved.get("version") != CACHE_VERSION:
+                raise ValueError(f"unknown version {saved.get('version')}")
+            cache._days = dict(saved["days"])
+            cache._charge_points = dict(saved["chargePoints"])
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, AttributeError) as err:
+            logger.warning(f"Ignoring unreadable insight cache {path}: {err}")
+        return cache
+
+    def save(self) -> None:
+        """Atomically replace the cache file; a no-op without a path."""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        encoded = json.dumps(
+            {
+                "version": CACHE_VERSION,
+                "days": self._days,
+                "chargePoints": self._charge_points,
+            }
+        ).encode()
+        with tempfile.NamedTemporaryFile(
+            dir=self.path.parent, prefix=f".{self.path.name}.", delete=False
+        ) as file:
+            try:
+                file.write(encoded)
+            except BaseException:
+                os.unlink(file.name)
+                raise
+        os.replace(file.name, self.path)
+
+    def day(
+        self, org_id: str, tz_offset: int, day: date
+    ) -> EvnexOrgInsightEntry | None:
+        """The organisation's totals for ``day``, if cached."""
+        entry = self._days.get(_key(org_id, tz_offset, day))
+        return None if entry is None else EvnexOrgInsightEntry.model_validate(entry)
+
+    def charge_points(
+        self, org_id: str, tz_offset: int, day: date
+    ) -> dict[str, EvnexOrgInsightEntry] | None:
+        """Every charger's totals for ``day``, by charge point id, if cached."""
+        entries = self._charge_points.get(_key(org_id, tz_offset, day))
+        if entries is None:
+            return None
+        return {
+            cp_id: EvnexOrgInsightEntry.model_validate(entry)
+            for cp_id, entry in entries.items()
+        }
+
+    def store(
+        self,
+        org_id: str,
+        tz_offset: int,
+        day: date,
+        totals: EvnexOrgInsightEntry | None = None,
+        charge_points: dict[str, EvnexOrgInsightEntry] | None = None,
+    ) -> None:
+        """Keep a settled day's totals and/or per-charger totals."""
+        key = _key(org_id, tz_offset, day)
+        if totals is not None:
+            self._days[key] = totals.model_dump(mode="json")
+        if charge_points is not None:
+            self._charge_points[key] = {
+                cp_id: entry.model_dump(mode="json")
+                for cp_id, entry in charge_points.items()
+            }
+
+
+@dataclass(frozen=True, slots=True)
+class InsightRange:
+    """Daily totals from the first day to the last, one entry per day.
+
+    :param charge_points: the same days for each charger, by charge point
+        id; empty unless asked for
+    """
+
+    days: list[EvnexOrgInsightEntry]
+    charge_points: dict[str, list[EvnexOrgInsightEntry]]
+
+
+def _totals(
+    day: date, zone: timezone, sessions: Iterable[EvnexChargePointSession]
+) -> EvnexOrgInsightEntry:
+    """A day's insight entry totalled from the sessions started on it."""
+    count = 0
+    energy = duration = 0.0
+    carbon: float | None = None
+    cost: float | None = None
+    currency: str | None = None
+    for session in sessions:
+        attributes = session.attributes
+        count += 1
+        energy += attributes.totalPowerUsage or 0.0
+        duration += attributes.totalDuration or 0.0
+        if attributes.totalCarbonUsage is not None:
+            carbon = (carbon or 0.0) + attributes.totalCarbonUsage
+        if attributes.totalCost is not None:
+            cost = (cost or 0.0) + attributes.totalCost.amount
+            currency = currency or attributes.totalCost.currency
+    return EvnexOrgInsightEntry(
+        carbonOffset=0.0,
+        carbonUsage=carbon,
+        cost=EvnexCost(currency=currency, cost=cost),
+        duration=round(duration),
+        powerUsage=energy,
+        sessions=count,
+        startDate=datetime.combine(day, time(), zone),
+    )
+
+
+def _day_of(moment: datetime, zone: timezone) -> date:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=UTC)
+    return moment.astimezone(zone).date()
+
+
+async def fetch_insights(
+    client: Evnex,
+    start: date,
+    end: date,
+    *,
+    org_id: str | None = None,
+    tz_offset: int = 12,
+    cache: InsightCache | None = None,
+    by_charge_point: bool = False,
+    concurrency: int = 10,
+    today: date | None = None,
+) -> InsightRange:
+    """Daily insights from ``start`` to ``end`` inclusive.
+
+    Days after today are left out.
+
+    :param tz_offset: hours east of UTC where each day starts, as for
+        get_org_insight
+    :param cache: settled days to reuse and add to; saved if it has a path
+    :param by_charge_point: also total each charger's days from its sessions
+    :param concurrency: chargers whose sessions are fetched at once
+    :param today: the current day at ``tz_offset``, for tests
+    """
+    org_id = client._resolve_org_id(org_id)
+    zone = timezone(timedelta(hours=tz_offset))
+    today = today or datetime.now(zone).date()
+    end = min(end, today)
+    if start > end:
+        raise ValueError(f"start ({start}) is after end ({end})")
+    days = [start + timedelta(days=n) for n in range((end - start).days + 1)]
+    cache = cache if cache is not None else InsightCache()
+
+    totals: dict[date, EvnexOrgInsightEntry] = {}
+    breakdown: dict[date, dict[str, EvnexOrgInsightEntry]] = {}
+    for day in days:
+        if day == today:
+            continue
+        if (cached := cache.day(org_id, tz_offset, day)) is not None:
+            totals[day] = cached
+        if by_charge_point:
+            per_charger = cache.charge_points(org_id, tz_offset, day)
+            if per_charger is not None:
+                breakdown[day] = per_charger
+    missing = [day for day in days if day not in totals]
+    in_reach = [day for day in missing if (today - day).days < WINDOWS[-1]]
+    out_of_reach = [day for day in missing if (today - day).days >= WINDOWS[-1]]
+    unbroken = [day for day in days if by_charge_point and day not in breakdown]
+
+    async def window() -> list[EvnexOrgInsightEntry]:
+        if not in_reach:
+            return []
+        back = (today - in_reach[0]).days
+        size = next(size for size in WINDOWS if back < size)
+        entries: list[EvnexOrgInsightEntry] = await client.get_org_insight(
+            size, org_id, tz_offset
+        )
+        return entries
+
+    async def sessions() -> dict[str, list[EvnexChargePointSession]]:
+        if not (out_of_reach or unbroken):
+            return {}
+        listing: list[EvnexChargePoint] = await client.get_org_charge_points(org_id)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def sessions_of(cp_id: str) -> list[EvnexChargePointSession]:
+            async with semaphore:
+                fetched: list[
+                    EvnexChargePointSession
+                ] = await client.get_charge_point_sessions(cp_id)
+                return fetched
+
+        ids = [cp.id for cp in listing]
+        fetched = await asyncio.gather(*(sessions_of(cp_id) for cp_id in ids))
+        return dict(zip(ids, fetched, strict=True))
+
+    entries, by_charger = await asyncio.gather(window(), sessions())
+
+    for entry in entries:
+        day = _day_of(entry.startDate, zone)
+        if day in in_reach:
+            totals[day] = entry
+    started: dict[date, dict[str, list[EvnexChargePointSession]]] = defaultdict(
+        lambda: {cp_id: [] for cp_id in by_charger}
+    )
+    for cp_id, cp_sessions in by_charger.items():
+        for session in cp_sessions:
+            if session.attributes.startDate is not None:
+                day = _day_of(session.attributes.startDate, zone)
+                started[day][cp_id].append(session)
+    for day in out_of_reach:
+        totals[day] = _totals(
+            day, zone, (s for cp in started[day].values() for s in cp)
+        )
+    for day in in_reach:
+        # The endpoint leaves out days without activity
+        totals.setdefault(day, _totals(day, zone, ()))
+    for day in unbroken:
+        breakdown[day] = {
+            cp_id: _totals(day, zone, cp_sessions)
+            for cp_id, cp_sessions in started[day].items()
+        }
+
+    # A session still running (or not yet costed) changes its day's totals
+    unsettled = {
+        day
+        for day, by_cp in started.items()
+        if any(s.attributes.endDate is None for cp in by_cp.values() for s in cp)
+    }
+    settled_before = today - timedelta(days=SETTLING_DAYS)
+    finished = sorted(
+        day
+        for day in {*missing, *unbroken}
+        if day < settled_before and day not in unsettled
+    )
+    for day in finished:
+        cache.store(
+            org_id,
+            tz_offset,
+            day,
+            totals[day] if day in missing else None,
+            breakdown[day] if day in unbroken else None,
+        )
+    if finished and cache.path is not None:
+        try:
+            await asyncio.to_thread(cache.save)
+        except OSError as err:
+            logger.warning(f"Could not save the insight cache {cache.path}: {err}")
+
+    # A charger missing from a day (not yet installed) had no sessions on it
+    cp_ids = sorted({cp_id for day in breakdown for cp_id in breakdown[day]})
+    charge_points = {
+        cp_id: [breakdown[day].get(cp_id) or _totals(day, zone, ()) for day in days]
+        for cp_id in cp_ids
+    }
+    return InsightRange([totals[day] for day in days], charge_points)
@@ -0,0 +1,298 @@
+"""Fleet-wide command dispatch with results consumed as they complete.
+
+Commands such as get_charge_point_status or set_charge_point_override only
+return once the charger acknowledges, which can take seconds per charger.
+CommandJobs runs many of them concurrently (bounded), and hands back each
+result as soon as it is available:
+
+    async with CommandJobs(evnex, concurrency=20, timeout=30) as jobs:
+        for charge_point in charge_points:
+            jobs.submit(charge_point.id, "set_charge_point_override", charge_now=False)
+        async for result in jobs.as_completed():
+            print(result.charge_point_id, result.state)
+    print(jobs.summary())
+
+Every job has an idempotency key (derived from the command and its arguments
+unless given): submitting the same key again returns the existing job rather
+than sending the command twice, so a caller retrying its own submission loop
+cannot double-command a charger. To deliberately re-send, use a new key.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any
+
+import httpx
+
+from evnex.api import Evnex
+
+logger = logging.getLogger("evnex.jobs")
+
+
+class JobState(StrEnum):
+    PENDING = "pending"
+    RUNNING = "running"
+    ACKED = "acked"
+    FAILED = "failed"
+    TIMED_OUT = "timed_out"
+    CANCELLED = "cancelled"
+
+
+FINISHED_STATES = frozenset(
+    {JobState.ACKED, JobState.FAILED, JobState.TIMED_OUT, JobState.CANCELLED}
+)
+
+
+@dataclass(frozen=True, slots=True)
+class JobResult:
+    """The outcome of one command job."""
+
+    key: str
+    charge_point_id: str
+    command: str
+    state: JobState
+    value: Any = None
+    error: BaseException | None = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.state == JobState.ACKED
+
+
+@dataclass(frozen=True, slots=True)
+class JobSummary:
+    """Charge point ids grouped by how their jobs ended (or haven't yet)."""
+
+    acked: tuple[str, ...] = ()
+    failed: tuple[str, ...] = ()
+    timed_out: tuple[str, ...] = ()
+    cancelled: tuple[str, ...] = ()
+    pending: tuple[str, ...] = ()
+
+
+class CommandJob:
+    """A submitted command; await result() or cancel() it."""
+
+    def __init__(
+        self,
+        key: str,
+        charge_point_id: str,
+        command: str,
+        kwargs: dict[str, Any],
+        timeout: float | None,
+    ) -> None:
+        self.key = key
+        self.charge_point_id = charge_point_id
+        self.command = command
+        self.kwargs = kwargs
+        self.timeout = timeout
+        self.state = JobState.PENDING
+        self._result: JobResult | None = None
+        self._task: asyncio.Task[JobResult] | None = None
+
+    @property
+    def done(self) -> bool:
+        return self.state in FINISHED_STATES
+
+    def cancel(self) -> bool:
+        """Cancel the job if it has not finished; returns whether it did."""
+        if self.done or self._task is None:
+            return False
+        return self._task.cancel()
+
+    async def result(self) -> JobResult:
+        assert self._task is not None
+        try:
+            return await self._task
+        except asyncio.CancelledError:
+            # Cancelled before it started: the done callback recorded it
+            if self._task.cancelled() and self._result is not None:
+                return self._result
+            raise
+
+    def __repr__(self) -> str:
+        return f"CommandJob({self.key!r}, state={self.state})"
+
+
+def _default_key(charge_point_id: str, command: str, kwargs: dict[str, Any]) -> str:
+    arguments = ",".join(f"{name}={kwargs[name]!r}" for name in sorted(kwargs))
+    return f"{command}:{charge_point_id}:{arguments}"
+
+
+class CommandJobs:
+    """Dispatches commands to many chargers with bounded concurrency.
+
+    :param client: the Evnex client the commands are sent through
+    :param concurrency: how many commands may be in flight at once
+    :param timeout: default per-job deadline in seconds, including time spent
+        retrying; None leaves it to the command's own HTTP timeout
+    """
+
+    def __init__(
+        self,
+        client: Evnex,
+        *,
+        concurrency: int = 10,
+        timeout: float | None = None,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.client = client
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._jobs: dict[str, CommandJob] = {}
+        self._finished: list[JobResult] = []
+        self._changed = asyncio.Event()
+
+    async def __aenter__(self) -> CommandJobs:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        # Leaving the block early (an error, or breaking out of as_completed)
+        # must not leave commands running unobserved in the background
+        self.cancel_all()
+        await asyncio.gather(
+            *(job._task for job in self._jobs.values() if job._task is not None),
+            return_exceptions=True,
+        )
+
+    @property
+    def jobs(self) -> list[CommandJob]:
+        return list(self._jobs.values())
+
+    def submit(
+        self,
+        charge_point_id: str,
+        command: str,
+        *,
+        idempotency_key: str | None = None,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> CommandJob:
+        """Queue ``client.<command>(charge_point_id=..., **kwargs)``.
+
+        Returns the existing job, without sending anything, if a job with
+        the same idempotency key was already submitted.
+        """
+        if command.startswith("_") or not callable(getattr(self.client, command, None)):
+            raise ValueError(f"Unknown command {command!r}")
+        key = idempotency_key or _default_key(charge_point_id, command, kwargs)
+        existing = self._jobs.get(key)
+        if existing is not None:
+            logger.debug(f"Job {key} already submitted; not sending it again")
+            return existing
+
+        job = CommandJob(
+            key,
+            charge_point_id,
+            command,
+            kwargs,
+            self.timeout if timeout is None else timeout,
+        )
+        self._jobs[key] = job
+        job._task = asyncio.create_task(self._run(job))
+        job._task.add_done_callback(lambda task: self._cancelled_early(job, task))
+        return job
+
+    def _cancelled_early(self, job: CommandJob, task: asyncio.Task[JobResult]) -> None:
+        """Record a job cancelled before _run started, which records nothing."""
+        if task.cancelled() and job._result is None:
+            self._record(
+                job, JobState.CANCELLED, None, asyncio.CancelledError(), elapsed=0.0
+            )
+
+    def cancel(self, key: str) -> bool:
+        job = self._jobs.get(key)
+        return job.cancel() if job is not None else False
+
+    def cancel_all(self) -> None:
+        for job in self._jobs.values():
+            job.cancel()
+
+    async def _run(self, job: CommandJob) -> JobResult:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        value: Any = None
+        error: BaseException | None = None
+        try:
+            async with self._semaphore:
+                job.state = JobState.RUNNING
+                started = loop.time()
+                method = getattr(self.client, job.command)
+                async with asyncio.timeout(job.timeout):
+                    value = await method(
+                        charge_point_id=job.charge_point_id, **job.kwargs
+                    )
+            state = JobState.ACKED
+        except asyncio.CancelledError as err:
+            state, error = JobState.CANCELLED, err
+        except (TimeoutError, httpx.TimeoutException) as err:
+            # The charger did not acknowledge in time
+            state, error = JobState.TIMED_OUT, err
+        except Exception as err:
+            state, error = JobState.FAILED, err
+        return self._record(job, state, value, error, elapsed=loop.time() - started)
+
+    def _record(
+        self,
+        job: CommandJob,
+        state: JobState,
+        value: Any,
+        error: BaseException | None,
+        *,
+        elapsed: float,
+    ) -> JobResult:
+        result = JobResult(
+            key=job.key,
+            charge_point_id=job.charge_point_id,
+            command=job.command,
+            state=state,
+            value=value,
+            error=error,
+            elapsed=elapsed,
+        )
+        job.state = state
+        job._result = result
+        self._finished.append(result)
+        self._changed.set()
+        return result
+
+    async def as_completed(self) -> AsyncIterator[JobResult]:
+        """Yield each job's result as it finishes, until every job has.
+
+        Jobs submitted while iterating are included. Several consumers may
+        iterate concurrently; each sees every result.
+        """
+        index = 0
+        while True:
+            while index < len(self._finished):
+                yield self._finished[index]
+                index += 1
+            if all(job.done for job in self._jobs.values()):
+                return
+            self._changed.clear()
+            await self._changed.wait()
+
+    async def wait(self) -> JobSummary:
+        """Wait for every submitted job to finish and summarise them."""
+        async for _ in self.as_completed():
+            pass
+        return self.summary()
+
+    def summary(self) -> JobSummary:
+        grouped: dict[JobState, list[str]] = {state: [] for state in JobState}
+        for job in self._jobs.values():
+            grouped[job.state].append(job.charge_point_id)
+        return JobSummary(
+            acked=tuple(grouped[JobState.ACKED]),
+            failed=tuple(grouped[JobState.FAILED]),
+            timed_out=tuple(grouped[JobState.TIMED_OUT]),
+            cancelled=tuple(grouped[JobState.CANCELLED]),
+            pending=tuple(grouped[JobState.PENDING] + grouped[JobState.RUNNING]),
+        )
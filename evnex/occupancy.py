@@ -0,0 +1,233 @@
+"""Occupancy and concurrency over time, from charging sessions.
+
+Capacity planning asks how many connectors were occupied (plugged in) and
+how many were actively charging at each moment. Rather than scanning every
+minute against every session, a sweep over the sessions' start and end
+events builds the whole step function in one sort, O(n log n) in sessions:
+
+- a connector is occupied from a session's ``startDate`` to its ``endDate``
+- it is charging from ``chargingStarted`` to ``chargingStopped``
+- sessions still in progress (or still charging) run until ``now``
+
+Intervals are half-open, so a session ending at the moment the next starts
+does not count twice. The resulting Timeline answers point queries and
+peaks by bisection, and resamples to any step (one a minute, say) without
+going back to the sessions:
+
+    intervals = session_intervals("cp-1", sessions, now=time.time())
+    line = timeline(intervals)
+    count, when = line.peak_occupied
+    for at, occupied, charging in line.series(start, end, 60):
+        ...
+
+time_in_state adds up, per charger, how long it was occupied and charging
+within a window.
+"""
+
+from __future__ import annotations
+
+import bisect
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, replace
+from datetime import datetime
+
+from evnex.schema.v3.charge_points import EvnexChargePointSession
+
+
+@dataclass(frozen=True, slots=True)
+class Interval:
+    """A connector occupied, or charging, over [start, end) in POSIX seconds."""
+
+    charge_point_id: str
+    connector_id: str
+    start: float
+    end: float
+    charging: bool = False
+
+
+def _seconds(value: datetime | None) -> float | None:
+    return value.timestamp() if value is not None else None
+
+
+def session_intervals(
+    charge_point_id: str,
+    sessions: Iterable[EvnexChargePointSession],
+    *,
+    now: float | None = None,
+) -> list[Interval]:
+    """The occupied and charging intervals of one charger's sessions.
+
+    Sessions without a start are skipped; ones without an end run to now.
+    """
+    now = now or time.time()
+    intervals = []
+    for session in sessions:
+        attributes = session.attributes
+        start = _seconds(attributes.startDate)
+        if start is None:
+            continue
+        end = _seconds(attributes.endDate) or now
+        connector = attributes.connectorId or "1"
+        intervals.append(Interval(charge_point_id, connector, start, end))
+        charging_started = _seconds(attributes.chargingStarted)
+        if charging_started is not None:
+            charging_stopped = _seconds(attributes.chargingStopped) or end
+            intervals.append(
+                Interval(
+                    charge_point_id,
+                    connector,
+                    charging_started,
+                    charging_stopped,
+                    charging=True,
+                )
+            )
+    return intervals
+
+
+def clipped(intervals: Iterable[Interval], start: float, end: float) -> list[Interval]:
+    """The parts of the intervals within [start, end)."""
+    return [
+        replace(interval, start=max(interval.start, start), end=min(interval.end, end))
+        for interval in intervals
+        if interval.start < end and interval.end > start
+    ]
+
+
+@dataclass(frozen=True, slots=True)
+class Timeline:
+    """Occupied and charging connector counts as a step function.
+
+    ``occupied[i]`` and ``charging[i]`` hold from ``times[i]`` until
+    ``times[i + 1]``; before ``times[0]`` both are 0.
+    """
+
+    times: tuple[float, ...]
+    occupied: tuple[int, ...]
+    charging: tuple[int, ...]
+
+    def at(self, moment: float) -> tuple[int, int]:
+        """(occupied, charging) at ``moment``."""
+        index = bisect.bisect_right(self.times, moment) - 1
+        if index < 0:
+            return 0, 0
+        return self.occupied[index], self.charging[index]
+
+    @staticmethod
+    def _peak(
+        times: tuple[float, ...], counts: tuple[int, ...]
+    ) -> tuple[int, float | None]:
+        if not counts:
+            return 0, None
+        # The first time the peak is reached
+        peak = max(counts)
+        return peak, times[counts.index(peak)]
+
+    @property
+    def peak_occupied(self) -> tuple[int, float | None]:
+        """The most connectors occupied at once, and when it first happened."""
+        return self._peak(self.times, self.occupied)
+
+    @property
+    def peak_charging(self) -> tuple[int, float | None]:
+        """The most connectors charging at once, and when it first happened."""
+        return self._peak(self.times, self.charging)
+
+    def series(
+        self, start: float, end: float, step: float
+    ) -> list[tuple[float, int, int]]:
+        """(time, occupied, charging) every ``step`` seconds over [start, end).
+
+        Walks the steps alongside the samples rather than bisecting each.
+        """
+        if step <= 0:
+            raise ValueError("step must be positive")
+        samples = []
+        index = bisect.bisect_right(self.times, start) - 1
+        moment = start
+        while moment < end:
+            while index + 1 < len(self.times) and self.times[index + 1] <= moment:
+                index += 1
+            if index < 0:
+                samples.append((moment, 0, 0))
+            else:
+                samples.append((moment, self.occupied[index], self.charging[index]))
+            moment += step
+        return samples
+
+
+def timeline(intervals: Iterable[Interval]) -> Timeline:
+    """Sweep the intervals' start and end events into a Timeline."""
+    deltas: defaultdict[float, list[int]] = defaultdict(lambda: [0, 0])
+    for interval in intervals:
+        if interval.end <= interval.start:
+            continue
+        column = 1 if interval.charging else 0
+        deltas[interval.start][column] += 1
+        deltas[interval.end][column] -= 1
+
+    times: list[float] = []
+    occupied: list[int] = []
+    charging: list[int] = []
+    counts = [0, 0]
+    for moment in sorted(deltas):
+        counts[0] += deltas[moment][0]
+        counts[1] += deltas[moment][1]
+        if occupied and (counts[0], counts[1]) == (occupied[-1], charging[-1]):
+            # Ends and starts that cancel out change nothing
+            continue
+        times.append(moment)
+        occupied.append(counts[0])
+        charging.append(counts[1])
+    return Timeline(tuple(times), tuple(occupied), tuple(charging))
+
+
+@dataclass(frozen=True, slots=True)
+class StateTimes:
+    """Seconds a charger spent in each state within a window."""
+
+    window: float
+    # At least one connector plugged in
+    occupied: float
+    # At least one connector charging
+    charging: float
+
+    @property
+    def idle(self) -> float:
+        """Plugged in but not charging."""
+        return max(0.0, self.occupied - self.charging)
+
+    @property
+    def available(self) -> float:
+        return max(0.0, self.window - self.occupied)
+
+
+def _covered(
+    line: Timeline, counts: tuple[int, ...], start: float, end: float
+) -> float:
+    """Seconds within [start, end) during which ``counts`` is above zero."""
+    covered = 0.0
+    for index, moment in enumerate(line.times):
+        until = line.times[index + 1] if index + 1 < len(line.times) else end
+        if counts[index] > 0:
+            covered += max(0.0, min(until, end) - max(moment, start))
+    return covered
+
+
+def time_in_state(
+    intervals: Iterable[Interval], start: float, end: float
+) -> dict[str, StateTimes]:
+    """Each charger's time occupied and charging within [start, end)."""
+    by_charger: defaultdict[str, list[Interval]] = defaultdict(list)
+    for interval in intervals:
+        by_charger[interval.charge_point_id].append(interval)
+    times = {}
+    for cp_id, charger_intervals in sorted(by_charger.items()):
+        line = timeline(charger_intervals)
+        times[cp_id] = StateTimes(
+            end - start,
+            _covered(line, line.occupied, start, end),
+            _covered(line, line.charging, start, end),
+        )
+    return times
@@ -0,0 +1,256 @@
+"""Cheapest charge schedules for a fleet, from each charger's tariff.
+
+Given how much energy each vehicle needs and when it must be ready,
+solve_schedules picks the cheapest times of day to charge on every charger
+at once: the day is cut into slots, each charger's tariff and availability
+window become rows of one array, and a single sort per row ranks the slots
+by price (earliest in the window first among equal prices). A slot that
+spans a change of rate is priced at its mean rate. Slots are filled at the
+charger's maxCurrent, cheapest first, until the energy is met; the last
+slot gets just the current it needs. Where that is below the 6 A minimum,
+the slot is raised to it and the slot before gives up as much, so the
+schedule still delivers the need rather than overshooting it. There are no
+per-slot Python loops, so re-planning hundreds of chargers nightly takes
+well under a second once their details are fetched. Install the ``numpy``
+extra to use it.
+
+plan_schedules does the whole job against the API: it reads each charger's
+detail (tariff, time zone, maxCurrent, phases and current charge schedule)
+concurrently, solves, and returns a reconcile.Plan holding only the
+schedules that differ from what the chargers already have, ready for
+reconcile.apply_changes:
+
+    needs = [ChargeNeed("cp-1", energy=30_000, ready_by=7 * 3600)]
+    plan = await plan_schedules(evnex, needs)
+    await apply_changes(evnex, plan)
+
+Schedules repeat daily in the charger's local time, as its tariff does.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from evnex.api import Evnex
+from evnex.profiles import DAY, ChargingProfile
+from evnex.reconcile import Change, Plan, Schedule, Setting
+from evnex.schema.v3.charge_points import EvnexChargePointDetail
+from evnex.tariffs import TariffIndex
+
+logger = logging.getLogger("evnex.planner")
+
+# IEC 61851: a vehicle cannot charge on less than 6 A
+MIN_CURRENT = 6
+
+
+@dataclass(frozen=True, slots=True)
+class ChargeNeed:
+    """Energy (Wh) one charger's vehicle needs, and the daily window to
+    deliver it in, as seconds after local midnight.
+
+    A window that starts after it ends runs over midnight (the default is
+    6pm to 7am).
+    """
+
+    charge_point_id: str
+    energy: float
+    ready_by: int = 7 * 3600
+    available_from: int = 18 * 3600
+
+
+@dataclass(frozen=True, slots=True)
+class ChargerTariff:
+    """What the solver needs to know about one charger."""
+
+    charge_point_id: str
+    tariff: TariffIndex
+    max_current: float
+    phases: int = 1
+
+    @classmethod
+    def from_detail(
+        cls, charge_point_id: str, detail: EvnexChargePointDetail
+    ) -> ChargerTariff:
+        three_phase = any(c.powerType == "AC_3_PHASE" for c in detail.connectors)
+        return cls(
+            charge_point_id,
+            TariffIndex.from_v3(detail.electricityCost, detail.timeZone),
+            detail.maxCurrent,
+            3 if three_phase else 1,
+        )
+
+
+def _slot_rates(
+    tariff: TariffIndex, starts: np.ndarray, slot_seconds: int
+) -> np.ndarray:
+    """The mean rate over each slot, integrated as TariffIndex does."""
+    periods, offset = np.divmod(
+        np.append(starts, starts[-1] + slot_seconds), tariff.duration
+    )
+    tariff_starts = np.asarray(tariff.starts)
+    index = np.searchsorted(tariff_starts, offset, side="right") - 1
+    integral = (
+        periods * tariff.cumulative[-1]
+        + np.asarray(tariff.cumulative)[index]
+        + np.asarray(tariff.rates)[index] * (offset - tariff_starts[index])
+    )
+    # Rounded so that equal rates rank as equal despite the float sums
+    means: np.ndarray = np.round(np.diff(integral) / slot_seconds, 9)
+    return means
+
+
+@dataclass(frozen=True, slots=True)
+class SolvedSchedule:
+    profile: ChargingProfile
+    # Wh the schedule delivers each day, and what that costs
+    energy: float
+    cost: float
+    # Wh of the need that does not fit in the window
+    shortfall: float
+
+
+def solve_schedules(
+    chargers: Sequence[ChargerTariff],
+    needs: Mapping[str, ChargeNeed],
+    *,
+    slot_seconds: int = 900,
+    voltage: float = 230.0,
+    min_current: int = MIN_CURRENT,
+) -> dict[str, SolvedSchedule]:
+    """The cheapest daily schedule for each charger with a need."""
+    if slot_seconds <= 0 or DAY % slot_seconds:
+        raise ValueError("slot_seconds must divide a day evenly")
+    chargers = [c for c in chargers if c.charge_point_id in needs]
+    if not chargers:
+        return {}
+    starts = np.arange(0, DAY, slot_seconds)
+    # (chargers, slots): the price of each slot on each charger's tariff
+    rates = np.stack([_slot_rates(c.tariff, starts, slot_seconds) for c in chargers])
+    opens = np.array([needs[c.charge_point_id].available_from for c in chargers])
+    closes = np.array([needs[c.charge_point_id].ready_by for c in chargers])
+    slot_ends = starts + slot_seconds
+    within = (starts >= opens[:, None]) & (slot_ends <= closes[:, None])
+    overnight = (starts >= opens[:, None]) | (slot_ends <= closes[:, None])
+    max_current = np.floor([c.max_current for c in chargers])
+    # A charger that cannot deliver the minimum cannot charge at all
+    available = (
+        np.where((opens < closes)[:, None], within, overnight)
+        & (max_current >= min_current)[:, None]
+    )
+
+    watts = voltage * np.array([c.phases for c in chargers])
+    # Wh one amp delivers over a slot
+    per_amp = watts * slot_seconds / 3600
+    required = np.array([needs[c.charge_point_id].energy for c in chargers])
+
+    # Rank each charger's slots by price, then how early in its window they
+    # come; unavailable ones last
+    ranked_rates = np.where(available, rates, np.inf)
+    into_window = (starts - opens[:, None]) % DAY
+    order = np.lexsort((into_window, ranked_rates), axis=1)
+    full = (max_current * per_amp)[:, None]
+    usable = np.take_along_axis(available, order, axis=1)
+    before = np.cumsum(np.where(usable, full, 0), axis=1) - np.where(usable, full, 0)
+    remaining = np.clip(required[:, None] - before, 0, None)
+    amps = np.minimum(np.ceil(remaining / per_amp[:, None]), max_current[:, None])
+    amps *= usable
+    # The marginal slot is raised to min_current; the slot ranked before it
+    # (no dearer, and at maxCurrent) gives up that much where it can spare it
+    short = (amps > 0) & (amps < min_current)
+    rows = np.flatnonzero(short.any(axis=1))
+    slot = short[rows].argmax(axis=1)
+    bump = min_current - amps[rows, slot]
+    spare = (slot > 0) & (amps[rows, slot - 1] - bump >= min_current)
+    amps[rows[spare], slot[spare] - 1] -= bump[spare]
+    amps = np.where(amps > 0, np.maximum(amps, min_current), 0)
+    limits = np.zeros_like(amps)
+    np.put_along_axis(limits, order, amps, axis=1)
+    limits = limits.astype(int)
+
+    delivered = limits * per_amp[:, None]
+    energy = delivered.sum(axis=1)
+    cost = (delivered / 1000 * rates).sum(axis=1)
+    solved = {}
+    for index, charger in enumerate(chargers):
+        column = limits[index]
+        changes = np.flatnonzero(np.diff(column, prepend=-1))
+        solved[charger.charge_point_id] = SolvedSchedule(
+            ChargingProfile(
+                tuple(
+                    zip(starts[changes].tolist(), column[changes].tolist(), strict=True)
+                )
+            ),
+            float(energy[index]),
+            float(cost[index]),
+            max(0.0, float(required[index] - energy[index])),
+        )
+    return solved
+
+
+async def plan_schedules(
+    client: Evnex,
+    needs: Sequence[ChargeNeed],
+    *,
+    concurrency: int = 10,
+    slot_seconds: int = 900,
+    voltage: float = 230.0,
+) -> Plan:
+    """Solve the needs and plan the charge schedule writes that would change
+    something."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def read(charge_point_id: str) -> EvnexChargePointDetail:
+        async with semaphore:
+            response = await client.get_charge_point_detail_v3(charge_point_id)
+        detail: EvnexChargePointDetail = response.data.attributes
+        return detail
+
+    ids = [need.charge_point_id for need in needs]
+    results = await asyncio.gather(
+        *(read(cp_id) for cp_id in ids), return_exceptions=True
+    )
+    details: dict[str, EvnexChargePointDetail] = {}
+    errors: dict[str, str] = {}
+    for cp_id, result in zip(ids, results, strict=True):
+        if isinstance(result, asyncio.CancelledError):
+            raise result
+        if isinstance(result, BaseException):
+            logger.warning(f"Could not read {cp_id}: {result}")
+            errors[cp_id] = str(result) or type(result).__name__
+        else:
+            details[cp_id] = result
+
+    chargers = []
+    for cp_id, detail in details.items():
+        try:
+            chargers.append(ChargerTariff.from_detail(cp_id, detail))
+        except ValueError as err:
+            # No usable tariff (none set, or an unknown time zone)
+            logger.warning(f"Cannot plan {cp_id}: {err}")
+            errors[cp_id] = str(err)
+    solved = solve_schedules(
+        chargers,
+        {need.charge_point_id: need for need in needs},
+        slot_seconds=slot_seconds,
+        voltage=voltage,
+    )
+    changes = []
+    in_sync = []
+    for cp_id, schedule in solved.items():
+        if schedule.shortfall:
+            logger.warning(
+                f"{cp_id} can only be given {schedule.energy:.0f} Wh of the "
+                f"{schedule.energy + schedule.shortfall:.0f} Wh it needs"
+            )
+        current = Schedule.from_charge_schedule(details[cp_id].profiles.chargeSchedule)
+        desired = Schedule(True, schedule.profile)
+        if desired.satisfied_by(current):
+            in_sync.append(cp_id)
+        else:
+            changes.append(Change(cp_id, Setting.CHARGE_SCHEDULE, current, desired))
+    return Plan(tuple(changes), tuple(in_sync), errors)
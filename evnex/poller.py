@@ -0,0 +1,321 @@
+"""One shared poller of fleet state for many local consumers.
+
+Dashboards and scripts that each poll the API for the same organisation
+multiply the upstream load by the number of consumers. FleetPoller polls once
+per interval (via get_fleet_status, so an idle fleet costs two calls) and
+keeps the latest state of each resource in memory, with when it was fetched
+and when it last changed. Consumers read that state, or subscribe to be told
+when a resource changes, without touching the API:
+
+    poller = FleetPoller(evnex, interval=30)
+    asyncio.create_task(poller.run())
+    with poller.subscribe() as changes:
+        while True:
+            state = await changes.get()
+            print(state.name, state.version, state.data)
+
+A failed poll keeps serving the last good state, flagged with the error.
+Given a snapshot file, the poller saves the state it serves there whenever
+it changes, and a restarted poller serves that (flagged stale) until its
+first poll succeeds, rather than nothing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+from collections import defaultdict
+from collections.abc import Iterator
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime
+from typing import Any
+
+import httpx
+from pydantic import ValidationError
+
+from evnex.api import Evnex
+from evnex.errors import EvnexAuthError
+from evnex.fleet import FleetStatus, get_fleet_status
+from evnex.scheduler import Priority, request_priority
+from evnex.snapshot import SnapshotError, open_snapshot, write_snapshot
+
+logger = logging.getLogger("evnex.poller")
+
+RESOURCES = ("charge-points", "connectors", "sessions", "summary")
+
+# Changes a subscriber may fall behind by before the oldest are dropped
+SUBSCRIBER_BACKLOG = 64
+
+
+@dataclass(frozen=True, slots=True)
+class ResourceState:
+    """The latest known state of one resource, and how fresh it is."""
+
+    name: str
+    data: Any = None
+    # Bumped every time the data changes; 0 until the first successful poll
+    version: int = 0
+    fetched_at: datetime | None = None
+    changed_at: datetime | None = None
+    # Why the most recent poll failed, if it did
+    error: str | None = None
+
+    def age(self, now: datetime | None = None) -> float | None:
+        """Seconds since the data was last fetched successfully."""
+        if self.fetched_at is None:
+            return None
+        return ((now or datetime.now(UTC)) - self.fetched_at).total_seconds()
+
+    def freshness(self, stale_after: float) -> dict[str, Any]:
+        age = self.age()
+        return {
+            "version": self.version,
+            "fetchedAt": self.fetched_at.isoformat() if self.fetched_at else None,
+            "changedAt": self.changed_at.isoformat() if self.changed_at else None,
+            "ageSeconds": round(age, 3) if age is not None else None,
+            "stale": age is None or age > stale_after or self.error is not None,
+            "error": self.error,
+        }
+
+    def to_dict(self, stale_after: float) -> dict[str, Any]:
+        return {"data": self.data, **self.freshness(stale_after)}
+
+
+def _resources(fleet: FleetStatus) -> dict[str, Any]:
+    """Split a fleet status into the JSON-ready resources the poller serves."""
+    charge_points = [cp.to_dict() for cp in fleet.charge_points]
+    return {
+        "charge-points": [
+            {
+                key: value
+                for key, value in cp.items()
+                if key not in ("connectors", "activeSession")
+            }
+            for cp in charge_points
+        ],
+        "connectors": [
+            {"chargePointId": cp["id"], **connector}
+            for cp in charge_points
+            for connector in cp["connectors"]
+        ],
+        "sessions": [
+            {"chargePointId": cp["id"], **cp["activeSession"]}
+            for cp in charge_points
+            if cp["activeSession"] is not None
+        ],
+        "summary": fleet.to_dict()["summary"],
+    }
+
+
+def _fleet(resources: dict[str, Any]) -> FleetStatus:
+    """Rebuild the fleet status _resources split into resources."""
+    connectors: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for connector in resources["connectors"]:
+        connectors[connector["chargePointId"]].append(
+            {key: value for key, value in connector.items() if key != "chargePointId"}
+        )
+    sessions = {
+        session["chargePointId"]: {
+            key: value for key, value in session.items() if key != "chargePointId"
+        }
+        for session in resources["sessions"]
+    }
+    return FleetStatus.from_dict(
+        {
+            "chargePoints": [
+                {
+                    **cp,
+                    "connectors": connectors[cp["id"]],
+                    "activeSession": sessions.get(cp["id"]),
+                }
+                for cp in resources["charge-points"]
+            ],
+            "summary": resources["summary"],
+        }
+    )
+
+
+class FleetPoller:
+    """Polls an organisation's fleet state on an interval and fans it out.
+
+    :param client: the Evnex client to poll through; its org id must be known
+        unless org_id is given
+    :param interval: seconds between polls
+    :param concurrency: per-charger detail lookups in flight at once
+    :param full_detail: look every charger up in detail, not only those the
+        listing cannot describe (see get_fleet_status)
+    :param snapshot: a file (see evnex.snapshot) to save the state to when it
+        changes, and to restore it from when run() starts
+    """
+
+    def __init__(
+        self,
+        client: Evnex,
+        org_id: str | None = None,
+        *,
+        interval: float = 30.0,
+        concurrency: int = 10,
+        full_detail: bool = False,
+        snapshot: str | os.PathLike[str] | None = None,
+    ) -> None:
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.client = client
+        self.org_id = org_id
+        self.interval = interval
+        self.concurrency = concurrency
+        self.full_detail = full_detail
+        self.snapshot = snapshot
+        # The latest successful poll, and how the polls have gone
+        self.fleet: FleetStatus | None = None
+        self.last_success: datetime | None = None
+        self.last_duration: float | None = None
+        self.failures = 0
+        self._states = {name: ResourceState(name) for name in RESOURCES}
+        self._subscribers: set[asyncio.Queue[ResourceState]] = set()
+
+    @property
+    def stale_after(self) -> float:
+        """Age beyond which state is reported stale: two missed polls."""
+        return 2 * self.interval
+
+    def state(self, name: str) -> ResourceState:
+        return self._states[name]
+
+    def states(self) -> list[ResourceState]:
+        return list(self._states.values())
+
+    def _publish(self, state: ResourceState) -> None:
+        self._states[state.name] = state
+        for queue in self._subscribers:
+            if queue.full():
+                # A consumer this far behind only needs the latest changes
+                queue.get_nowait()
+            queue.put_nowait(state)
+
+    async def refresh(self) -> bool:
+        """Poll once; returns whether the poll succeeded."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            # Polling yields to commands and interactive reads on a client
+            # with a RequestScheduler
+            with request_priority(Priority.BACKGROUND):
+                fleet = await get_fleet_status(
+                    self.client,
+                    self.org_id,
+                    concurrency=self.concurrency,
+                    full_detail=self.full_detail,
+                )
+        except (EvnexAuthError, httpx.HTTPError, ValidationError) as err:
+            self.failures += 1
+            logger.warning(f"Fleet poll failed; serving the last good state: {err}")
+            for state in self.states():
+                if state.error is None:
+                    self._publish(replace(state, error=str(err) or type(err).__name__))
+            return False
+
+        now = datetime.now(UTC)
+        self.fleet, self.last_success = fleet, now
+        self.last_duration = loop.time() - started
+        resources = _resources(fleet)
+        changed = False
+        for name, data in resources.items():
+            state = self._states[name]
+            if data != state.data or state.version == 0:
+                changed = True
+                self._publish(
+                    replace(
+                        state,
+                        data=data,
+                        version=state.version + 1,
+                        fetched_at=now,
+                        changed_at=now,
+                        error=None,
+                    )
+                )
+            elif state.error is not None:
+                # Recovered with unchanged data: subscribers learn it is fresh
+                self._publish(replace(state, fetched_at=now, error=None))
+            else:
+                self._states[name] = replace(state, fetched_at=now)
+        if changed and self.snapshot is not None:
+            await self._save(self.snapshot, resources, now)
+        return True
+
+    async def _save(
+        self, path: str | os.PathLike[str], resources: dict[str, Any], now: datetime
+    ) -> None:
+        try:
+            await asyncio.to_thread(
+                write_snapshot,
+                path,
+                resources=resources,
+                org_id=self.org_id or self.client.org_id,
+                written_at=now,
+            )
+        except OSError as err:
+            logger.warning(f"Could not save the snapshot {path}: {err}")
+
+    async def restore(self) -> bool:
+        """Serve the state saved in the snapshot file until the first poll.
+
+        Restores the resources, and the fleet status they were split from.
+        Restored resources keep the snapshot's time as when they were
+        fetched, and are flagged stale. Returns whether anything was
+        restored; a missing or unreadable snapshot is not an error.
+        """
+        if self.snapshot is None:
+            return False
+        try:
+            snapshot = await asyncio.to_thread(open_snapshot, self.snapshot)
+        except FileNotFoundError:
+            return False
+        except (OSError, SnapshotError, ValueError) as err:
+            logger.warning(f"Could not restore the snapshot {self.snapshot}: {err}")
+            return False
+        resources = snapshot.resources or {}
+        restored = False
+        for name, data in resources.items():
+            state = self._states.get(name)
+            if state is None or state.version:
+                continue
+            self._publish(
+                replace(
+                    state,
+                    data=data,
+                    version=1,
+                    fetched_at=snapshot.written_at,
+                    changed_at=snapshot.written_at,
+                    error="Restored from a snapshot; not polled yet",
+                )
+            )
+            restored = True
+        if self.fleet is None and all(name in resources for name in RESOURCES):
+            # The exporter renders the fleet rather than the resources
+            try:
+                self.fleet = _fleet(resources)
+            except (KeyError, TypeError, ValueError) as err:
+                logger.warning(f"Could not restore the fleet from the snapshot: {err}")
+        return restored
+
+    async def run(self) -> None:
+        """Restore any snapshot, then poll every interval until cancelled."""
+        loop = asyncio.get_running_loop()
+        await self.restore()
+        while True:
+            started = loop.time()
+            await self.refresh()
+            await asyncio.sleep(max(0.0, self.interval - (loop.time() - started)))
+
+    @contextlib.contextmanager
+    def subscribe(self) -> Iterator[asyncio.Queue[ResourceState]]:
+        """A queue receiving each resource's new state when it changes."""
+        queue: asyncio.Queue[ResourceState] = asyncio.Queue(SUBSCRIBER_BACKLOG)
+        self._subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
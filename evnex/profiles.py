@@ -0,0 +1,149 @@
+"""Charging profiles in one canonical form.
+
+The API describes a daily profile of current limits in two shapes: the v2
+endpoints read and write ``{"start", "limit"}`` segments, while the v3
+charge point detail reports ``{"startPeriod", "limit"}`` periods (as
+floats). ChargingProfile.compile accepts either, or (start, limit) pairs,
+and produces the canonical form:
+
+- periods sorted by start, in whole seconds and amps
+- consecutive periods with the same limit merged, as the later ones change
+  nothing
+- limits clamped to the charger's maximum current, when given
+- every start checked to lie within the profile's duration
+
+Two profiles that charge the same way compile to equal values with the same
+``digest``, so comparing a desired profile with a charger's current one (or
+with a digest stored from an earlier write) is a cheap equality check, and
+the payload written is as small as it can be:
+
+    profile = ChargingProfile.compile(
+        [{"start": 0, "limit": 32}, {"start": 3600, "limit": 32},
+         {"start": 79200, "limit": 0}],
+        max_current=detail.maxCurrent,
+    )
+    profile.to_v2()   # [{"start": 0, "limit": 32}, {"start": 79200, "limit": 0}]
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import TypeAdapter
+
+from evnex.schema.charge_points import EvnexChargeProfileSegment
+from evnex.schema.v3.charge_points import EvnexChargeSchedulePeriod
+
+# Profiles repeat daily unless given another duration
+DAY = 86400
+
+_SEGMENT = TypeAdapter(EvnexChargeProfileSegment)
+_PERIOD = TypeAdapter(EvnexChargeSchedulePeriod)
+
+
+class ProfileError(ValueError):
+    """A charging profile is invalid (e.g. a period starts after it ends)."""
+
+
+def _pair(segment: Any) -> tuple[float, float]:
+    """(start, limit) of a segment in any of the accepted forms."""
+    if isinstance(segment, EvnexChargeProfileSegment):
+        return segment.start, segment.limit
+    if isinstance(segment, EvnexChargeSchedulePeriod):
+        return segment.startPeriod, segment.limit
+    if isinstance(segment, tuple):
+        start, limit = segment
+        return start, limit
+    if isinstance(segment, Mapping) and "startPeriod" in segment:
+        period = _PERIOD.validate_python(segment)
+        return period.startPeriod, period.limit
+    # Malformed segments fail validation here, as they always have
+    validated = _SEGMENT.validate_python(segment)
+    return validated.start, validated.limit
+
+
+@dataclass(frozen=True, slots=True)
+class ChargingProfile:
+    """A canonical charging profile: (start, limit) periods over ``duration``.
+
+    Build one with compile(); the constructor does not normalise.
+    """
+
+    periods: tuple[tuple[int, int], ...]
+    duration: int = DAY
+
+    @classmethod
+    def compile(
+        cls,
+        segments: Iterable[Any],
+        *,
+        duration: int = DAY,
+        max_current: float | None = None,
+    ) -> ChargingProfile:
+        """Normalise and validate segments given in v2, v3 or pair form.
+
+        :param duration: the profile's length in seconds; every period must
+            start within it
+        :param max_current: clamp limits to the charger's maximum current
+        """
+        if duration <= 0:
+            raise ProfileError("duration must be positive")
+        periods: dict[int, int] = {}
+        for segment in segments:
+            start, limit = (round(value) for value in _pair(segment))
+            if not 0 <= start < duration:
+                raise ProfileError(
+                    f"A period starting at {start} s lies outside the "
+                    f"{duration} s profile"
+                )
+            if limit < 0:
+                raise ProfileError(f"Negative current limit at {start} s")
+            if start in periods and periods[start] != limit:
+                raise ProfileError(f"Conflicting limits at {start} s")
+            periods[start] = limit
+        return cls(tuple(sorted(periods.items())), duration).clamped(max_current)
+
+    def clamped(self, max_current: float | None) -> ChargingProfile:
+        """This profile with limits above ``max_current`` lowered to it, and
+        merged again."""
+        cap = None if max_current is None else int(max_current)
+        merged: list[tuple[int, int]] = []
+        for start, limit in self.periods:
+            if cap is not None:
+                limit = min(limit, cap)
+            if not merged or merged[-1][1] != limit:
+                merged.append((start, limit))
+        return ChargingProfile(tuple(merged), self.duration)
+
+    @property
+    def digest(self) -> str:
+        """A stable hash of the profile, for storing and comparing."""
+        canonical = json.dumps([self.duration, self.periods], separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+    def limit_at(self, seconds: float) -> int | None:
+        """The limit in force ``seconds`` into the profile, if any yet."""
+        current = None
+        for start, limit in self.periods:
+            if start > seconds % self.duration:
+                break
+            current = limit
+        return current
+
+    def to_v2(self) -> list[dict[str, int]]:
+        """Segments as the v2 write endpoints take them."""
+        return [{"start": start, "limit": limit} for start, limit in self.periods]
+
+    def to_v3(self) -> list[dict[str, int]]:
+        """Periods as the v3 charge point detail reports them."""
+        return [{"startPeriod": start, "limit": limit} for start, limit in self.periods]
+
+    def describe(self) -> str:
+        return ", ".join(
+            f"{start // 3600:02d}:{start % 3600 // 60:02d} {limit} A"
+            for start, limit in self.periods
+        )
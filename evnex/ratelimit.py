@@ -0,0 +1,62 @@
+"""Client-side request rate limiting.
+
+A TokenBucket passed to Evnex as rate_limiter is consulted before every API
+request: requests are allowed at ``rate`` per second on average, in bursts
+of up to ``burst``, and otherwise wait their turn (first come, first served).
+AccountManager gives each account its own bucket and divides a shared rate
+between them, so one busy account cannot starve the others.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """An asyncio token bucket.
+
+    :param rate: requests per second allowed on average
+    :param burst: requests allowed back to back after an idle spell;
+        defaults to one second's worth (at least 1)
+    """
+
+    def __init__(self, rate: float, burst: float | None = None) -> None:
+        self._burst = burst
+        self.rate = rate
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        # asyncio.Lock wakes waiters in FIFO order, which is what keeps the
+        # bucket fair between the tasks queued on it
+        self._lock = asyncio.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @rate.setter
+    def rate(self, rate: float) -> None:
+        # Adjustable on the fly, e.g. as accounts join a shared budget
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self._rate = rate
+
+    @property
+    def burst(self) -> float:
+        return self._burst if self._burst is not None else max(1.0, self._rate)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent, and count it."""
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+                self._refill()
+            self._tokens -= 1
@@ -0,0 +1,407 @@
+"""Declarative charger configuration: diff desired state, change only drift.
+
+Pushing a charge schedule and load management profile to every charger with
+a loop of PUTs re-sends hundreds of unchanged settings, one charger at a
+time. Instead, describe the configuration you want:
+
+    defaults:
+      chargeSchedule:
+        enabled: true
+        periods:
+          - {start: "00:00", limit: 32}
+          - {start: "07:00", limit: 0}
+      loadManagement:
+        enabled: false
+    chargePoints:
+      cp-0000001:
+      cp-0000002:
+        loadManagement:
+          enabled: true
+          periods: [{start: 0, limit: 16}]
+
+then plan and apply it:
+
+    state = load_desired_state("fleet.yaml")
+    plan = await plan_changes(evnex, state)
+    for change in plan.changes:
+        print(change.charge_point_id, change.setting, change.describe())
+    results = await apply_changes(evnex, plan)
+
+Planning reads each charger's current settings concurrently and compares
+them as canonical ChargingProfiles (see evnex.profiles; desired limits are
+clamped to each charger's maximum current), so reconciling a fleet that
+already matches costs reads only. ``chargePoints: all`` targets
+every charge point in the organisation; a charger's own settings replace
+the defaults setting by setting. A schedule without ``periods`` only sets
+whether it is enabled, keeping the periods already configured.
+
+Desired state is JSON, or YAML with the ``yaml`` extra (``evnex[yaml]``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass, field, replace
+from enum import StrEnum
+from pathlib import Path
+from typing import Any
+
+from pydantic import ValidationError
+
+from evnex.api import Evnex
+from evnex.jobs import CommandJobs, JobResult
+from evnex.profiles import ChargingProfile, ProfileError
+from evnex.schema.charge_points import (
+    EvnexChargePoint,
+    EvnexChargePointLoadSchedule,
+)
+from evnex.schema.v3.charge_points import EvnexChargeSchedule
+
+logger = logging.getLogger("evnex.reconcile")
+
+
+class DesiredStateError(ValueError):
+    """The desired state document is malformed or names unknown chargers."""
+
+
+class Setting(StrEnum):
+    CHARGE_SCHEDULE = "chargeSchedule"
+    LOAD_MANAGEMENT = "loadManagement"
+
+
+# The client method that writes each setting
+COMMANDS = {
+    Setting.CHARGE_SCHEDULE: "set_charge_point_schedule",
+    Setting.LOAD_MANAGEMENT: "set_charger_load_profile",
+}
+
+
+def _parse_start(value: Any) -> Any:
+    # "HH:MM" reads better in a config file than seconds from midnight
+    if isinstance(value, str) and ":" in value:
+        hours, _, minutes = value.partition(":")
+        try:
+            return int(hours) * 3600 + int(minutes) * 60
+        except ValueError:
+            raise DesiredStateError(f"Invalid start time {value!r}") from None
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class Schedule:
+    """Whether a schedule is enabled, and its charging profile.
+
+    A profile of None means "whatever is configured now".
+    """
+
+    enabled: bool
+    profile: ChargingProfile | None = None
+
+    @classmethod
+    def parse(cls, spec: Any, where: str) -> Schedule:
+        if not isinstance(spec, Mapping):
+            raise DesiredStateError(f"{where} must be a mapping")
+        unknown = set(spec) - {"enabled", "periods"}
+        if unknown:
+            raise DesiredStateError(f"{where} has unknown keys: {sorted(unknown)}")
+        enabled = spec.get("enabled", True)
+        if not isinstance(enabled, bool):
+            raise DesiredStateError(f"{where}.enabled must be true or false")
+        periods = spec.get("periods")
+        if periods is None:
+            if enabled:
+                raise DesiredStateError(f"{where} is enabled but has no periods")
+            return cls(enabled)
+        if not isinstance(periods, list):
+            raise DesiredStateError(f"{where}.periods must be a list")
+        try:
+            profile = ChargingProfile.compile(
+                {**period, "start": _parse_start(period.get("start"))}
+                if isinstance(period, Mapping)
+                else period
+                for period in periods
+            )
+        except (ProfileError, ValidationError) as err:
+            raise DesiredStateError(f"{where}.periods: {err}") from None
+        return cls(enabled, profile)
+
+    @classmethod
+    def from_charge_schedule(cls, schedule: EvnexChargeSchedule | None) -> Schedule:
+        if schedule is None:
+            return cls(False, ChargingProfile(()))
+        return cls(
+            schedule.enabled,
+            ChargingProfile.compile(schedule.chargingSchedulePeriods),
+        )
+
+    @classmethod
+    def from_load_schedule(cls, schedule: EvnexChargePointLoadSchedule) -> Schedule:
+        return cls(
+            schedule.enabled,
+            ChargingProfile.compile(
+                schedule.chargingProfilePeriods, duration=schedule.duration
+            ),
+        )
+
+    def clamped(self, max_current: float) -> Schedule:
+        if self.profile is None:
+            return self
+        return replace(self, profile=self.profile.clamped(max_current))
+
+    def lasting(self, duration: int) -> Schedule:
+        """This schedule with its periods laid over ``duration`` seconds.
+
+        Desired profiles are compiled over a day; a load schedule on the
+        charger may repeat over another length. Periods that do not fit in
+        ``duration`` leave the schedule as it is.
+        """
+        if self.profile is None or self.profile.duration == duration:
+            return self
+        try:
+            profile = ChargingProfile.compile(self.profile.periods, duration=duration)
+        except ProfileError:
+            return self
+        return replace(self, profile=profile)
+
+    def satisfied_by(self, current: Schedule) -> bool:
+        if self.enabled != current.enabled:
+            return False
+        return (
+            self.profile is None
+            or current.profile is not None
+            and self.profile.digest == current.profile.digest
+        )
+
+    def describe(self) -> str:
+        state = "enabled" if self.enabled else "disabled"
+        if not self.profile or not self.profile.periods:
+            return state
+        return f"{state}: {self.profile.describe()}"
+
+
+@dataclass(frozen=True, slots=True)
+class ChargerSpec:
+    """The settings one charger should have; any setting not listed is left
+    alone."""
+
+    charge_point_id: str
+    settings: Mapping[Setting, Schedule]
+
+
+@dataclass(frozen=True, slots=True)
+class DesiredState:
+    """A validated desired state document."""
+
+    # Per charger settings, or None to apply the defaults to every charger
+    charge_points: tuple[ChargerSpec, ...] | None
+    defaults: Mapping[Setting, Schedule] = field(default_factory=dict)
+
+    def specs(self, charge_point_ids: list[str]) -> list[ChargerSpec]:
+        """The specs to reconcile, given every charge point in the org."""
+        if self.charge_points is None:
+            return [ChargerSpec(cp_id, self.defaults) for cp_id in charge_point_ids]
+        unknown = {s.charge_point_id for s in self.charge_points} - set(
+            charge_point_ids
+        )
+        if unknown:
+            raise DesiredStateError(f"Unknown charge points: {sorted(unknown)}")
+        return list(self.charge_points)
+
+
+def _parse_settings(document: Any, where: str) -> dict[Setting, Schedule]:
+    if document is None:
+        return {}
+    if not isinstance(document, Mapping):
+        raise DesiredStateError(f"{where} must be a mapping")
+    settings = {}
+    for key, spec in document.items():
+        try:
+            setting = Setting(key)
+        except ValueError:
+            raise DesiredStateError(
+                f"{where} has unknown setting {key!r}; expected one of "
+                f"{[s.value for s in Setting]}"
+            ) from None
+        settings[setting] = Schedule.parse(spec, f"{where}.{key}")
+    return settings
+
+
+def parse_desired_state(document: Any) -> DesiredState:
+    """Validate a desired state document (already decoded from JSON/YAML)."""
+    if not isinstance(document, Mapping):
+        raise DesiredStateError("Desired state must be a mapping")
+    unknown = set(document) - {"defaults", "chargePoints"}
+    if unknown:
+        raise DesiredStateError(f"Unknown top-level keys: {sorted(unknown)}")
+    defaults = _parse_settings(document.get("defaults"), "defaults")
+    targets = document.get("chargePoints")
+    if targets == "all":
+        return DesiredState(None, defaults)
+    if not isinstance(targets, Mapping):
+        raise DesiredStateError(
+            "chargePoints must map charge point ids to settings, or be 'all'"
+        )
+    specs = []
+    for cp_id, overrides in targets.items():
+        settings = {
+            **defaults,
+            **_parse_settings(overrides, f"chargePoints.{cp_id}"),
+        }
+        specs.append(ChargerSpec(str(cp_id), settings))
+    return DesiredState(tuple(specs), defaults)
+
+
+def load_desired_state(path: Path | str) -> DesiredState:
+    """Read a desired state file: YAML (.yaml/.yml, needs PyYAML) or JSON."""
+    path = Path(path)
+    text = path.read_text()
+    if path.suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise DesiredStateError(
+                f"Reading {path.name} needs PyYAML (pip install 'evnex[yaml]'); "
+                "or write the desired state as JSON"
+            ) from None
+        try:
+            document = yaml.safe_load(text)
+        except yaml.YAMLError as err:
+            raise DesiredStateError(f"{path.name}: {err}") from None
+    else:
+        try:
+            document = json.loads(text)
+        except json.JSONDecodeError as err:
+            raise DesiredStateError(f"{path.name}: {err}") from None
+    return parse_desired_state(document)
+
+
+@dataclass(frozen=True, slots=True)
+class Change:
+    """One setting on one charger that differs from the desired state."""
+
+    charge_point_id: str
+    setting: Setting
+    current: Schedule
+    desired: Schedule
+
+    @property
+    def command(self) -> str:
+        return COMMANDS[self.setting]
+
+    @property
+    def kwargs(self) -> dict[str, Any]:
+        # A profile left unspecified is written back as it is
+        profile = self.desired.profile or self.current.profile or ChargingProfile(())
+        return {
+            "charging_profile_periods": profile,
+            "enabled": self.desired.enabled,
+            "duration": profile.duration,
+        }
+
+    def describe(self) -> str:
+        return f"{self.current.describe()} -> {self.desired.describe()}"
+
+
+@dataclass(frozen=True, slots=True)
+class Plan:
+    """What reconciling would change."""
+
+    changes: tuple[Change, ...]
+    # Chargers whose every desired setting already matches
+    in_sync: tuple[str, ...]
+    # Chargers whose current settings could not be read, and why
+    errors: Mapping[str, str]
+
+
+async def _current_settings(
+    client: Evnex, spec: ChargerSpec
+) -> dict[Setting, Schedule]:
+    current = {}
+    if Setting.CHARGE_SCHEDULE in spec.settings:
+        detail = await client.get_charge_point_detail_v3(spec.charge_point_id)
+        current[Setting.CHARGE_SCHEDULE] = Schedule.from_charge_schedule(
+            detail.data.attributes.profiles.chargeSchedule
+        )
+    if Setting.LOAD_MANAGEMENT in spec.settings:
+        profile = await client.get_charger_load_profile(spec.charge_point_id)
+        current[Setting.LOAD_MANAGEMENT] = Schedule.from_load_schedule(profile)
+    return current
+
+
+async def plan_changes(
+    client: Evnex,
+    state: DesiredState,
+    *,
+    charge_points: list[EvnexChargePoint] | None = None,
+    concurrency: int = 10,
+) -> Plan:
+    """Read every targeted charger's settings and diff them with ``state``.
+
+    :param charge_points: the organisation's charge points, if already
+        listed; otherwise they are listed here
+    :param concurrency: how many chargers are read at once
+    """
+    if charge_points is None:
+        charge_points = await client.get_org_charge_points()
+    specs = state.specs([cp.id for cp in charge_points])
+    max_current = {cp.id: cp.maxCurrent for cp in charge_points}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def read(spec: ChargerSpec) -> dict[Setting, Schedule]:
+        async with semaphore:
+            return await _current_settings(client, spec)
+
+    results = await asyncio.gather(
+        *(read(spec) for spec in specs), return_exceptions=True
+    )
+    changes: list[Change] = []
+    in_sync: list[str] = []
+    errors: dict[str, str] = {}
+    for spec, result in zip(specs, results, strict=True):
+        if isinstance(result, asyncio.CancelledError):
+            raise result
+        if isinstance(result, BaseException):
+            logger.warning(f"Could not read {spec.charge_point_id}: {result}")
+            errors[spec.charge_point_id] = str(result) or type(result).__name__
+            continue
+        # Limits above what the charger can deliver would never match, and
+        # nor would a profile over another duration than the current one's
+        settings = {}
+        for setting, desired in spec.settings.items():
+            desired = desired.clamped(max_current[spec.charge_point_id])
+            current = result[setting].profile
+            if setting is Setting.LOAD_MANAGEMENT and current is not None:
+                desired = desired.lasting(current.duration)
+            settings[setting] = desired
+        drift = [
+            Change(spec.charge_point_id, setting, result[setting], desired)
+            for setting, desired in settings.items()
+            if not desired.satisfied_by(result[setting])
+        ]
+        changes.extend(drift)
+        if not drift:
+            in_sync.append(spec.charge_point_id)
+    return Plan(tuple(changes), tuple(in_sync), errors)
+
+
+async def apply_changes(
+    client: Evnex,
+    plan: Plan,
+    *,
+    concurrency: int = 10,
+    timeout: float | None = None,
+) -> list[JobResult]:
+    """Write each planned change, at most ``concurrency`` at a time.
+
+    Results are in the order of ``plan.changes``.
+    """
+    async with CommandJobs(client, concurrency=concurrency, timeout=timeout) as jobs:
+        submitted = [
+            jobs.submit(change.charge_point_id, change.command, **change.kwargs)
+            for change in plan.changes
+        ]
+        await jobs.wait()
+        return [await job.result() for job in submitted]
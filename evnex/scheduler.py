@@ -0,0 +1,182 @@
+"""Priority scheduling of API requests, so commands pre-empt polling.
+
+Under heavy read load (a fleet poller, an exporter, a sync job) every new
+request queues behind the reads already waiting for a connection, including
+an operator's stop_charge_point. A RequestScheduler passed to Evnex admits
+requests by class instead:
+
+- COMMAND: charge point commands, always first in line
+- FOREGROUND: ordinary reads (the default)
+- BACKGROUND: polling and sync work, marked with request_priority()
+
+Each class can be capped below the overall limit, which keeps slots free for
+the classes above it; and a request that has waited longer than max_wait is
+served next regardless of its class, so background work slows down under
+load but never starves:
+
+    evnex = Evnex(auth=auth, scheduler=RequestScheduler())
+    with request_priority(Priority.BACKGROUND):
+        await evnex.get_org_charge_points()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator, Iterator, Mapping
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from types import MappingProxyType
+
+
+class Priority(IntEnum):
+    # Lower values are served first
+    COMMAND = 0
+    FOREGROUND = 1
+    BACKGROUND = 2
+
+
+_priority: ContextVar[Priority] = ContextVar(
+    "evnex_request_priority", default=Priority.FOREGROUND
+)
+
+
+def current_priority() -> Priority:
+    """The priority reads made from the current task are scheduled at."""
+    return _priority.get()
+
+
+@contextlib.contextmanager
+def request_priority(priority: Priority) -> Iterator[None]:
+    """Schedule the reads made within this block (and the tasks it starts)
+    at the given priority."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def _default_caps() -> Mapping[Priority, int | None]:
+    # Together below the default max_in_flight, so a command always has a slot
+    return MappingProxyType({Priority.FOREGROUND: 6, Priority.BACKGROUND: 3})
+
+
+@dataclass(frozen=True, slots=True)
+class SchedulerPolicy:
+    """How many requests may be in flight, overall and per class.
+
+    A class missing from ``caps`` (or capped at None) is only bound by
+    ``max_in_flight``.
+    """
+
+    max_in_flight: int = 10
+    caps: Mapping[Priority, int | None] = field(default_factory=_default_caps)
+    # Seconds a queued request may wait before it is served ahead of its class
+    max_wait: float = 5.0
+
+    def __post_init__(self) -> None:
+        if self.max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        if any(cap is not None and cap < 1 for cap in self.caps.values()):
+            raise ValueError("class caps must be at least 1")
+        if self.max_wait <= 0:
+            raise ValueError("max_wait must be positive")
+
+
+@dataclass(frozen=True, slots=True)
+class SchedulerStats:
+    """Per-class counts: in flight now, queued now, and admitted so far."""
+
+    in_flight: Mapping[Priority, int]
+    waiting: Mapping[Priority, int]
+    admitted: Mapping[Priority, int]
+    # Requests served ahead of their class because they had waited too long
+    promoted: int
+
+
+@dataclass(slots=True)
+class _Waiter:
+    priority: Priority
+    enqueued: float
+    future: asyncio.Future[None]
+
+
+class RequestScheduler:
+    """Admits requests in priority order within per-class limits."""
+
+    def __init__(self, policy: SchedulerPolicy | None = None) -> None:
+        self.policy = policy or SchedulerPolicy()
+        self._in_flight = dict.fromkeys(Priority, 0)
+        self._admitted = dict.fromkeys(Priority, 0)
+        self._promoted = 0
+        self._waiters: list[_Waiter] = []
+
+    @property
+    def stats(self) -> SchedulerStats:
+        waiting = dict.fromkeys(Priority, 0)
+        for waiter in self._waiters:
+            waiting[waiter.priority] += 1
+        return SchedulerStats(
+            in_flight=dict(self._in_flight),
+            waiting=waiting,
+            admitted=dict(self._admitted),
+            promoted=self._promoted,
+        )
+
+    def _has_room(self, priority: Priority) -> bool:
+        if sum(self._in_flight.values()) >= self.policy.max_in_flight:
+            return False
+        cap = self.policy.caps.get(priority)
+        return cap is None or self._in_flight[priority] < cap
+
+    def _next(self, now: float) -> _Waiter | None:
+        # A cancelled waiter stays listed until its task resumes to leave
+        runnable = [
+            w
+            for w in self._waiters
+            if not w.future.done() and self._has_room(w.priority)
+        ]
+        if not runnable:
+            return None
+        starved = [w for w in runnable if now - w.enqueued >= self.policy.max_wait]
+        if starved:
+            waiter = min(starved, key=lambda w: w.enqueued)
+            if any(w.priority < waiter.priority for w in runnable):
+                self._promoted += 1
+            return waiter
+        return min(runnable, key=lambda w: (w.priority, w.enqueued))
+
+    def _dispatch(self) -> None:
+        now = asyncio.get_running_loop().time()
+        while (waiter := self._next(now)) is not None:
+            self._waiters.remove(waiter)
+            self._in_flight[waiter.priority] += 1
+            self._admitted[waiter.priority] += 1
+            waiter.future.set_result(None)
+
+    def _release(self, priority: Priority) -> None:
+        self._in_flight[priority] -= 1
+        self._dispatch()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: Priority) -> AsyncIterator[None]:
+        """Hold one in-flight slot of the given class for the block."""
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(priority, loop.time(), loop.create_future())
+        self._waiters.append(waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            elif not waiter.future.cancelled():
+                # Admitted just as the wait was cancelled: hand the slot on
+                self._release(priority)
+            raise
+        try:
+            yield
+        finally:
+            self._release(priority)
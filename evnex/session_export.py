@@ -0,0 +1,241 @@
+"""Streaming export of a fleet's charging sessions, one flat row per session.
+
+Billing and reporting want every session across the organisation in a
+spreadsheet or a warehouse, not a nested JSON document. stream_sessions
+fetches each charger's sessions with bounded concurrency and yields them
+charger by charger as the fetches complete, holding at most a few chargers'
+sessions at once however large the fleet is; session_row flattens one into
+the COLUMNS; and the writers append rows to a file as they arrive:
+
+    with open("sessions.csv", "w", newline="") as out:
+        writer = CsvWriter(out)
+        async for charge_point, sessions in stream_sessions(evnex, targets):
+            writer.write([session_row(charge_point, s) for s in sessions])
+
+NdjsonWriter writes one JSON object per line. ParquetWriter needs pyarrow,
+which is optional (``pip install 'evnex[parquet]'``); it buffers rows into row groups
+of row_group_size, so memory stays bounded by the group size rather than
+the export.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+import logging
+from collections.abc import AsyncIterator, Iterable, Sequence
+from datetime import datetime
+from typing import Any, BinaryIO, Protocol, TextIO
+
+from evnex.api import Evnex
+from evnex.schema.charge_points import EvnexChargePoint
+from evnex.schema.v3.charge_points import EvnexChargePointSession
+
+logger = logging.getLogger("evnex.session_export")
+
+COLUMNS = (
+    "chargePointId",
+    "chargePointName",
+    "locationId",
+    "locationName",
+    "sessionId",
+    "connectorId",
+    "status",
+    "startDate",
+    "endDate",
+    "chargingStarted",
+    "chargingStopped",
+    "energyWh",
+    "cost",
+    "currency",
+    "authorizationMethod",
+)
+
+
+class SessionFetchError(Exception):
+    """Some chargers' sessions could not be fetched.
+
+    :param failed: the error of each failed charger, by charge point id
+    """
+
+    def __init__(self, failed: dict[str, Exception]) -> None:
+        super().__init__(
+            f"Could not fetch the sessions of {len(failed)} charge point(s): "
+            + ", ".join(failed)
+        )
+        self.failed = failed
+
+
+def _iso(moment: datetime | None) -> str | None:
+    return None if moment is None else moment.isoformat()
+
+
+def session_row(
+    charge_point: EvnexChargePoint, session: EvnexChargePointSession
+) -> dict[str, Any]:
+    """One session flattened to the export COLUMNS (None where unknown)."""
+    attributes = session.attributes
+    total = attributes.totalCost
+    return {
+        "chargePointId": charge_point.id,
+        "chargePointName": charge_point.name,
+        "locationId": charge_point.location.id,
+        "locationName": charge_point.location.name,
+        "sessionId": session.id,
+        "connectorId": attributes.connectorId,
+        "status": attributes.sessionStatus,
+        "startDate": _iso(attributes.startDate),
+        "endDate": _iso(attributes.endDate),
+        "chargingStarted": _iso(attributes.chargingStarted),
+        "chargingStopped": _iso(attributes.chargingStopped),
+        "energyWh": attributes.totalPowerUsage,
+        "cost": total.amount if total is not None else None,
+        "currency": total.currency if total is not None else None,
+        "authorizationMethod": attributes.authorizationMethod,
+    }
+
+
+async def stream_sessions(
+    client: Evnex,
+    charge_points: Iterable[EvnexChargePoint],
+    *,
+    since: datetime | None = None,
+    concurrency: int = 10,
+    failed: dict[str, Exception] | None = None,
+) -> AsyncIterator[tuple[EvnexChargePoint, list[EvnexChargePointSession]]]:
+    """Each charger's sessions, in the order their fetches complete.
+
+    At most ``concurrency`` fetches run at once, and a finished fetch waits
+    for the consumer once ``concurrency`` are already waiting, so a slow
+    writer holds the fetches back rather than letting results pile up. With
+    ``since``, sessions that started before it are left out.
+
+    A charger whose sessions cannot be fetched does not stop the others.
+    Its error goes into ``failed`` when given, and it is skipped. Without
+    ``failed``, SessionFetchError is raised once every other charger has
+    been yielded, so no charger goes missing unnoticed.
+    """
+    errors: dict[str, Exception] = {} if failed is None else failed
+    pending = iter(charge_points)
+    done: asyncio.Queue[
+        tuple[EvnexChargePoint, list[EvnexChargePointSession]] | None
+    ] = asyncio.Queue(maxsize=concurrency)
+
+    async def worker() -> None:
+        for charge_point in pending:
+            try:
+                sessions: list[
+                    EvnexChargePointSession
+                ] = await client.get_charge_point_sessions(charge_point.id)
+            except Exception as err:
+                logger.warning(f"Could not fetch sessions of {charge_point.id}: {err}")
+                errors[charge_point.id] = err
+                continue
+            if since is not None:
+                sessions = [
+                    session
+                    for session in sessions
+                    if session.attributes.startDate is not None
+                    and session.attributes.startDate >= since
+                ]
+            await done.put((charge_point, sessions))
+        await done.put(None)
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        running = len(workers)
+        while running:
+            item = await done.get()
+            if item is None:
+                running -= 1
+            else:
+                yield item
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+    if failed is None and errors:
+        raise SessionFetchError(errors)
+
+
+class SessionWriter(Protocol):
+    def write(self, rows: Sequence[dict[str, Any]]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class _TextWriter:
+    def __init__(self, stream: TextIO, *, close_stream: bool = False) -> None:
+        self._stream = stream
+        self._close_stream = close_stream
+
+    def close(self) -> None:
+        if self._close_stream:
+            self._stream.close()
+        else:
+            self._stream.flush()
+
+
+class CsvWriter(_TextWriter):
+    """Rows as CSV with a header line; empty cells for unknown values.
+
+    Open a file for it with ``newline=""``, as the csv module asks.
+    """
+
+    def __init__(self, stream: TextIO, *, close_stream: bool = False) -> None:
+        super().__init__(stream, close_stream=close_stream)
+        self._writer = csv.DictWriter(stream, fieldnames=COLUMNS)
+        self._writer.writeheader()
+
+    def write(self, rows: Sequence[dict[str, Any]]) -> None:
+        self._writer.writerows(rows)
+        self._stream.flush()
+
+
+class NdjsonWriter(_TextWriter):
+    """Rows as newline-delimited JSON objects."""
+
+    def write(self, rows: Sequence[dict[str, Any]]) -> None:
+        self._stream.writelines(
+            json.dumps(row, separators=(",", ":")) + "\n" for row in rows
+        )
+        self._stream.flush()
+
+
+class ParquetWriter:
+    """Rows as a Parquet file, written a row group at a time.
+
+    :raises ImportError: if pyarrow is not installed.
+    """
+
+    def __init__(self, sink: str | BinaryIO, row_group_size: int = 10_000) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._schema = pa.schema(
+            [
+                (name, pa.float64() if name in ("energyWh", "cost") else pa.string())
+                for name in COLUMNS
+            ]
+        )
+        self._writer = pq.ParquetWriter(sink, self._schema)
+        self._row_group_size = row_group_size
+        self._buffer: list[dict[str, Any]] = []
+
+    def write(self, rows: Sequence[dict[str, Any]]) -> None:
+        self._buffer.extend(rows)
+        while len(self._buffer) >= self._row_group_size:
+            self._flush(self._buffer[: self._row_group_size])
+            del self._buffer[: self._row_group_size]
+
+    def _flush(self, rows: list[dict[str, Any]]) -> None:
+        table = self._pa.Table.from_pylist(rows, schema=self._schema)
+        self._writer.write_table(table, row_group_size=len(rows))
+
+    def close(self) -> None:
+        if self._buffer:
+            self._flush(self._buffer)
+            self._buffer = []
+        self._writer.close()
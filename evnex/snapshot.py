@@ -0,0 +1,259 @@
+"""A binary, memory-mapped snapshot of fleet state.
+
+A restarted monitor, or a CLI run without network access, should not have to
+re-fetch and re-validate a whole fleet before it can answer anything.
+write_snapshot saves the latest state to one file, and open_snapshot maps it
+back in:
+
+    write_snapshot(path, charge_points=listing, locations=locations,
+                   sessions=table)
+    snapshot = open_snapshot(path)
+    snapshot.sessions.energy      # a NumPy view of the mapped file, no copy
+    snapshot.charge_points        # validated on first access
+
+The file is a fixed preamble (magic, format version, header length), a JSON
+header, then 64-byte aligned blocks. The charge point listing, locations and
+poller resources are JSON blocks, parsed only when first read. A
+session_table.SessionTable is stored column by column as raw arrays, and
+opening the snapshot wraps each one in np.frombuffer over the mmap, so a
+large session history opens in milliseconds whatever its size. Those arrays
+are read-only, and they keep the file mapped while they are alive.
+
+Snapshots are written to a temporary file beside the target, synced, then
+renamed over it, so readers only ever see a whole snapshot. A snapshot
+still open keeps the one it mapped. Session tables need the ``numpy``
+extra; the other sections do not.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+from dataclasses import fields
+from datetime import UTC, datetime
+from functools import cached_property
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+from pydantic import TypeAdapter
+
+from evnex.schema.charge_points import EvnexChargePoint
+from evnex.schema.v3.locations import EvnexLocation
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from evnex.session_table import SessionTable
+
+MAGIC = b"EVNXSNAP"
+VERSION = 1
+# Magic, format version and header length
+_PREAMBLE = struct.Struct("<8sII")
+ALIGNMENT = 64
+
+_CHARGE_POINTS = TypeAdapter(list[EvnexChargePoint])
+_LOCATIONS = TypeAdapter(list[EvnexLocation])
+
+
+class SnapshotError(ValueError):
+    """A file is not a snapshot, or one in a format this version cannot read."""
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+class _Blocks:
+    """Lays out the blocks after the header, recording where each one goes."""
+
+    def __init__(self) -> None:
+        self.parts: list[tuple[int, bytes | memoryview]] = []
+        self.size = 0
+
+    def add(self, data: bytes | memoryview) -> dict[str, int]:
+        offset = _aligned(self.size)
+        self.parts.append((offset, data))
+        self.size = offset + len(data)
+        return {"offset": offset, "length": len(data)}
+
+    def add_array(self, array: np.ndarray) -> dict[str, Any]:
+        import numpy as np
+
+        contiguous = np.ascontiguousarray(array)
+        block = self.add(contiguous.data.cast("B"))
+        return {"dtype": contiguous.dtype.str, "count": len(contiguous), **block}
+
+    def write(self, file: IO[bytes], start: int) -> None:
+        for offset, data in self.parts:
+            file.seek(start + offset)
+            file.write(data)
+
+
+def write_snapshot(
+    path: str | os.PathLike[str],
+    *,
+    charge_points: list[EvnexChargePoint] | None = None,
+    locations: list[EvnexLocation] | None = None,
+    sessions: SessionTable | None = None,
+    resources: dict[str, Any] | None = None,
+    org_id: str | None = None,
+    written_at: datetime | None = None,
+) -> None:
+    """Atomically replace ``path`` with a snapshot of the given state.
+
+    Blocking file I/O: from async code run it with asyncio.to_thread.
+
+    :param resources: JSON-ready state by name, as FleetPoller serves it
+    """
+    path = Path(path)
+    blocks = _Blocks()
+    header: dict[str, Any] = {
+        "writtenAt": (written_at or datetime.now(UTC)).isoformat(),
+        "orgId": org_id,
+    }
+    if charge_points is not None:
+        header["chargePoints"] = blocks.add(
+            _CHARGE_POINTS.dump_json(charge_points, by_alias=True)
+        )
+    if locations is not None:
+        header["locations"] = blocks.add(_LOCATIONS.dump_json(locations, by_alias=True))
+    if resources is not None:
+        header["resources"] = blocks.add(json.dumps(resources).encode())
+    if sessions is not None:
+        from evnex.session_table import Categorical, SessionTable
+
+        columns: dict[str, Any] = {}
+        for column in fields(SessionTable):
+            value = getattr(sessions, column.name)
+            if isinstance(value, Categorical):
+                columns[column.name] = {
+                    "labels": list(value.labels),
+                    **blocks.add_array(value.codes),
+                }
+            else:
+                columns[column.name] = blocks.add_array(value)
+        header["sessions"] = {"length": len(sessions), "columns": columns}
+
+    encoded = json.dumps(header).encode()
+    start = _aligned(_PREAMBLE.size + len(encoded))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f".{path.name}.", delete=False
+    ) as file:
+        try:
+            file.write(_PREAMBLE.pack(MAGIC, VERSION, len(encoded)))
+            file.write(encoded)
+            blocks.write(file, start)
+            file.truncate(start + blocks.size)
+            file.flush()
+            os.fsync(file.fileno())
+        except BaseException:
+            os.unlink(file.name)
+            raise
+    os.replace(file.name, path)
+
+
+class Snapshot:
+    """A snapshot opened by open_snapshot.
+
+    Sections the snapshot was written without read as None.
+    """
+
+    def __init__(self, header: dict[str, Any], buffer: mmap.mmap, start: int):
+        self._header = header
+        self._buffer = buffer
+        self._start = start
+        self.written_at = datetime.fromisoformat(header["writtenAt"])
+        self.org_id: str | None = header.get("orgId")
+
+    def _block(self, section: dict[str, int]) -> bytes:
+        offset = self._start + section["offset"]
+        return self._buffer[offset : offset + section["length"]]
+
+    def _array(self, column: dict[str, Any]) -> np.ndarray:
+        import numpy as np
+
+        dtype = np.dtype(column["dtype"])
+        if not column["count"]:
+            # An empty last block may lie past the end of the file
+            return np.empty(0, dtype=dtype)
+        array: np.ndarray = np.frombuffer(
+            self._buffer,
+            dtype=dtype,
+            count=column["count"],
+            offset=self._start + column["offset"],
+        )
+        return array
+
+    @cached_property
+    def sessions(self) -> SessionTable | None:
+        """The session table, its columns viewing the mapped file."""
+        section = self._header.get("sessions")
+        if section is None:
+            return None
+        from evnex.session_table import Categorical, SessionTable
+
+        columns: dict[str, Any] = {}
+        for name, column in section["columns"].items():
+            array = self._array(column)
+            if "labels" in column:
+                columns[name] = Categorical(array, tuple(column["labels"]))
+            else:
+                columns[name] = array
+        return SessionTable(**columns)
+
+    @cached_property
+    def charge_points(self) -> list[EvnexChargePoint] | None:
+        section = self._header.get("chargePoints")
+        if section is None:
+            return None
+        charge_points: list[EvnexChargePoint] = _CHARGE_POINTS.validate_json(
+            self._block(section)
+        )
+        return charge_points
+
+    @cached_property
+    def locations(self) -> list[EvnexLocation] | None:
+        section = self._header.get("locations")
+        if section is None:
+            return None
+        locations: list[EvnexLocation] = _LOCATIONS.validate_json(self._block(section))
+        return locations
+
+    @cached_property
+    def resources(self) -> dict[str, Any] | None:
+        section = self._header.get("resources")
+        if section is None:
+            return None
+        resources: dict[str, Any] = json.loads(self._block(section))
+        return resources
+
+
+def open_snapshot(path: str | os.PathLike[str]) -> Snapshot:
+    """Map a snapshot written by write_snapshot.
+
+    Blocking file I/O: from async code run it with asyncio.to_thread.
+
+    :raises SnapshotError: if the file is not a snapshot this version reads
+    """
+    with open(path, "rb") as file:
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as err:
+            # An empty file cannot be mapped
+            raise SnapshotError(f"{path} is not an evnex snapshot") from err
+    if len(buffer) < _PREAMBLE.size:
+        raise SnapshotError(f"{path} is not an evnex snapshot")
+    magic, version, length = _PREAMBLE.unpack_from(buffer)
+    if magic != MAGIC:
+        raise SnapshotError(f"{path} is not an evnex snapshot")
+    if version != VERSION:
+        raise SnapshotError(
+            f"{path} is a version {version} snapshot; this evnex reads "
+            f"version {VERSION}"
+        )
+    header = json.loads(buffer[_PREAMBLE.size : _PREAMBLE.size + length])
+    return Snapshot(header, buffer, _aligned(_PREAMBLE.size + length))
@@ -0,0 +1,233 @@
+"""Stale-while-revalidate reads of slowly changing resources.
+
+A dashboard that awaits get_org_charge_points on every render blocks for as
+long as the API takes, and for minutes (api_retry's backoff) when the API is
+having a bad moment. SWRReader answers those reads from memory instead:
+
+- younger than ``soft_ttl``: the cached result, no request made
+- older than soft_ttl but younger than ``max_age``: the cached result,
+  flagged stale, while one background refresh fetches a new one
+- older than max_age (or never fetched): fetched before returning
+
+When a refresh fails or exceeds ``timeout``, the last good result keeps being
+served, flagged stale and carrying the error, until it passes max_age:
+
+    reader = SWRReader(evnex, SWRPolicy(soft_ttl=30, max_age=900))
+    read = await reader.get_org_charge_points()
+    render(read.value, stale=read.stale)
+
+Background refreshes run at background priority (see evnex.scheduler), so
+they queue behind anything the dashboard's user is waiting on.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+import httpx
+from pydantic import ValidationError
+
+from evnex.api import Evnex
+from evnex.errors import EvnexAuthError
+from evnex.scheduler import Priority, current_priority, request_priority
+from evnex.schema.charge_points import EvnexChargePoint
+from evnex.schema.v3.charge_points import EvnexChargePointDetail
+from evnex.schema.v3.generic import EvnexV3APIResponse
+from evnex.schema.v3.locations import EvnexLocation
+
+logger = logging.getLogger("evnex.swr")
+
+T = TypeVar("T")
+
+# Failures that are served around rather than raised while a result is cached
+REFRESH_ERRORS = (httpx.HTTPError, ValidationError, EvnexAuthError, TimeoutError)
+
+
+@dataclass(frozen=True, slots=True)
+class SWRPolicy:
+    """How long cached reads are served for.
+
+    :param soft_ttl: seconds a result is served without revalidating
+    :param max_age: seconds a result may be served at all, even stale
+    :param timeout: seconds a refresh may take (retries included) before it
+        is abandoned as failed; None waits as long as api_retry does
+    """
+
+    soft_ttl: float = 30.0
+    max_age: float = 900.0
+    timeout: float | None = 30.0
+
+    def __post_init__(self) -> None:
+        if self.soft_ttl < 0:
+            raise ValueError("soft_ttl must not be negative")
+        if self.max_age < self.soft_ttl:
+            raise ValueError("max_age must not be less than soft_ttl")
+        if self.timeout is not None and self.timeout <= 0:
+            raise ValueError("timeout must be positive")
+
+
+@dataclass(frozen=True, slots=True)
+class CachedRead(Generic[T]):
+    """A read served by SWRReader, with how fresh it is."""
+
+    value: T
+    # Seconds since the value was fetched
+    age: float
+    # Older than soft_ttl: a refresh is under way, or the last one failed
+    stale: bool
+    # Why the most recent refresh failed, if it did
+    error: str | None = None
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: Any
+    fetched_at: float
+    error: str | None = None
+
+
+class SWRReader:
+    """Serves the client's slowly changing reads from memory, refreshing them
+    in the background.
+
+    :param client: the Evnex client to read through
+    :param policy: freshness limits; see SWRPolicy
+    """
+
+    def __init__(self, client: Evnex, policy: SWRPolicy | None = None) -> None:
+        self.client = client
+        self.policy = policy or SWRPolicy()
+        self._entries: dict[tuple[str, str | None], _Entry] = {}
+        # Bumped by invalidate; refreshes started before then are discarded
+        self._generation = 0
+        self._refreshes: dict[
+            tuple[int, tuple[str, str | None]], asyncio.Task[_Entry]
+        ] = {}
+
+    async def get_org_charge_points(
+        self, org_id: str | None = None
+    ) -> CachedRead[list[EvnexChargePoint]]:
+        return await self._read(
+            ("org-charge-points", org_id),
+            lambda: self.client.get_org_charge_points(org_id),
+        )
+
+    async def get_org_locations(
+        self, org_id: str | None = None
+    ) -> CachedRead[list[EvnexLocation]]:
+        return await self._read(
+            ("org-locations", org_id),
+            lambda: self.client.get_org_locations(org_id),
+        )
+
+    async def get_charge_point_detail_v3(
+        self, charge_point_id: str
+    ) -> CachedRead[EvnexV3APIResponse[EvnexChargePointDetail]]:
+        return await self._read(
+            ("charge-point-detail", charge_point_id),
+            lambda: self.client.get_charge_point_detail_v3(charge_point_id),
+        )
+
+    def invalidate(self) -> None:
+        """Forget every cached result, e.g. after changing a charger.
+
+        Refreshes already under way may have read the old state, so their
+        results are not cached; later reads fetch again.
+        """
+        self._generation += 1
+        self._entries.clear()
+
+    async def aclose(self) -> None:
+        """Cancel any background refreshes still running."""
+        refreshes = list(self._refreshes.values())
+        for task in refreshes:
+            task.cancel()
+        await asyncio.gather(*refreshes, return_exceptions=True)
+
+    async def __aenter__(self) -> SWRReader:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def _served(self, entry: _Entry, now: float) -> CachedRead[Any]:
+        age = now - entry.fetched_at
+        return CachedRead(
+            value=entry.value,
+            age=age,
+            stale=age > self.policy.soft_ttl,
+            error=entry.error,
+        )
+
+    async def _read(
+        self, key: tuple[str, str | None], fetch: Callable[[], Awaitable[Any]]
+    ) -> CachedRead[Any]:
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None and now - entry.fetched_at <= self.policy.max_age:
+            if now - entry.fetched_at > self.policy.soft_ttl:
+                self._refresh(key, fetch, Priority.BACKGROUND)
+            return self._served(entry, now)
+
+        # Nothing servable: wait for the fetch, sharing one already under way.
+        # shield() keeps the fetch going for the other waiters if this caller
+        # is cancelled.
+        fresh = await asyncio.shield(self._refresh(key, fetch, current_priority()))
+        return self._served(fresh, time.monotonic())
+
+    def _refresh(
+        self,
+        key: tuple[str, str | None],
+        fetch: Callable[[], Awaitable[Any]],
+        priority: Priority,
+    ) -> asyncio.Task[_Entry]:
+        refresh = (self._generation, key)
+        task = self._refreshes.get(refresh)
+        if task is None:
+            with request_priority(priority):
+                # The task inherits the priority from this context
+                task = asyncio.create_task(self._fetch(key, fetch, self._generation))
+            self._refreshes[refresh] = task
+            task.add_done_callback(lambda done: self._finished(refresh, done))
+        return task
+
+    def _finished(
+        self,
+        refresh: tuple[int, tuple[str, str | None]],
+        task: asyncio.Task[_Entry],
+    ) -> None:
+        self._refreshes.pop(refresh, None)
+        # A background refresh nobody awaits may still fail (the cached result
+        # expired meanwhile); retrieve its error so asyncio does not log it
+        if not task.cancelled():
+            task.exception()
+
+    async def _fetch(
+        self,
+        key: tuple[str, str | None],
+        fetch: Callable[[], Awaitable[Any]],
+        generation: int,
+    ) -> _Entry:
+        try:
+            async with asyncio.timeout(self.policy.timeout):
+                value = await fetch()
+        except REFRESH_ERRORS as err:
+            reason = str(err) or type(err).__name__
+            entry = self._entries.get(key)
+            logger.warning(f"Could not refresh {key[0]}: {reason}")
+            if (
+                entry is None
+                or time.monotonic() - entry.fetched_at > self.policy.max_age
+            ):
+                raise
+            entry.error = reason
+            return entry
+        entry = _Entry(value, time.monotonic())
+        if generation == self._generation:
+            self._entries[key] = entry
+        return entry
@@ -0,0 +1,190 @@
+"""A blocking facade over Evnex for synchronous code.
+
+Wrapping each call in asyncio.run() builds a new event loop, a new httpx
+client and a cold connection every time, and cannot share an EvnexAuth (its
+lock belongs to whichever loop first used it). EvnexSync instead owns one
+event loop running on a background thread, with one Evnex client, connection
+pool and auth session on it, and submits every call into that loop. Any
+number of threads may call it at once:
+
+    with EvnexSync(auth=EvnexAuth(tokens=cached_tokens)) as evnex:
+        evnex.get_user_detail()
+        charge_points = evnex.get_org_charge_points()
+        details = evnex.map(
+            "get_charge_point_detail_v3", [cp.id for cp in charge_points]
+        )
+
+Every public coroutine method of Evnex is available as a blocking method of
+the same name. For anything else (the fleet helpers, CommandJobs, signing
+in) pass a coroutine function to call().
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import threading
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any, TypeVar
+
+from evnex.api import Evnex
+from evnex.auth import EvnexAuth
+
+T = TypeVar("T")
+
+
+class EvnexSync:
+    """Blocking access to one Evnex client running on a background loop.
+
+    :param auth: the authentication component; from here on it is used only
+        on the facade's loop
+    :param timeout: default seconds a blocking call waits for its result;
+        None waits as long as the call takes (it still has its HTTP timeouts)
+    :param client_options: passed on to Evnex (config, hedging, ...)
+    """
+
+    def __init__(
+        self,
+        *,
+        auth: EvnexAuth,
+        timeout: float | None = None,
+        **client_options: Any,
+    ) -> None:
+        self.timeout = timeout
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="evnex-sync", daemon=True
+        )
+        self._thread.start()
+        self._closed = False
+
+        async def build() -> Evnex:
+            return Evnex(auth=auth, **client_options)
+
+        self.client = self._submit(build(), None)
+
+    def __enter__(self) -> EvnexSync:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _submit(self, coroutine: Awaitable[T], timeout: float | None) -> T:
+        if self._closed:
+            if inspect.iscoroutine(coroutine):
+                coroutine.close()
+            raise RuntimeError("EvnexSync is closed")
+        if threading.current_thread() is self._thread:
+            # Blocking the loop on its own result would never return
+            if inspect.iscoroutine(coroutine):
+                coroutine.close()
+            raise RuntimeError(
+                "EvnexSync was called from its own event loop; await the "
+                "client's coroutine methods there instead"
+            )
+        future = asyncio.run_coroutine_threadsafe(_awaited(coroutine), self._loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def call(
+        self,
+        function: Callable[[Evnex], Awaitable[T]],
+        *,
+        timeout: float | None = None,
+    ) -> T:
+        """Run ``await function(client)`` on the loop and return its result.
+
+        For example ``evnex.call(get_fleet_status)``, or a lambda building a
+        coroutine from the client.
+        """
+        return self._submit(
+            function(self.client), self.timeout if timeout is None else timeout
+        )
+
+    def gather(
+        self,
+        *functions: Callable[[Evnex], Awaitable[Any]],
+        return_exceptions: bool = False,
+        timeout: float | None = None,
+    ) -> list[Any]:
+        """Run several calls concurrently; results are in argument order."""
+
+        async def run_all() -> list[Any]:
+            return await asyncio.gather(
+                *(function(self.client) for function in functions),
+                return_exceptions=return_exceptions,
+            )
+
+        return self._submit(run_all(), self.timeout if timeout is None else timeout)
+
+    def map(
+        self,
+        method: str,
+        arguments: Iterable[Any],
+        *,
+        concurrency: int = 10,
+        return_exceptions: bool = False,
+        timeout: float | None = None,
+    ) -> list[Any]:
+        """Call a client method once per argument, at most ``concurrency`` at
+        a time; results are in argument order.
+
+        ``evnex.map("get_charge_point_detail_v3", ids)`` fetches every detail.
+        """
+        bound = self._coroutine_method(method)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(argument: Any) -> Any:
+            async with semaphore:
+                return await bound(argument)
+
+        return self.gather(
+            *(lambda _, argument=argument: one(argument) for argument in arguments),
+            return_exceptions=return_exceptions,
+            timeout=timeout,
+        )
+
+    def _coroutine_method(self, name: str) -> Callable[..., Awaitable[Any]]:
+        attribute = (
+            getattr(self.client, name, None) if not name.startswith("_") else None
+        )
+        if attribute is None or not inspect.iscoroutinefunction(attribute):
+            raise AttributeError(f"Evnex has no coroutine method {name!r}")
+        method: Callable[..., Awaitable[Any]] = attribute
+        return method
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for names EvnexSync does not define itself
+        if name.startswith("_") or "client" not in self.__dict__:
+            raise AttributeError(name)
+        attribute = getattr(self.client, name)
+        if not inspect.iscoroutinefunction(attribute):
+            # Plain attributes such as org_id or command_timeouts
+            return attribute
+
+        def blocking(*args: Any, **kwargs: Any) -> Any:
+            return self._submit(attribute(*args, **kwargs), self.timeout)
+
+        blocking.__name__ = name
+        blocking.__doc__ = attribute.__doc__
+        return blocking
+
+    def __dir__(self) -> list[str]:
+        return sorted(set(super().__dir__()) | set(dir(self.client)))
+
+    def close(self) -> None:
+        """Close the connection pool and stop the loop thread."""
+        if self._closed:
+            return
+        self._submit(self.client.httpx_client.aclose(), None)
+        self._closed = True
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+async def _awaited(awaitable: Awaitable[T]) -> T:
+    return await awaitable
@@ -0,0 +1,216 @@
+"""Pricing energy against a charger's time-of-day tariff.
+
+Chargers describe their electricity price as rates starting at offsets (in
+seconds) from local midnight: ``tariffs`` in the v3 charge point detail,
+``costs`` in the v2 one. TariffIndex compiles either into a sorted table
+with the running integral of the rate at each start, so the price of any
+span of time is two bisections and a subtraction, however many tariff
+boundaries it crosses or days it covers:
+
+    index = TariffIndex.from_v3(detail.electricityCost, detail.timeZone)
+    index.price(7000, started, stopped)         # 7 kWh charged over a span
+    [check.difference for check in index.reconcile(sessions)]
+
+Energy is taken to be drawn evenly over the span priced: a session's
+charging time (chargingStarted to chargingStopped) when known, else the
+whole session. Rates are per kWh and energies in Wh, as the API reports
+them. Spans are priced on the local wall clock, so a span across a daylight
+saving change is priced as the wall clock hours it covered.
+"""
+
+from __future__ import annotations
+
+import bisect
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from evnex.profiles import DAY, ChargingProfile
+from evnex.schema.charge_points import (
+    EvnexElectricityCost as EvnexElectricityCostV2,
+)
+from evnex.schema.v3.charge_points import EvnexChargePointSession
+from evnex.schema.v3.cost import EvnexElectricityCost
+
+
+class TariffError(ValueError):
+    """A tariff table is unusable (e.g. empty, or a start outside the day)."""
+
+
+@dataclass(frozen=True, slots=True)
+class CostCheck:
+    """A session's reported cost against the cost its tariff gives."""
+
+    session_id: str
+    reported: float | None
+    computed: float
+
+    @property
+    def difference(self) -> float | None:
+        return None if self.reported is None else self.reported - self.computed
+
+
+@dataclass(frozen=True, slots=True)
+class TariffIndex:
+    """A repeating rate table, indexed for pricing spans of time.
+
+    Build one with build(), from_v2() or from_v3().
+    """
+
+    starts: tuple[float, ...]
+    rates: tuple[float, ...]
+    # The rate integrated (rate x seconds) from the table's start to each start
+    cumulative: tuple[float, ...]
+    currency: str
+    timezone: str = "UTC"
+    duration: int = DAY
+    # UTC offsets by hour since the epoch, filled in as they are needed
+    _offsets: dict[int, float] = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def build(
+        cls,
+        tariffs: Iterable[tuple[float, float]],
+        *,
+        currency: str,
+        timezone: str = "UTC",
+        duration: int = DAY,
+    ) -> TariffIndex:
+        """Index (start, rate) pairs; the last rate runs on past midnight."""
+        table = sorted(tariffs)
+        if not table:
+            raise TariffError("A tariff needs at least one rate")
+        if any(not 0 <= start < duration for start, _ in table):
+            raise TariffError(f"Tariff starts must lie within {duration} s")
+        if table[0][0] > 0:
+            # Before the first start the previous day's last rate applies
+            table.insert(0, (0.0, table[-1][1]))
+        starts = tuple(float(start) for start, _ in table)
+        rates = tuple(float(rate) for _, rate in table)
+        cumulative = [0.0]
+        for index in range(1, len(starts)):
+            span = starts[index] - starts[index - 1]
+            cumulative.append(cumulative[-1] + rates[index - 1] * span)
+        # The integral over a whole period, used to skip over whole days
+        cumulative.append(cumulative[-1] + rates[-1] * (duration - starts[-1]))
+        try:
+            ZoneInfo(timezone)
+        except (ZoneInfoNotFoundError, ValueError) as err:
+            raise TariffError(f"Unknown time zone {timezone!r}") from err
+        return cls(starts, rates, tuple(cumulative), currency, timezone, duration)
+
+    @classmethod
+    def from_v3(cls, cost: EvnexElectricityCost, timezone: str) -> TariffIndex:
+        return cls.build(
+            ((tariff.start, tariff.rate) for tariff in cost.tariffs),
+            currency=cost.currency,
+            timezone=timezone,
+        )
+
+    @classmethod
+    def from_v2(cls, cost: EvnexElectricityCostV2, timezone: str) -> TariffIndex:
+        return cls.build(
+            ((segment.start, segment.cost) for segment in cost.costs),
+            currency=cost.currency,
+            timezone=timezone,
+            duration=cost.duration or DAY,
+        )
+
+    def rate_at(self, seconds: float) -> float:
+        """The rate ``seconds`` after local midnight."""
+        index = bisect.bisect_right(self.starts, seconds % self.duration) - 1
+        return self.rates[index]
+
+    def _integral(self, local: float) -> float:
+        """The rate integrated from a period's start to ``local`` after it."""
+        periods, offset = divmod(local, self.duration)
+        index = bisect.bisect_right(self.starts, offset) - 1
+        partial = self.cumulative[index] + self.rates[index] * (
+            offset - self.starts[index]
+        )
+        return periods * self.cumulative[-1] + partial
+
+    def _local(self, timestamp: float) -> float:
+        """POSIX seconds as seconds since the local epoch (wall clock)."""
+        hour = int(timestamp // 3600)
+        offset = self._offsets.get(hour)
+        if offset is None:
+            moment = datetime.fromtimestamp(hour * 3600, ZoneInfo(self.timezone))
+            utc_offset = moment.utcoffset()
+            offset = utc_offset.total_seconds() if utc_offset is not None else 0.0
+            self._offsets[hour] = offset
+        return timestamp + offset
+
+    def average_rate(self, start: float, end: float) -> float:
+        """The mean rate over [start, end), given as POSIX seconds."""
+        local_start, local_end = self._local(start), self._local(end)
+        # Integrate from the start's own period, keeping the sums small
+        base = local_start // self.duration * self.duration
+        local_start, local_end = local_start - base, local_end - base
+        if local_end <= local_start:
+            return self.rate_at(local_start)
+        return (self._integral(local_end) - self._integral(local_start)) / (
+            local_end - local_start
+        )
+
+    def price(self, energy: float, start: float, end: float) -> float:
+        """The cost of ``energy`` Wh drawn evenly over [start, end)."""
+        return energy / 1000 * self.average_rate(start, end)
+
+    def price_many(self, spans: Iterable[tuple[float, float, float]]) -> list[float]:
+        """The cost of each (energy, start, end) span."""
+        return [self.price(energy, start, end) for energy, start, end in spans]
+
+    def price_session(self, session: EvnexChargePointSession) -> float | None:
+        """What the session's energy costs at this tariff, if it can be placed."""
+        attributes = session.attributes
+        start = attributes.chargingStarted or attributes.startDate
+        end = attributes.chargingStopped or attributes.endDate
+        if start is None or end is None or attributes.totalPowerUsage is None:
+            return None
+        return self.price(
+            attributes.totalPowerUsage, start.timestamp(), end.timestamp()
+        )
+
+    def reconcile(self, sessions: Iterable[EvnexChargePointSession]) -> list[CostCheck]:
+        """Each finished session's reported cost beside the tariff's."""
+        checks = []
+        for session in sessions:
+            computed = self.price_session(session)
+            if computed is None:
+                continue
+            total = session.attributes.totalCost
+            checks.append(
+                CostCheck(
+                    session.id,
+                    total.amount if total is not None else None,
+                    computed,
+                )
+            )
+        return checks
+
+    def price_profile(
+        self,
+        profile: ChargingProfile,
+        day: datetime,
+        *,
+        voltage: float = 230.0,
+        phases: int = 1,
+    ) -> tuple[float, float]:
+        """(energy in Wh, cost) of charging at the profile's limits for a day.
+
+        A hypothetical schedule: the vehicle is taken to draw each period's
+        full limit, from local midnight of ``day``.
+        """
+        midnight = day.astimezone(ZoneInfo(self.timezone)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        base = midnight.timestamp()
+        bounds = [start for start, _ in profile.periods] + [profile.duration]
+        energy = cost = 0.0
+        for (start, limit), end in zip(profile.periods, bounds[1:], strict=True):
+            watt_hours = limit * voltage * phases * (end - start) / 3600
+            energy += watt_hours
+            cost += self.price(watt_hours, base + start, base + end)
+        return energy, cost
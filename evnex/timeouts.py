@@ -0,0 +1,146 @@
+"""Adaptive command timeouts learned from each charger's round-trip latency.
+
+Commands travel from the API to the charger and back, so how long one takes
+depends mostly on the charger's link: a Wi-Fi unit typically acknowledges in
+a second or two, a unit on a weak cellular connection can take many times
+that. A fixed timeout is either too long for the first or too short for the
+second.
+
+CommandTimeouts keeps a smoothed round-trip estimate per charger and derives
+its timeout the way TCP derives its retransmission timeout (RFC 6298): the
+smoothed latency plus a multiple of its variation, clamped to a floor and a
+ceiling. A timeout doubles the next one (up to the ceiling) until a command
+succeeds again, so slow-but-alive chargers stop timing out spuriously while
+healthy ones still fail fast.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+# Timeout doubling stops here; the policy ceiling applies long before
+MAX_BACKOFF = 64
+
+
+@dataclass(frozen=True, slots=True)
+class CommandTimeoutPolicy:
+    """Bounds and gains for deriving command timeouts.
+
+    Until ``min_samples`` round trips have been observed for a charger, the
+    command's own default timeout is used (``initial_timeout`` for commands
+    without one), multiplied by ``cellular_factor`` for chargers known to
+    prefer a cellular connection.
+    """
+
+    floor: float = 3.0
+    ceiling: float = 60.0
+    initial_timeout: float = 10.0
+    min_samples: int = 3
+    # RFC 6298 gains and variance multiplier
+    alpha: float = 0.125
+    beta: float = 0.25
+    k: float = 4.0
+    cellular_factor: float = 2.0
+
+    def __post_init__(self) -> None:
+        if self.floor <= 0 or self.floor > self.ceiling:
+            raise ValueError("floor must be positive and not exceed ceiling")
+
+    def clamp(self, seconds: float) -> float:
+        return min(self.ceiling, max(self.floor, seconds))
+
+
+@dataclass(frozen=True, slots=True)
+class CommandLatencyStats:
+    """Observed command latency for one charger, and the timeout it implies."""
+
+    samples: int
+    timeouts: int
+    smoothed: float | None
+    variation: float | None
+    timeout: float
+    connection_type: str | None = None
+
+
+@dataclass(slots=True)
+class _ChargerLatency:
+    samples: int = 0
+    timeouts: int = 0
+    smoothed: float | None = None
+    variation: float | None = None
+    backoff: int = 1
+    connection_type: str | None = None
+
+
+def _is_cellular(connection_type: str | None) -> bool:
+    # The API reports e.g. "Cell" or "Wifi" as preferredConnectionType
+    return connection_type is not None and connection_type.casefold().startswith("cell")
+
+
+class CommandTimeouts:
+    """Tracks command round trips per charger and derives their timeouts."""
+
+    def __init__(self, policy: CommandTimeoutPolicy | None = None) -> None:
+        self.policy = policy or CommandTimeoutPolicy()
+        self._chargers: dict[str, _ChargerLatency] = {}
+
+    def _entry(self, charge_point_id: str) -> _ChargerLatency:
+        return self._chargers.setdefault(charge_point_id, _ChargerLatency())
+
+    def note_connection(self, charge_point_id: str, connection_type: str) -> None:
+        """Record a charger's preferred connection type (e.g. "Cell")."""
+        self._entry(charge_point_id).connection_type = connection_type
+
+    def observe(self, charge_point_id: str, seconds: float) -> None:
+        """Record a command that completed after ``seconds``."""
+        entry = self._entry(charge_point_id)
+        alpha, beta = self.policy.alpha, self.policy.beta
+        if entry.smoothed is None or entry.variation is None:
+            entry.smoothed = seconds
+            entry.variation = seconds / 2
+        else:
+            deviation = abs(entry.smoothed - seconds)
+            entry.variation = (1 - beta) * entry.variation + beta * deviation
+            entry.smoothed = (1 - alpha) * entry.smoothed + alpha * seconds
+        entry.samples += 1
+        entry.backoff = 1
+
+    def observe_timeout(self, charge_point_id: str) -> None:
+        """Record a command that timed out; the next timeout is doubled."""
+        entry = self._entry(charge_point_id)
+        entry.timeouts += 1
+        entry.backoff = min(MAX_BACKOFF, entry.backoff * 2)
+
+    def timeout_for(self, charge_point_id: str, default: float | None = None) -> float:
+        """The timeout to use for the next command sent to this charger."""
+        policy = self.policy
+        entry = self._chargers.get(charge_point_id) or _ChargerLatency()
+        if (
+            entry.samples < policy.min_samples
+            or entry.smoothed is None
+            or entry.variation is None
+        ):
+            base = policy.initial_timeout if default is None else default
+            if _is_cellular(entry.connection_type):
+                base *= policy.cellular_factor
+        else:
+            base = entry.smoothed + policy.k * entry.variation
+        return policy.clamp(policy.clamp(base) * entry.backoff)
+
+    def stats(self, charge_point_id: str) -> CommandLatencyStats:
+        entry = self._chargers.get(charge_point_id) or _ChargerLatency()
+        return CommandLatencyStats(
+            samples=entry.samples,
+            timeouts=entry.timeouts,
+            smoothed=entry.smoothed,
+            variation=entry.variation,
+            timeout=self.timeout_for(charge_point_id),
+            connection_type=entry.connection_type,
+        )
+
+    def all_stats(self) -> dict[str, CommandLatencyStats]:
+        """Stats for every charger a command has been sent to."""
+        return {
+            charge_point_id: self.stats(charge_point_id)
+            for charge_point_id in self._chargers
+        }
@@ -0,0 +1,150 @@
+"""Tests for the multi-account manager and the per-account rate limiter."""
+
+import asyncio
+import copy
+import time
+from datetime import UTC, datetime, timedelta
+
+import httpx
+import pytest
+import respx
+from tenacity import wait_none
+
+from evnex.accounts import AccountManager
+from evnex.api import Evnex
+from evnex.auth import EvnexAuth, TokenSet
+from evnex.ratelimit import TokenBucket
+
+from .test_cli_resources import BASE, USER_PAYLOAD, USER_URL
+
+SUMMARY_PAYLOAD = {
+    "data": {
+        "charging": 1,
+        "available": 2,
+        "disabled": 0,
+        "faulted": 0,
+        "occupied": 0,
+        "offline": 0,
+        "reserved": 0,
+    }
+}
+
+
+def _session(name, expires_in=timedelta(hours=1)):
+    return EvnexAuth(
+        tokens=TokenSet(
+            access_token=f"access-{name}",
+            id_token="id-0",
+            refresh_token="refresh-0",
+            expires_at=datetime.now(UTC) + expires_in,
+        )
+    )
+
+
+def _user_for(request):
+    """acme belongs to one organisation, globex to two."""
+    payload = copy.deepcopy(USER_PAYLOAD)
+    if request.headers["Authorization"] == "access-globex":
+        org = payload["data"]["organisations"][0]
+        payload["data"]["organisations"] = [
+            {**org, "id": "org-g1", "name": "Globex North"},
+            {**org, "id": "org-g2", "name": "Globex South"},
+        ]
+    return httpx.Response(200, json=payload)
+
+
+def _summary_url(org_id):
+    return f"{BASE}/v2/apps/organisations/{org_id}/summary/status"
+
+
+async def test_fan_out_spans_every_org_of_every_account(monkeypatch):
+    monkeypatch.setattr(Evnex.get_org_summary_status.retry, "wait", wait_none())
+    async with AccountManager(rate=100) as manager:
+        manager.add("acme", _session("acme"))
+        manager.add("globex", _session("globex"))
+        with respx.mock:
+            respx.get(USER_URL).mock(side_effect=_user_for)
+            orgs = await manager.discover()
+            respx.get(_summary_url("org-0000")).mock(
+                return_value=httpx.Response(200, json=SUMMARY_PAYLOAD)
+            )
+            respx.get(_summary_url("org-g1")).mock(
+                return_value=httpx.Response(200, json=SUMMARY_PAYLOAD)
+            )
+            respx.get(_summary_url("org-g2")).mock(return_value=httpx.Response(403))
+            summaries = await manager.summary_status()
+
+    assert [(org.account, org.org_id) for org in orgs] == [
+        ("acme", "org-0000"),
+        ("globex", "org-g1"),
+        ("globex", "org-g2"),
+    ]
+    by_org = {org.org_id: result for org, result in summaries.items()}
+    assert by_org["org-0000"].charging == 1
+    assert by_org["org-g1"].available == 2
+    assert isinstance(by_org["org-g2"], httpx.HTTPStatusError)
+
+
+async def test_accounts_share_one_pool_and_split_the_rate():
+    async with AccountManager(rate=12) as manager:
+        first = manager.add("acme", _session("acme"))
+        assert first.limiter.rate == 12
+        second = manager.add("globex", _session("globex"))
+        third = manager.add("initech", _session("initech"))
+
+        assert {a.limiter.rate for a in (first, second, third)} == {4}
+        assert first.client.httpx_client is third.client.httpx_client
+        with pytest.raises(ValueError):
+            manager.add("acme", _session("acme"))
+        manager.remove("initech")
+        assert first.limiter.rate == 6
+
+
+async def test_accounts_cannot_be_added_before_entering():
+    with pytest.raises(RuntimeError):
+        AccountManager().add("acme", _session("acme"))
+
+
+async def test_refreshes_are_staggered_and_run_in_the_background():
+    lead = timedelta(minutes=4)
+    async with AccountManager(refresh_lead=lead) as manager:
+        expiring = manager.add("acme", _session("acme", timedelta(minutes=1)))
+        for name in ("b", "c", "d"):
+            manager.add(name, _session(name))
+        schedule = manager.refresh_schedule()
+
+        # Same expiry, different due times, spread across the lead window
+        later = [when for when, account in schedule if account is not expiring]
+        assert len(set(later)) == 3
+        assert max(later) - min(later) <= lead
+
+        for _ in range(200):
+            if expiring.auth.tokens.access_token != "access-acme":
+                break
+            await asyncio.sleep(0.01)
+        assert expiring.auth.tokens.access_token == "access-1"
+        assert manager.account("b").auth.tokens.access_token == "access-b"
+
+
+async def test_token_bucket_spaces_out_requests():
+    bucket = TokenBucket(rate=100, burst=1)
+    started = time.monotonic()
+    for _ in range(5):
+        await bucket.acquire()
+    # The first request is free; the other four wait 10 ms each
+    assert time.monotonic() - started >= 0.035
+
+
+async def test_client_requests_wait_for_the_limiter(resumed_auth):
+    acquired = []
+
+    class Recording(TokenBucket):
+        async def acquire(self):
+            acquired.append(True)
+            await super().acquire()
+
+    client = Evnex(auth=resumed_auth, rate_limiter=Recording(rate=100))
+    with respx.mock:
+        respx.get(USER_URL).mock(return_value=httpx.Response(200, json=USER_PAYLOAD))
+        await client.get_user_detail()
+    assert acquired == [True]
@@ -0,0 +1,156 @@
+"""Tests for vectorised session rollups."""
+
+import time
+
+import httpx
+import pytest
+import respx
+
+np = pytest.importorskip("numpy")
+
+from evnex.analytics import (  # noqa: E402
+    GroupBy,
+    SessionColumns,
+    fetch_session_columns,
+    rollup,
+)
+from evnex.api import Evnex  # noqa: E402
+from evnex.schema.v3.charge_points import EvnexChargePointSession  # noqa: E402
+
+from .test_cli_resources import (  # noqa: E402
+    SESSIONS_PAYLOAD,
+    SESSIONS_URL,
+    TWO_CHARGE_POINTS_PAYLOAD,
+    _charge_points,
+)
+
+# 2024-06-01T00:00:00Z
+NOW = 1717200000.0
+
+
+def _session(session_id, start, end, charging, energy, cost=None, connector="1"):
+    """A session plugged in over [start, end) and charging over ``charging``,
+    all in hours after NOW."""
+
+    def at(hours):
+        return None if hours is None else NOW + hours * 3600
+
+    return EvnexChargePointSession.model_validate(
+        {
+            "id": session_id,
+            "type": "session",
+            "attributes": {
+                "connectorId": connector,
+                "startDate": at(start),
+                "endDate": at(end),
+                "chargingStarted": at(charging[0]),
+                "chargingStopped": at(charging[1]),
+                "totalPowerUsage": energy,
+                "totalCost": cost and {"currency": "NZD", "amount": cost},
+            },
+        }
+    )
+
+
+COLUMNS = SessionColumns.from_sessions(
+    {
+        "cp-1": [
+            _session("s1", 8, 10, (8, 9), 7000, 1.96),
+            _session("s2", 20, 22, (20, 21.5), 10500, 2.94, connector="2"),
+        ],
+        "cp-2": [
+            _session("s3", 32, 36, (32, 33), 7000),
+            # Still plugged in and charging
+            _session("s4", 47, None, (47, None), 3500),
+        ],
+    },
+    {"cp-1": "loc-home", "cp-2": "loc-work"},
+)
+
+
+def test_rollups_by_charger_location_and_connector():
+    now = NOW + 48 * 3600
+    by_charger = rollup(COLUMNS, GroupBy.CHARGE_POINT, now=now)
+    assert by_charger.rows() == [
+        {
+            "key": "cp-1",
+            "sessions": 2,
+            "energy": 17500.0,
+            "cost": 4.9,
+            "pluggedTime": 4 * 3600.0,
+            "chargingTime": 2.5 * 3600.0,
+            "idleTime": 1.5 * 3600.0,
+        },
+        {
+            "key": "cp-2",
+            "sessions": 2,
+            "energy": 10500.0,
+            "cost": 0.0,
+            "pluggedTime": 5 * 3600.0,
+            "chargingTime": 2 * 3600.0,
+            "idleTime": 3 * 3600.0,
+        },
+    ]
+    assert rollup(COLUMNS, GroupBy.LOCATION, now=now).keys == ("loc-home", "loc-work")
+    by_connector = rollup(COLUMNS, GroupBy.CONNECTOR, now=now)
+    assert by_connector.keys == ("cp-1/1", "cp-1/2", "cp-2/1")
+    assert by_connector.sessions.tolist() == [1, 1, 2]
+    assert COLUMNS.currencies == {"NZD"}
+
+
+def test_time_rollups_use_the_local_start_of_each_session():
+    by_day = rollup(COLUMNS, GroupBy.DAY, tz="Pacific/Auckland", now=NOW + 48 * 3600)
+    # 12 hours ahead of UTC in June
+    assert by_day.keys == ("2024-06-01", "2024-06-02", "2024-06-03")
+    assert by_day.sessions.tolist() == [1, 2, 1]
+
+    by_hour = rollup(COLUMNS, GroupBy.HOUR, now=NOW + 48 * 3600)
+    assert len(by_hour.keys) == 24
+    assert by_hour.energy[8] == 7000 + 7000
+    assert by_hour.sessions.sum() == 4
+
+
+def test_years_of_history_roll_up_in_well_under_a_second():
+    sessions = 1_000_000
+    rng = np.random.default_rng(1)
+    start = NOW + np.sort(rng.uniform(0, 3 * 365 * 86400, sessions))
+    codes = rng.integers(0, 500, sessions)
+    columns = SessionColumns(
+        ids=tuple(str(i) for i in range(sessions)),
+        charge_point=codes,
+        charge_points=tuple(f"cp-{i}" for i in range(500)),
+        location=codes // 50,
+        locations=tuple(f"loc-{i}" for i in range(10)),
+        connector=codes,
+        connectors=tuple(f"cp-{i}/1" for i in range(500)),
+        start=start,
+        end=start + 7200,
+        charging_started=start + 60,
+        charging_stopped=start + 3600,
+        energy=rng.uniform(1000, 40000, sessions),
+        cost=rng.uniform(0, 10, sessions),
+        currencies=frozenset({"NZD"}),
+    )
+    started = time.perf_counter()
+    for by in GroupBy:
+        rollup(columns, by, tz="Pacific/Auckland")
+
+    assert time.perf_counter() - started < 1
+
+
+async def test_sessions_are_fetched_for_every_charger(resumed_auth):
+    charge_points = _charge_points(TWO_CHARGE_POINTS_PAYLOAD)
+    with respx.mock:
+        respx.get(SESSIONS_URL).mock(
+            return_value=httpx.Response(200, json=SESSIONS_PAYLOAD)
+        )
+        respx.get(SESSIONS_URL.replace("cp-0000001", "cp-0000002")).mock(
+            return_value=httpx.Response(200, json={"data": []})
+        )
+        columns = await fetch_session_columns(Evnex(auth=resumed_auth), charge_points)
+
+    assert len(columns) == 2
+    assert columns.locations == ("loc-0000001",)
+    totals = rollup(columns, GroupBy.CHARGE_POINT)
+    assert totals.energy.tolist() == [10500.0]
+    assert totals.cost.tolist() == [1.96]
@@ -393,6 +393,7 @@ def test_fixtures_validate_against_models():
     [
         ("cmd_live_status", ["status"]),
         ("cmd_live_status", ["status", "--charge-point", "cp-1", "--json"]),
+        ("cmd_live_status", ["status", "--fast"]),
         ("cmd_charge_points_list", ["charge-points", "list"]),
         ("cmd_charge_points_list", ["charge-points", "list", "--json"]),
         ("cmd_charge_points_show", ["charge-points", "show"]),
@@ -407,6 +408,8 @@ def test_fixtures_validate_against_models():
         ("cmd_insights", ["insights"]),
         ("cmd_insights", ["insights", "--days", "14", "--json"]),
         ("cmd_charge_now", ["charge", "now", "--charge-point", "cp-1"]),
+        ("cmd_charge_now", ["charge", "now", "--all", "--concurrency", "4"]),
+        ("cmd_charge_auto", ["charge", "auto", "--location", "Home"]),
         ("cmd_charge_auto", ["charge", "auto"]),
         ("cmd_charge_stop", ["charge", "stop", "--yes"]),
         ("cmd_charge_stop", ["charge", "stop", "-y"]),
@@ -539,6 +542,44 @@ async def test_status_json_is_the_only_thing_on_stdout(cli, capsys):
     assert payload[0]["sessions"][0]["id"] == "session-0000001"
 
 
+async def test_jsonl_and_compact_carry_the_same_records_as_json(cli, capsys):
+    with respx.mock:
+        respx.get(USER_URL).mock(return_value=httpx.Response(200, json=USER_PAYLOAD))
+        respx.get(CP_URL).mock(
+            return_value=httpx.Response(200, json=TWO_CHARGE_POINTS_PAYLOAD)
+        )
+        respx.get(SESSIONS_URL).mock(
+            return_value=httpx.Response(200, json=SESSIONS_PAYLOAD)
+        )
+        respx.get(DETAIL_URL).mock(
+            return_value=httpx.Response(200, json=DETAIL_V3_PAYLOAD)
+        )
+        outputs = {}
+        for flag in ("--json", "--jsonl", "--compact"):
+            await run(["sessions", "list", "--charge-point", "Garage", flag])
+            outputs[flag] = capsys.readouterr().out
+        await run(["charge-points", "list", "--compact"])
+        listing = capsys.readouterr().out
+        await run(["charge-points", "show", "Garage", "--jsonl"])
+        shown = capsys.readouterr().out
+
+    pretty = json.loads(outputs["--json"])
+    lines = outputs["--jsonl"].splitlines()
+    assert [json.loads(line) for line in lines] == pretty
+    assert outputs["--compact"].count("\n") == 1
+    assert json.loads(outputs["--compact"]) == pretty
+    assert [cp["id"] for cp in json.loads(listing)] == ["cp-0000001", "cp-0000002"]
+    # A single document is one line under --jsonl
+    assert shown.count("\n") == 1
+    assert json.loads(shown)["serial"] == "SN0000001"
+
+
+async def test_json_styles_are_mutually_exclusive(capsys):
+    with pytest.raises(SystemExit):
+        await run(["charge-points", "list", "--json", "--jsonl"])
+    assert "not allowed with" in capsys.readouterr().err
+
+
 async def test_charge_points_list(cli, capsys):
     with respx.mock:
         respx.get(USER_URL).mock(return_value=httpx.Response(200, json=USER_PAYLOAD))
@@ -950,3 +991,132 @@ async def test_status_renders_charge_point_without_meter(cli, capsys):
 def test_sessions_limit_must_be_positive():
     with pytest.raises(SystemExit):
         build_parser().parse_args(["sessions", "list", "--limit", "-1"])
+
+
+# --- Bulk charge control --------------------------------------------------
+
+
+OVERRIDE_URL_2 = f"{BASE}/charge-points/cp-0000002/commands/set-override"
+
+
+def test_repeated_charge_point_accumulates():
+    args = build_parser().parse_args(
+        ["charge", "stop", "--charge-point", "a", "--charge-point", "b"]
+    )
+    assert args.charge_point == ["a", "b"]
+    assert args.concurrency == 10
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["charge", "now", "--all"],
+        ["charge", "now", "--location", "home"],
+        ["charge", "now", "--charge-point", "garage", "--charge-point", "driveway"],
+    ],
+)
+async def test_charge_now_on_many_charge_points(cli, capsys, argv):
+    with respx.mock:
+        respx.get(USER_URL).mock(return_value=httpx.Response(200, json=USER_PAYLOAD))
+        respx.get(CP_URL).mock(
+            return_value=httpx.Response(200, json=TWO_CHARGE_POINTS_PAYLOAD)
+        )
+        first = respx.post(OVERRIDE_URL).mock(return_value=httpx.Response(200, json={}))
+        second = respx.post(OVERRIDE_URL_2).mock(
+            return_value=httpx.Response(200, json={})
+        )
+        await run(argv)
+
+    assert first.call_count == 1 and second.call_count == 1
+    out = capsys.readouterr().out
+    assert "Garage Charger" in out and "Driveway Charger" in out
+    assert out.count("ok") == 2
+
+
+async def test_bulk_charge_reports_failures_and_exits_1(cli, capsys):
+    with respx.mock:
+        respx.get(USER_URL).mock(return_value=httpx.Response(200, json=USER_PAYLOAD))
+        respx.get(CP_URL).mock(
+            return_value=httpx.Response(200, json=TWO_CHARGE_POINTS_PAYLOAD)
+        )
+        respx.post(OVERRIDE_URL).mock(return_value=httpx.Response(200, json={}))
+        respx.post(OVERRIDE_URL_2).mock(side_effect=httpx.ReadTimeout("offline"))
+        with pytest.raises(SystemExit) as exc:
+            await run(["charge", "auto", "--all"])
+
+    assert exc.value.code == 1
+    captured = capsys.readouterr()
+    assert "timed out" in captured.out
+    assert "1 of 2 charge points did not succeed" in captured.err
+
+
+async def test_unknown_location_exits_2(cli, capsys):
+    with respx.mock:
+        respx.get(USER_URL).mock(return_value=httpx.Response(200, json=USER_PAYLOAD))
+        respx.get(CP_URL).mock(
+            return_value=httpx.Response(200, json=TWO_CHARGE_POINTS_PAYLOAD)
+        )
+        with pytest.raises(SystemExit) as exc:
+            await run(["charge", "now", "--location", "Nowhere"])
+
+    assert exc.value.code == 2
+    assert "No charge points at location" in capsys.readouterr().err
+
+
+async def test_bulk_stop_confirms_once_for_all(cli, capsys, monkeypatch):
+    prompts = []
+
+    def decline(prompt=""):
+        prompts.append(prompt)
+        return "n"
+
+    monkeypatch.setattr("builtins.input", decline)
+    with respx.mock:
+        respx.get(USER_URL).mock(return_value=httpx.Response(200, json=USER_PAYLOAD))
+        respx.get(CP_URL).mock(
+            return_value=httpx.Response(200, json=TWO_CHARGE_POINTS_PAYLOAD)
+        )
+        stop = respx.post(url__regex=r".*/remote-stop-transaction")
+        with pytest.raises(SystemExit):
+            await run(["charge", "stop", "--all"])
+
+    assert prompts == ["Stop the active charging session on 2 charge points? [y/N] "]
+    assert stop.call_count == 0
+
+
+# --- Fast status ----------------------------------------------------------
+
+
+async def test_fast_status_skips_detail_for_idle_chargers(cli, capsys):
+    with respx.mock:
+        respx.get(USER_URL).mock(return_value=httpx.Response(200, json=USER_PAYLOAD))
+        respx.get(CP_URL).mock(
+            return_value=httpx.Response(200, json=CHARGE_POINTS_PAYLOAD)
+        )
+        respx.get(CONNECTOR_SUMMARY_URL).mock(
+            return_value=httpx.Response(200, json=CONNECTOR_SUMMARY_PAYLOAD)
+        )
+        detail = respx.get(DETAIL_URL)
+        await run(["status", "--fast"])
+
+    assert detail.call_count == 0
+    out = capsys.readouterr().out
+    assert "Garage Charger (SN0000001)" in out
+    assert "Connector 1: AVAILABLE" in out
+    assert "Connectors: 1 charging, 3 available" in out
+
+
+async def test_fast_status_json(cli, capsys):
+    with respx.mock:
+        respx.get(USER_URL).mock(return_value=httpx.Response(200, json=USER_PAYLOAD))
+        respx.get(CP_URL).mock(
+            return_value=httpx.Response(200, json=CHARGE_POINTS_PAYLOAD)
+        )
+        respx.get(CONNECTOR_SUMMARY_URL).mock(
+            return_value=httpx.Response(200, json=CONNECTOR_SUMMARY_PAYLOAD)
+        )
+        await run(["status", "--fast", "--json"])
+
+    payload = json.loads(capsys.readouterr().out)
+    assert payload["chargePoints"][0]["serial"] == "SN0000001"
+    assert payload["summary"]["offline"] == 2
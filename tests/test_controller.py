@@ -0,0 +1,136 @@
+"""Tests for closed-loop site control from supply meter readings."""
+
+import asyncio
+import json
+from datetime import UTC, datetime
+
+import httpx
+import pytest
+import respx
+
+from evnex.api import Evnex
+from evnex.controller import ControlPolicy, MeterSource, SiteController
+
+from .test_cli_resources import BASE, DETAIL_URL, DETAIL_V3_PAYLOAD
+from .test_reconcile import LOAD_SCHEDULE
+
+METER_URL = rf"{BASE}/charge-points/(?P<cp_id>[^/]+)/commands/get-energy-meter-reading"
+LOAD_URL = rf"{BASE}/v2/apps/charge-points/(?P<cp_id>[^/]+)/load-management"
+
+
+class Site:
+    """A house with solar panels whose vehicles draw all they are allowed."""
+
+    def __init__(self, house=1000, solar=5600, slow=()):
+        self.house, self.solar = house, solar
+        self.slow = set(slow)
+        self.limits = {}
+
+    def charging(self, cp_id):
+        return self.limits.get(cp_id, 0) * 230
+
+    async def meter(self, request, cp_id):
+        if cp_id in self.slow:
+            await asyncio.sleep(1)
+        supply = self.house - self.solar + sum(map(self.charging, self.limits))
+        reading = {
+            "timestamp": datetime.now(UTC).isoformat(),
+            "chargingActivePower": self.charging(cp_id),
+            "supplyActivePower": supply,
+        }
+        return httpx.Response(200, json={"data": reading, "status": "Accepted"})
+
+    def load(self, request, cp_id):
+        body = json.loads(request.content)
+        self.limits[cp_id] = body["chargingProfilePeriods"][-1]["limit"]
+        return httpx.Response(200, json={"data": LOAD_SCHEDULE})
+
+    def mock(self):
+        respx.post(url__regex=METER_URL).mock(side_effect=self.meter)
+        return respx.put(url__regex=LOAD_URL).mock(side_effect=self.load)
+
+
+def _controller(auth, **policy):
+    return SiteController(
+        Evnex(auth=auth),
+        {"cp-1": 32, "cp-2": 32},
+        ControlPolicy(**{"sample_timeout": 0.2, **policy}),
+    )
+
+
+async def test_limits_ramp_up_to_the_surplus_then_hold_in_the_deadband(resumed_auth):
+    site = Site()
+    controller = _controller(resumed_auth)
+    with respx.mock:
+        writes = site.mock()
+        reports = [await controller.step() for _ in range(6)]
+
+    # 20 A of surplus, reached 4 A a cycle; the second charger starts once
+    # both can have their 6 A minimum with 2 A to spare
+    assert [report.total_current for report in reports] == [4, 8, 12, 16, 20, 20]
+    assert [dict(report.limits) for report in reports[1:5]] == [
+        {"cp-1": 8, "cp-2": 0},
+        {"cp-1": 12, "cp-2": 0},
+        {"cp-1": 8, "cp-2": 8},
+        {"cp-1": 10, "cp-2": 10},
+    ]
+    assert reports[-1].supply_power == 0
+    assert reports[-1].written == ()
+    assert writes.call_count == 8
+    stats = controller.stats()
+    assert (stats.cycles, stats.writes, stats.failed_writes) == (6, 8, 0)
+    assert 0 < stats.mean_latency <= stats.max_latency
+    assert all(r.sample_latency <= r.latency for r in reports)
+
+
+async def test_short_dips_hold_the_minimum_but_long_ones_stop_charging(resumed_auth):
+    site = Site()
+    controller = _controller(resumed_auth, stop_delay=2)
+    with respx.mock:
+        site.mock()
+        for _ in range(5):
+            await controller.step()
+        site.solar = 2000
+        dipped = [await controller.step() for _ in range(3)]
+
+    assert [dict(report.limits) for report in dipped] == [
+        {"cp-1": 6, "cp-2": 6},
+        {"cp-1": 6, "cp-2": 6},
+        {"cp-1": 0, "cp-2": 0},
+    ]
+    assert site.limits == {"cp-1": 0, "cp-2": 0}
+
+
+async def test_a_slow_charger_does_not_stall_the_cycle(resumed_auth):
+    site = Site(slow={"cp-2"})
+    controller = _controller(resumed_auth)
+    with respx.mock:
+        site.mock()
+        report = await controller.step()
+
+    assert report.missed == ("cp-2",)
+    assert report.supply_power == -4600
+    assert report.latency < 1
+
+
+async def test_the_v3_detail_meter_can_be_sampled_instead(resumed_auth):
+    controller = SiteController(
+        Evnex(auth=resumed_auth),
+        {"cp-0000001": 32},
+        ControlPolicy(source=MeterSource.DETAIL),
+    )
+    with respx.mock:
+        respx.get(DETAIL_URL).mock(
+            return_value=httpx.Response(200, json=DETAIL_V3_PAYLOAD)
+        )
+        assert await controller.sample() == []
+
+    sample = controller.samples["cp-0000001"]
+    assert (sample.charging_power, sample.supply_power) == (3600, 400)
+
+
+def test_policy_rejects_impossible_settings():
+    with pytest.raises(ValueError):
+        ControlPolicy(phases=2)
+    with pytest.raises(ValueError):
+        SiteController(None, {"cp-1": 32}, meter_charge_point_id="cp-2")
@@ -0,0 +1,128 @@
+"""Tests for the CLI daemon: forwarding over the socket, the warm listing
+cache, and falling back to in-process execution.
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+import respx
+
+from evnex.cli import build_parser
+from evnex.cli._daemon import forward, route_output, serve
+from evnex.cli._resources import SharedClient
+
+from .test_cli_resources import CHARGE_POINTS_PAYLOAD, CP_URL, USER_PAYLOAD, USER_URL
+
+
+@pytest.fixture
+def socket_path(tmp_path, monkeypatch):
+    path = tmp_path / "d.sock"
+    monkeypatch.setenv("EVNEX_DAEMON_SOCKET", str(path))
+    return path
+
+
+@pytest.fixture
+def token_cache(tmp_path):
+    return tmp_path / "tokens.json"
+
+
+@pytest.fixture
+async def daemon(client, socket_path, token_cache):
+    """A daemon serving on socket_path, with its org already resolved."""
+    client.org_id = "org-0000"
+    shared = SharedClient(client)
+    with route_output():
+        server = asyncio.create_task(serve(shared, socket_path, token_cache))
+        while not await asyncio.to_thread(socket_path.exists):
+            await asyncio.sleep(0.01)
+        yield shared
+        server.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await server
+
+
+async def forward_argv(argv, token_cache):
+    argv = [*argv, "--token-cache", str(token_cache)]
+
+    def _forward():
+        return forward(argv, build_parser().parse_args(argv))
+
+    return await asyncio.to_thread(_forward)
+
+
+async def test_commands_share_the_warm_listing(daemon, token_cache, capsys):
+    with respx.mock:
+        user = respx.get(USER_URL).mock(
+            return_value=httpx.Response(200, json=USER_PAYLOAD)
+        )
+        listing = respx.get(CP_URL).mock(
+            return_value=httpx.Response(200, json=CHARGE_POINTS_PAYLOAD)
+        )
+        first = await forward_argv(["charge-points", "list", "--json"], token_cache)
+        output = capsys.readouterr().out
+        second = await forward_argv(["charge-points", "list"], token_cache)
+
+    assert first == second == 0
+    assert [cp["id"] for cp in json.loads(output)] == ["cp-0000001"]
+    assert "cp-0000001" in capsys.readouterr().out
+    assert listing.call_count == 1
+    assert user.call_count == 0
+
+
+async def test_failures_keep_their_exit_status(daemon, token_cache, capsys):
+    with respx.mock:
+        respx.get(CP_URL).mock(return_value=httpx.Response(500))
+        code = await forward_argv(["charge-points", "list"], token_cache)
+
+    assert code == 1
+    assert "API request failed" in capsys.readouterr().err
+
+
+async def test_prompting_commands_run_in_process(daemon, token_cache):
+    assert await forward_argv(["charge", "stop"], token_cache) is None
+
+
+async def test_another_token_cache_runs_in_process(daemon, tmp_path):
+    other = tmp_path / "other.json"
+    assert await forward_argv(["charge-points", "list"], other) is None
+
+
+async def test_no_daemon_runs_in_process(socket_path, token_cache):
+    assert await forward_argv(["charge-points", "list"], token_cache) is None
+
+
+async def test_no_daemon_flag_skips_a_running_daemon(daemon, token_cache):
+    argv = ["--no-daemon", "charge-points", "list"]
+    assert await forward_argv(argv, token_cache) is None
+
+
+async def test_unexpected_failures_are_replied_to(
+    daemon, token_cache, monkeypatch, capsys
+):
+    async def broken(self):
+        raise RuntimeError("listing went wrong")
+
+    monkeypatch.setattr(SharedClient, "charge_points", broken)
+    code = await forward_argv(["charge-points", "list"], token_cache)
+
+    assert code == 1
+    assert "listing went wrong" in capsys.readouterr().err
+
+
+async def test_a_lost_reply_is_not_run_again(socket_path, token_cache, capsys):
+    received = []
+
+    async def hang_up(reader, writer):
+        received.append(await reader.readline())
+        writer.close()
+
+    server = await asyncio.start_unix_server(hang_up, path=str(socket_path))
+    async with server:
+        argv = ["charge", "stop", "--yes", "--all"]
+        code = await forward_argv(argv, token_cache)
+
+    assert len(received) == 1
+    assert code == 1
+    assert "the command may have run" in capsys.readouterr().err
@@ -0,0 +1,118 @@
+"""Tests for the Prometheus exporter: metrics from the poller's snapshot."""
+
+import asyncio
+import re
+
+import httpx
+import respx
+
+from evnex.cli._http import start_server
+from evnex.cli._serve import metrics_handler
+from evnex.exporter import MetricFamily, render_metrics
+from evnex.poller import FleetPoller
+
+from .test_cli_resources import (
+    BASE,
+    CONNECTOR_SUMMARY_PAYLOAD,
+    CONNECTOR_SUMMARY_URL,
+    CP_URL,
+    DETAIL_V3_PAYLOAD,
+    TWO_CHARGE_POINTS_PAYLOAD,
+)
+
+CP1 = 'charge_point_id="cp-0000001",connector_id="1"'
+
+
+def _mock_fleet():
+    respx.get(CP_URL).mock(
+        return_value=httpx.Response(200, json=TWO_CHARGE_POINTS_PAYLOAD)
+    )
+    respx.get(CONNECTOR_SUMMARY_URL).mock(
+        return_value=httpx.Response(200, json=CONNECTOR_SUMMARY_PAYLOAD)
+    )
+    return respx.get(url__regex=rf"{BASE}/charge-points/cp-\d+$").mock(
+        return_value=httpx.Response(200, json=DETAIL_V3_PAYLOAD)
+    )
+
+
+async def test_metrics_include_the_v3_meter_readings(client):
+    poller = FleetPoller(client, "org-0000", full_detail=True)
+    with respx.mock:
+        detail = _mock_fleet()
+        await poller.refresh()
+    metrics = render_metrics(poller)
+
+    assert detail.call_count == 2
+    assert f'evnex_connector_status{{{CP1},status="CHARGING"}} 1' in metrics
+    assert f"evnex_connector_power_watts{{{CP1}}} 3600" in metrics
+    assert f"evnex_connector_supply_active_power_watts{{{CP1}}} 400" in metrics
+    assert f'evnex_connector_current_amperes{{{CP1},phase="L1"}} 16' in metrics
+    assert f'evnex_connector_voltage_volts{{{CP1},phase="L1"}} 230' in metrics
+    # Readings the charger did not report are absent rather than zero
+    assert 'phase="L2"' not in metrics
+    assert "evnex_connector_temperature_celsius{" not in metrics
+    assert 'evnex_org_connectors{status="available"} 3' in metrics
+    assert "# TYPE evnex_exporter_collection_failures_total counter" in metrics
+
+
+def test_non_finite_values_use_the_exposition_spellings():
+    family = MetricFamily("evnex_test", "A test metric")
+    for value in (float("nan"), float("inf"), float("-inf"), 2.5, 7.0):
+        family.add(value, reading=str(value))
+    assert [line.rsplit(" ", 1)[1] for line in family.render()][2:] == [
+        "NaN",
+        "+Inf",
+        "-Inf",
+        "2.5",
+        "7",
+    ]
+
+
+async def test_a_restored_snapshot_is_served_before_the_first_poll(client, tmp_path):
+    path = tmp_path / "fleet.evnx"
+    poller = FleetPoller(client, "org-0000", full_detail=True, snapshot=path)
+    with respx.mock:
+        _mock_fleet()
+        await poller.refresh()
+
+    restarted = FleetPoller(client, "org-0000", snapshot=path)
+    assert await restarted.restore()
+    assert restarted.fleet == poller.fleet
+    metrics = render_metrics(restarted)
+    assert f'evnex_connector_status{{{CP1},status="CHARGING"}} 1' in metrics
+    assert f'evnex_connector_current_amperes{{{CP1},phase="L1"}} 16' in metrics
+    assert 'evnex_org_connectors{status="available"} 3' in metrics
+
+
+async def test_failed_collections_are_counted(client):
+    poller = FleetPoller(client, "org-0000")
+    with respx.mock:
+        respx.get(CP_URL).mock(return_value=httpx.Response(400))
+        respx.get(CONNECTOR_SUMMARY_URL).mock(
+            return_value=httpx.Response(200, json=CONNECTOR_SUMMARY_PAYLOAD)
+        )
+        await poller.refresh()
+    metrics = render_metrics(poller)
+
+    assert "evnex_exporter_collection_failures_total 1" in metrics
+    assert not re.search(r"^evnex_exporter_last_success", metrics, re.MULTILINE)
+
+
+async def test_scrapes_do_not_call_the_api(client):
+    poller = FleetPoller(client, "org-0000", full_detail=True)
+    with respx.mock:
+        detail = _mock_fleet()
+        await poller.refresh()
+        server = await start_server(metrics_handler(poller), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            scrapes = []
+            for _ in range(3):
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(b"GET /metrics HTTP/1.1\r\n\r\n")
+                scrapes.append(await reader.read())
+
+    assert detail.call_count == 2
+    head, body = scrapes[-1].split(b"\r\n\r\n", 1)
+    assert b"Content-Type: text/plain; version=0.0.4" in head
+    assert f"evnex_connector_power_watts{{{CP1}}} 3600".encode() in body
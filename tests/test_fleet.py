@@ -0,0 +1,90 @@
+"""Tests for the listing-first fleet status view."""
+
+import copy
+import json
+
+import httpx
+import respx
+
+from evnex.fleet import FleetStatus, get_fleet_status
+
+from .test_cli_resources import (
+    CONNECTOR_SUMMARY_PAYLOAD,
+    CONNECTOR_SUMMARY_URL,
+    CP_URL,
+    DETAIL_URL,
+    DETAIL_V3_PAYLOAD,
+    SESSIONS_PAYLOAD,
+    SESSIONS_URL,
+    TWO_CHARGE_POINTS_PAYLOAD,
+)
+
+
+def _listing(charging=False, without_connectors=False):
+    payload = copy.deepcopy(TWO_CHARGE_POINTS_PAYLOAD)
+    first = payload["data"]["items"][0]
+    if charging:
+        first["connectors"][0]["ocppStatus"] = "CHARGING"
+        first["connectors"][0]["meter"]["power"] = 3600
+    if without_connectors:
+        first["connectors"] = None
+    return payload
+
+
+def _mock_fleet(listing):
+    respx.get(CP_URL).mock(return_value=httpx.Response(200, json=listing))
+    respx.get(CONNECTOR_SUMMARY_URL).mock(
+        return_value=httpx.Response(200, json=CONNECTOR_SUMMARY_PAYLOAD)
+    )
+    detail = respx.get(DETAIL_URL).mock(
+        return_value=httpx.Response(200, json=DETAIL_V3_PAYLOAD)
+    )
+    sessions = respx.get(SESSIONS_URL).mock(
+        return_value=httpx.Response(200, json=SESSIONS_PAYLOAD)
+    )
+    return detail, sessions
+
+
+async def test_idle_fleet_needs_no_per_charger_calls(client):
+    with respx.mock:
+        detail, sessions = _mock_fleet(_listing())
+        fleet = await get_fleet_status(client, org_id="org-0000")
+
+    assert detail.call_count == 0 and sessions.call_count == 0
+    assert [cp.id for cp in fleet.charge_points] == ["cp-0000001", "cp-0000002"]
+    assert fleet.charge_points[0].connectors[0].ocpp_status == "AVAILABLE"
+    assert fleet.charge_points[0].connectors[0].power == 0
+    assert fleet.summary.available == 3
+
+
+async def test_charging_chargers_are_looked_up_in_detail(client):
+    with respx.mock:
+        detail, sessions = _mock_fleet(_listing(charging=True))
+        fleet = await get_fleet_status(client, org_id="org-0000")
+
+    assert detail.call_count == 1 and sessions.call_count == 1
+    charging, idle = fleet.charge_points
+    assert charging.detailed and not idle.detailed
+    assert charging.connectors[0].supply_active_power == 400
+    assert charging.active_session.id == "session-0000001"
+
+
+async def test_listing_without_connectors_falls_back_to_detail(client):
+    with respx.mock:
+        detail, _ = _mock_fleet(_listing(without_connectors=True))
+        fleet = await get_fleet_status(client, org_id="org-0000", include_summary=False)
+
+    assert detail.call_count == 1
+    assert fleet.summary is None
+    assert fleet.charge_points[0].connectors[0].ocpp_status == "CHARGING"
+
+
+async def test_to_dict_round_trips_through_json(client):
+    with respx.mock:
+        _mock_fleet(_listing(charging=True))
+        fleet = await get_fleet_status(client, org_id="org-0000")
+
+    document = json.loads(json.dumps(fleet.to_dict()))
+    assert document["chargePoints"][0]["activeSession"]["id"] == "session-0000001"
+    assert document["summary"]["charging"] == 1
+    assert FleetStatus.from_dict(document) == fleet
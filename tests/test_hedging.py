@@ -0,0 +1,124 @@
+"""Tests for hedged reads: the duplicate request, the budget, and the
+guarantee that commands are never sent twice.
+
+HTTP is mocked with respx; slow responses are simulated with async side
+effects that sleep before answering.
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+import respx
+
+from evnex.api import Evnex
+from evnex.hedging import HedgingPolicy, LatencyWindow, RequestHedger
+
+from .test_cli_resources import (
+    CHARGE_POINTS_PAYLOAD,
+    CP_URL,
+    OVERRIDE_URL,
+)
+
+FAST_HEDGE = HedgingPolicy(min_delay=0.01, initial_delay=0.02, budget=1.0, burst=1.0)
+
+
+def slow_then_fast(payload, sent, slow_seconds=2.0):
+    """First call stalls; every later call answers immediately.
+
+    Each request is appended to sent on arrival: respx only counts calls that
+    complete, and a cancelled loser never does.
+    """
+
+    async def respond(request):
+        sent.append(request)
+        if len(sent) == 1:
+            await asyncio.sleep(slow_seconds)
+        return httpx.Response(200, json=payload)
+
+    return respond
+
+
+def test_latency_window_quantile():
+    window = LatencyWindow(size=100)
+    assert window.quantile(0.95) is None
+    for ms in range(1, 101):
+        window.observe(ms / 1000)
+    assert window.quantile(0.95) == pytest.approx(0.095)
+    assert window.quantile(0.5) == pytest.approx(0.050)
+
+
+def test_delay_adapts_to_observed_latency():
+    hedger = RequestHedger(HedgingPolicy(min_samples=5, min_delay=0.0))
+    assert hedger.delay_for("detail") == 1.0  # initial_delay until warmed up
+    for _ in range(5):
+        hedger._windows["detail"].observe(0.2)
+    assert hedger.delay_for("detail") == pytest.approx(0.2)
+    assert hedger.delay_for("other") == 1.0  # tracked per endpoint
+
+
+def test_policy_rejects_nonsense():
+    with pytest.raises(ValueError):
+        HedgingPolicy(percentile=1.5)
+    with pytest.raises(ValueError):
+        HedgingPolicy(min_delay=2, max_delay=1)
+
+
+async def test_slow_read_is_hedged_and_first_success_wins(resumed_auth):
+    client = Evnex(auth=resumed_auth, hedging=FAST_HEDGE)
+    # Seed one request's worth of budget
+    client.hedger._credit = 1.0
+    sent = []
+    with respx.mock:
+        respx.get(CP_URL).mock(side_effect=slow_then_fast(CHARGE_POINTS_PAYLOAD, sent))
+        started = time.monotonic()
+        charge_points = await client.get_org_charge_points(org_id="org-0000")
+        elapsed = time.monotonic() - started
+
+    assert charge_points[0].id == "cp-0000001"
+    assert len(sent) == 2
+    assert elapsed < 1.0, "waited for the stalled attempt instead of the hedge"
+    assert client.hedger.stats.hedged == 1
+    assert client.hedger.stats.hedge_wins == 1
+
+
+async def test_hedging_respects_budget(resumed_auth):
+    policy = HedgingPolicy(min_delay=0.01, initial_delay=0.02, budget=0.0)
+    client = Evnex(auth=resumed_auth, hedging=policy)
+    sent = []
+    with respx.mock:
+        respx.get(CP_URL).mock(
+            side_effect=slow_then_fast(CHARGE_POINTS_PAYLOAD, sent, slow_seconds=0.1)
+        )
+        await client.get_org_charge_points(org_id="org-0000")
+
+    assert len(sent) == 1
+    assert client.hedger.stats.hedged == 0
+
+
+async def test_reads_are_not_hedged_without_a_policy(client):
+    sent = []
+    with respx.mock:
+        respx.get(CP_URL).mock(
+            side_effect=slow_then_fast(CHARGE_POINTS_PAYLOAD, sent, slow_seconds=0.1)
+        )
+        await client.get_org_charge_points(org_id="org-0000")
+    assert len(sent) == 1
+    assert client.hedger is None
+
+
+async def test_commands_are_never_hedged(resumed_auth):
+    client = Evnex(auth=resumed_auth, hedging=FAST_HEDGE)
+    client.hedger._credit = 1.0
+
+    async def slow_ack(request):
+        await asyncio.sleep(0.1)
+        return httpx.Response(200, json={})
+
+    with respx.mock:
+        route = respx.post(OVERRIDE_URL).mock(side_effect=slow_ack)
+        await client.set_charge_point_override("cp-0000001", charge_now=True)
+
+    assert route.call_count == 1
+    assert client.hedger.stats.requests == 0
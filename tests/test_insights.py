@@ -0,0 +1,150 @@
+"""Tests for insights over any range of days and `evnex insights --from`."""
+
+import asyncio
+import json
+from datetime import date
+
+import httpx
+import pytest
+import respx
+
+from evnex.insights import InsightCache, fetch_insights
+
+from .test_cli_resources import (
+    BASE,
+    CP_URL,
+    INSIGHTS_PAYLOAD,
+    INSIGHTS_URL,
+    SESSIONS_PAYLOAD,
+    TWO_CHARGE_POINTS_PAYLOAD,
+    USER_PAYLOAD,
+    USER_URL,
+    run,
+)
+
+
+@pytest.fixture
+def signed_in(resumed_auth, monkeypatch):
+    async def fake_signed_in(args):
+        return resumed_auth
+
+    monkeypatch.setattr("evnex.cli._resources.signed_in_auth", fake_signed_in)
+
+
+def _mock_sessions():
+    respx.get(CP_URL).mock(
+        return_value=httpx.Response(200, json=TWO_CHARGE_POINTS_PAYLOAD)
+    )
+    return respx.get(url__regex=rf"{BASE}/charge-points/cp-\d+/sessions").mock(
+        return_value=httpx.Response(200, json=SESSIONS_PAYLOAD)
+    )
+
+
+async def test_a_range_is_stitched_from_the_window_and_sessions(client, tmp_path):
+    path = tmp_path / "insights.json"
+    cache = await asyncio.to_thread(InsightCache.open, path)
+    with respx.mock:
+        window = respx.get(INSIGHTS_URL, params={"days": 30, "tz-offset": 12}).mock(
+            return_value=httpx.Response(200, json=INSIGHTS_PAYLOAD)
+        )
+        sessions = _mock_sessions()
+        insights = await fetch_insights(
+            client,
+            date(2024, 6, 1),
+            date(2024, 6, 11),
+            org_id="org-0000",
+            cache=cache,
+            today=date(2024, 7, 5),
+        )
+    assert (window.call_count, sessions.call_count) == (1, 2)
+
+    days = insights.days
+    assert [entry.startDate.day for entry in days] == list(range(1, 12))
+    # June 1st to 5th are out of the endpoint's reach, so come from sessions:
+    # each of the two chargers reports the same two sessions
+    assert (days[0].sessions, days[0].powerUsage) == (2, 14000)
+    assert (days[0].cost.cost, days[0].cost.currency) == (3.92, "NZD")
+    assert (days[1].sessions, days[1].cost.cost) == (2, None)
+    assert days[6].sessions == 0
+    assert (days[9].powerUsage, days[10].powerUsage) == (1000, 2000)
+    assert insights.charge_points == {}
+
+    # Every day has settled but June 2nd, when a session started that is
+    # still in progress, so only the sessions are read again
+    reopened = await asyncio.to_thread(InsightCache.open, path)
+    assert reopened.day("org-0000", 12, date(2024, 6, 1)) is not None
+    assert reopened.day("org-0000", 12, date(2024, 6, 2)) is None
+    with respx.mock:
+        sessions = _mock_sessions()
+        cached = await fetch_insights(
+            client,
+            date(2024, 6, 1),
+            date(2024, 6, 11),
+            org_id="org-0000",
+            cache=reopened,
+            today=date(2024, 7, 5),
+        )
+    assert cached == insights
+    assert sessions.call_count == 2
+    # Another tz_offset starts its days elsewhere, so is cached apart
+    assert reopened.day("org-0000", 0, date(2024, 6, 1)) is None
+
+
+async def test_only_settled_days_of_the_breakdown_are_cached(client):
+    cache = InsightCache()
+    with respx.mock:
+        window = respx.get(INSIGHTS_URL, params={"days": 7, "tz-offset": 12}).mock(
+            return_value=httpx.Response(200, json={"data": []})
+        )
+        sessions = _mock_sessions()
+        for _ in range(2):
+            insights = await fetch_insights(
+                client,
+                date(2024, 6, 1),
+                date(2024, 6, 30),
+                org_id="org-0000",
+                cache=cache,
+                by_charge_point=True,
+                today=date(2024, 6, 4),
+            )
+    assert (window.call_count, sessions.call_count) == (2, 4)
+    assert len(insights.days) == 4
+    garage = insights.charge_points["cp-0000001"]
+    assert [(entry.sessions, entry.powerUsage) for entry in garage] == [
+        (1, 7000),
+        (1, 3500),
+        (0, 0),
+        (0, 0),
+    ]
+    settled = [
+        day
+        for day in range(1, 5)
+        if cache.charge_points("org-0000", 12, date(2024, 6, day)) is not None
+    ]
+    # June 2nd has a session in progress, the 3rd is still settling and the
+    # 4th is today
+    assert settled == [1]
+    assert cache.day("org-0000", 12, date(2024, 6, 3)) is None
+
+
+async def test_insights_from_breaks_days_down_by_charge_point(signed_in, capsys):
+    with respx.mock:
+        respx.get(USER_URL).mock(return_value=httpx.Response(200, json=USER_PAYLOAD))
+        _mock_sessions()
+        await run(
+            [
+                "insights",
+                "--from",
+                "2024-06-01",
+                "--to",
+                "2024-06-02",
+                "--by-charge-point",
+                "--no-cache",
+                "--json",
+            ]
+        )
+
+    days = json.loads(capsys.readouterr().out)
+    assert [day["startDate"][:10] for day in days] == ["2024-06-01", "2024-06-02"]
+    assert days[0]["powerUsage"] == 14000
+    assert days[0]["chargePoints"]["cp-0000002"]["cost"]["cost"] == 1.96
@@ -0,0 +1,147 @@
+"""Tests for the fleet command job API: as-completed results, deadlines,
+cancellation, idempotency keys, and the outcome summary.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+import respx
+
+from evnex.jobs import CommandJobs, JobState
+
+from .test_cli_resources import CP_URL
+
+BASE = "https://client-api.evnex.io"
+
+
+def override_url(charge_point_id):
+    return f"{BASE}/charge-points/{charge_point_id}/commands/set-override"
+
+
+def delayed(seconds, response):
+    async def respond(request):
+        await asyncio.sleep(seconds)
+        return response
+
+    return respond
+
+
+async def test_results_arrive_as_they_complete(client):
+    with respx.mock:
+        respx.post(override_url("cp-slow")).mock(
+            side_effect=delayed(0.1, httpx.Response(200, json={}))
+        )
+        respx.post(override_url("cp-fast")).mock(
+            return_value=httpx.Response(200, json={})
+        )
+        async with CommandJobs(client, concurrency=5) as jobs:
+            jobs.submit("cp-slow", "set_charge_point_override", charge_now=True)
+            jobs.submit("cp-fast", "set_charge_point_override", charge_now=True)
+            order = [r.charge_point_id async for r in jobs.as_completed()]
+
+    assert order == ["cp-fast", "cp-slow"]
+    summary = jobs.summary()
+    assert sorted(summary.acked) == ["cp-fast", "cp-slow"]
+    assert summary.pending == ()
+
+
+async def test_resubmitting_the_same_key_does_not_resend(client):
+    with respx.mock:
+        route = respx.post(override_url("cp-1")).mock(
+            return_value=httpx.Response(200, json={})
+        )
+        async with CommandJobs(client) as jobs:
+            first = jobs.submit("cp-1", "set_charge_point_override", charge_now=True)
+            again = jobs.submit("cp-1", "set_charge_point_override", charge_now=True)
+            keyed = jobs.submit(
+                "cp-1",
+                "set_charge_point_override",
+                idempotency_key="retry-1",
+                charge_now=True,
+            )
+            await jobs.wait()
+
+    assert again is first
+    assert keyed is not first
+    assert route.call_count == 2
+
+
+async def test_job_deadline_marks_timed_out(client):
+    with respx.mock:
+        respx.post(override_url("cp-1")).mock(
+            side_effect=delayed(5, httpx.Response(200, json={}))
+        )
+        async with CommandJobs(client, timeout=0.05) as jobs:
+            job = jobs.submit("cp-1", "set_charge_point_override", charge_now=True)
+            result = await job.result()
+
+    assert result.state == JobState.TIMED_OUT
+    assert jobs.summary().timed_out == ("cp-1",)
+
+
+async def test_failures_are_reported_not_raised(client):
+    with respx.mock:
+        respx.post(override_url("cp-1")).mock(return_value=httpx.Response(400))
+        async with CommandJobs(client) as jobs:
+            jobs.submit("cp-1", "set_charge_point_override", charge_now=True)
+            summary = await jobs.wait()
+
+    assert summary.failed == ("cp-1",)
+    assert isinstance(jobs.jobs[0]._result.error, httpx.HTTPStatusError)
+
+
+async def test_cancelling_a_queued_job(client):
+    with respx.mock:
+        route = respx.post(override_url("cp-1")).mock(
+            side_effect=delayed(0.05, httpx.Response(200, json={}))
+        )
+        async with CommandJobs(client, concurrency=1) as jobs:
+            jobs.submit("cp-1", "set_charge_point_override", charge_now=True)
+            queued = jobs.submit("cp-2", "set_charge_point_override", charge_now=True)
+            await asyncio.sleep(0)
+            assert jobs.cancel(queued.key)
+            summary = await jobs.wait()
+
+    assert summary.acked == ("cp-1",)
+    assert summary.cancelled == ("cp-2",)
+    assert route.call_count == 1
+
+
+async def test_cancelling_a_job_before_it_starts(client):
+    with respx.mock:
+        route = respx.post(override_url("cp-1")).mock(
+            return_value=httpx.Response(200, json={})
+        )
+        async with CommandJobs(client) as jobs:
+            job = jobs.submit("cp-1", "set_charge_point_override", charge_now=True)
+            assert job.cancel()
+            summary = await asyncio.wait_for(jobs.wait(), 1)
+            result = await job.result()
+
+    assert summary.cancelled == ("cp-1",)
+    assert job.state == JobState.CANCELLED
+    assert result.state == JobState.CANCELLED
+    assert route.call_count == 0
+
+
+async def test_unknown_command_is_rejected(client):
+    jobs = CommandJobs(client)
+    with pytest.raises(ValueError, match="Unknown command"):
+        jobs.submit("cp-1", "launch_rockets")
+    with pytest.raises(ValueError):
+        jobs.submit("cp-1", "_request")
+
+
+async def test_cancelled_api_call_is_not_retried(client):
+    # tenacity catches BaseException: without CancelledError in the
+    # non-retryable set, a deadline firing mid-request would be swallowed
+    # and the read retried after backoff.
+    with respx.mock:
+        route = respx.get(CP_URL).mock(
+            side_effect=delayed(5, httpx.Response(200, json={}))
+        )
+        with pytest.raises(TimeoutError):
+            async with asyncio.timeout(0.05):
+                await client.get_org_charge_points(org_id="org-0000")
+    assert route.call_count == 0
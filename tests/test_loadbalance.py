@@ -0,0 +1,183 @@
+"""Tests for site load balancing."""
+
+import json
+import time
+
+import httpx
+import pytest
+import respx
+
+pytest.importorskip("numpy")
+
+from evnex.api import Evnex  # noqa: E402
+from evnex.loadbalance import (  # noqa: E402
+    ChargerLoad,
+    LoadBalancer,
+    Site,
+    compute_profiles,
+    site_chargers,
+)
+from evnex.profiles import ChargingProfile  # noqa: E402
+
+from .test_cli_resources import _charge_point_item, _charge_points  # noqa: E402
+from .test_reconcile import LOAD_URL, V2_DETAIL_PAYLOAD, V2_DETAIL_URL  # noqa: E402
+
+
+def _listing(*chargers):
+    """An org listing snapshot of (id, ocppStatus, powerType, location) chargers."""
+    items = []
+    for cp_id, status, power_type, location in chargers:
+        item = _charge_point_item(cp_id, cp_id, cp_id.upper())
+        item["location"]["id"] = location
+        item["connectors"][0].update(ocppStatus=status, powerType=power_type)
+        items.append(item)
+    return _charge_points({"data": {"items": items}})
+
+
+def _peak_load(site, chargers, profiles):
+    """The highest draw on any phase over the day."""
+    peak = 0
+    for start in range(0, 86400, site.slot_seconds):
+        phases = [0, 0, 0]
+        for charger in chargers:
+            limit = profiles[charger.charge_point_id].limit_at(start)
+            for phase in range(3) if charger.three_phase else [charger.phase]:
+                phases[phase] += limit
+        peak = max(peak, *phases)
+    return peak
+
+
+def test_active_chargers_at_the_site_share_its_capacity():
+    site = Site(capacity=40, location_id="loc-depot")
+    chargers = site_chargers(
+        site,
+        _listing(
+            ("cp-a", "CHARGING", "AC_1_PHASE", "loc-depot"),
+            ("cp-b", "SUSPENDED_EV", "AC_1_PHASE", "loc-depot"),
+            ("cp-c", "AVAILABLE", "AC_1_PHASE", "loc-depot"),
+            ("cp-d", "CHARGING", "AC_1_PHASE", "loc-home"),
+        ),
+    )
+    profiles = compute_profiles(site, chargers)
+
+    assert [charger.charge_point_id for charger in chargers] == ["cp-a", "cp-b", "cp-c"]
+    assert profiles == {
+        "cp-a": ChargingProfile(((0, 20),)),
+        "cp-b": ChargingProfile(((0, 20),)),
+        "cp-c": ChargingProfile(((0, 0),)),
+    }
+
+
+def test_short_capacity_admits_the_highest_weighted_chargers_at_the_minimum():
+    site = Site(capacity=15)
+    chargers = [
+        ChargerLoad("cp-a", 32, three_phase=False, active=True),
+        ChargerLoad("cp-b", 32, three_phase=False, active=True, weight=2),
+        ChargerLoad("cp-c", 32, three_phase=False, active=True),
+        ChargerLoad("cp-d", 32, three_phase=False, active=True, phase=1),
+    ]
+    profiles = compute_profiles(site, chargers)
+
+    # cp-b goes first and only one more 6 A minimum fits beside it on phase
+    # 0, while cp-d has phase 1 to itself
+    assert {cp_id: profile.limit_at(0) for cp_id, profile in profiles.items()} == {
+        "cp-a": 6,
+        "cp-b": 9,
+        "cp-c": 0,
+        "cp-d": 15,
+    }
+
+
+def test_a_rejected_three_phase_charger_leaves_other_phases_free():
+    site = Site(capacity=10)
+    chargers = [
+        ChargerLoad("cp-a", 32, three_phase=False, active=True, weight=3),
+        ChargerLoad("cp-b", 32, three_phase=True, active=True, weight=2),
+        ChargerLoad("cp-c", 32, three_phase=False, active=True, phase=1),
+    ]
+    profiles = compute_profiles(site, chargers)
+
+    # cp-b's minimum does not fit on phase 0 beside cp-a, which must not
+    # keep cp-c off phase 1
+    assert {cp_id: profile.limit_at(0) for cp_id, profile in profiles.items()} == {
+        "cp-a": 10,
+        "cp-b": 0,
+        "cp-c": 10,
+    }
+
+
+def test_capacity_through_the_day_is_never_exceeded_on_any_phase():
+    slots = 96
+    capacity = [60 + 40 * (slot % 24 < 12) for slot in range(slots)]
+    site = Site(capacity=capacity)
+    chargers = [
+        ChargerLoad(
+            f"cp-{index:03d}",
+            max_current=[16, 32][index % 2],
+            three_phase=index % 5 == 0,
+            active=index % 7 != 0,
+            phase=index % 3,
+        )
+        for index in range(30)
+    ]
+    profiles = compute_profiles(site, chargers)
+
+    assert _peak_load(site, chargers, profiles) <= max(capacity)
+    for slot in range(slots):
+        start = slot * site.slot_seconds
+        for phase in range(3):
+            draw = sum(
+                profiles[c.charge_point_id].limit_at(start)
+                for c in chargers
+                if c.three_phase or c.phase == phase
+            )
+            assert draw <= capacity[slot]
+    for charger in chargers:
+        limits = {limit for _, limit in profiles[charger.charge_point_id].periods}
+        assert limits <= {0} | set(range(6, int(charger.max_current) + 1))
+        if not charger.active:
+            assert limits == {0}
+
+
+def test_hundreds_of_chargers_compute_in_well_under_a_second():
+    site = Site(capacity=[400 + slot for slot in range(96)])
+    chargers = [
+        ChargerLoad(f"cp-{index:03d}", 32, index % 4 == 0, True, index % 3)
+        for index in range(500)
+    ]
+    started = time.perf_counter()
+    profiles = compute_profiles(site, chargers)
+
+    assert time.perf_counter() - started < 1
+    assert len(profiles) == 500
+
+
+async def test_rebalancing_writes_only_changed_profiles(resumed_auth):
+    site = Site(capacity=20)
+    charging = _listing(("cp-0000001", "CHARGING", "AC_1_PHASE", "loc-0000001"))
+    idle = _listing(("cp-0000001", "AVAILABLE", "AC_1_PHASE", "loc-0000001"))
+    balancer = LoadBalancer(Evnex(auth=resumed_auth), site)
+    with respx.mock:
+        read = respx.get(V2_DETAIL_URL).mock(
+            return_value=httpx.Response(200, json=V2_DETAIL_PAYLOAD)
+        )
+        write = respx.put(LOAD_URL).mock(
+            return_value=httpx.Response(
+                200, json={"data": V2_DETAIL_PAYLOAD["data"]["loadSchedule"]}
+            )
+        )
+        first = await balancer.rebalance(charging)
+        again = await balancer.rebalance(charging)
+        unplugged = await balancer.rebalance(idle)
+
+    assert [result.ok for result in first] == [True]
+    assert again == []
+    assert [result.ok for result in unplugged] == [True]
+    # The current profile was read once, then tracked
+    assert (read.call_count, write.call_count) == (1, 2)
+    sent = [json.loads(call.request.content) for call in write.calls]
+    assert [body["chargingProfilePeriods"] for body in sent] == [
+        [{"start": 0, "limit": 20}],
+        [{"start": 0, "limit": 0}],
+    ]
+    assert all(body["enabled"] for body in sent)
@@ -0,0 +1,159 @@
+"""Tests for sweep-line occupancy timelines and `evnex sessions occupancy`."""
+
+import json
+import random
+import time
+from datetime import UTC, datetime
+
+import httpx
+import pytest
+import respx
+
+from evnex.occupancy import (
+    Interval,
+    clipped,
+    session_intervals,
+    time_in_state,
+    timeline,
+)
+from evnex.schema.v3.charge_points import EvnexChargePointSession
+
+from .test_cli_resources import (
+    CHARGE_POINTS_PAYLOAD,
+    CP_URL,
+    SESSIONS_URL,
+    USER_PAYLOAD,
+    USER_URL,
+    run,
+)
+
+HOUR = 3600
+
+
+def _session(start, end, charging=(None, None), connector="1"):
+    def at(seconds):
+        if seconds is None:
+            return None
+        return datetime.fromtimestamp(seconds, UTC).isoformat()
+
+    return {
+        "id": f"session-{start}",
+        "type": "session",
+        "attributes": {
+            "connectorId": connector,
+            "startDate": at(start),
+            "endDate": at(end),
+            "chargingStarted": at(charging[0]),
+            "chargingStopped": at(charging[1]),
+        },
+    }
+
+
+def _sessions(*sessions):
+    return [EvnexChargePointSession.model_validate(s) for s in sessions]
+
+
+def test_the_sweep_counts_overlaps_and_treats_intervals_as_half_open():
+    intervals = session_intervals(
+        "cp-1",
+        _sessions(
+            _session(0, 4 * HOUR, (0, HOUR)),
+            _session(2 * HOUR, 6 * HOUR, (2 * HOUR, 3 * HOUR), connector="2"),
+            # Starts as the first one ends: never three at once
+            _session(4 * HOUR, None, (5 * HOUR, None)),
+        ),
+        now=8 * HOUR,
+    )
+    line = timeline(intervals)
+
+    assert line.times == (0, HOUR, 2 * HOUR, 3 * HOUR, 5 * HOUR, 6 * HOUR, 8 * HOUR)
+    assert line.occupied == (1, 1, 2, 2, 2, 1, 0)
+    assert line.charging == (1, 0, 1, 0, 1, 1, 0)
+    assert line.peak_occupied == (2, 2 * HOUR)
+    assert line.peak_charging == (1, 0)
+    assert line.at(4 * HOUR) == (2, 0)
+    assert line.at(-1) == (0, 0)
+    assert line.series(-HOUR, 8 * HOUR, 2 * HOUR) == [
+        (-HOUR, 0, 0),
+        (HOUR, 1, 0),
+        (3 * HOUR, 2, 0),
+        (5 * HOUR, 2, 1),
+        (7 * HOUR, 1, 1),
+    ]
+
+
+def test_time_in_state_is_per_charger_within_the_window():
+    intervals = [
+        Interval("cp-1", "1", 0, 4 * HOUR),
+        Interval("cp-1", "2", 2 * HOUR, 6 * HOUR),
+        Interval("cp-1", "1", HOUR, 2 * HOUR, charging=True),
+        Interval("cp-2", "1", -HOUR, HOUR),
+    ]
+    states = time_in_state(intervals, 0, 10 * HOUR)
+
+    # Both connectors of cp-1 in use at once count once
+    assert states["cp-1"].occupied == 6 * HOUR
+    assert states["cp-1"].charging == HOUR
+    assert states["cp-1"].idle == 5 * HOUR
+    assert states["cp-1"].available == 4 * HOUR
+    assert states["cp-2"].occupied == HOUR
+    assert clipped(intervals, 0, HOUR) == [
+        Interval("cp-1", "1", 0, HOUR),
+        Interval("cp-2", "1", 0, HOUR),
+    ]
+
+
+def test_a_year_of_sessions_sweeps_quickly():
+    rng = random.Random(1)
+    intervals = []
+    for index in range(100_000):
+        start = rng.uniform(0, 365 * 24 * HOUR)
+        intervals.append(
+            Interval(f"cp-{index % 100}", "1", start, start + rng.uniform(0, 8 * HOUR))
+        )
+    started = time.perf_counter()
+    line = timeline(intervals)
+    samples = line.series(0, 365 * 24 * HOUR, 60)
+
+    assert time.perf_counter() - started < 2
+    assert len(samples) == 365 * 24 * 60
+    assert line.occupied[-1] == 0
+
+
+@pytest.fixture
+def signed_in(resumed_auth, monkeypatch):
+    async def fake_signed_in(args):
+        return resumed_auth
+
+    monkeypatch.setattr("evnex.cli._resources.signed_in_auth", fake_signed_in)
+
+
+async def test_occupancy_command_reports_peaks_and_time_in_state(signed_in, capsys):
+    now = time.time()
+    sessions = {
+        "data": [
+            _session(now - 5 * HOUR, now - HOUR, (now - 5 * HOUR, now - 3 * HOUR)),
+            _session(now - 4 * HOUR, now - 2 * HOUR, connector="2"),
+        ]
+    }
+    with respx.mock:
+        respx.get(USER_URL).mock(return_value=httpx.Response(200, json=USER_PAYLOAD))
+        respx.get(CP_URL).mock(
+            return_value=httpx.Response(200, json=CHARGE_POINTS_PAYLOAD)
+        )
+        respx.get(SESSIONS_URL).mock(return_value=httpx.Response(200, json=sessions))
+        await run(["sessions", "occupancy", "--days", "1", "--step", "60", "--json"])
+        document = json.loads(capsys.readouterr().out)
+        await run(["sessions", "occupancy", "--days", "1"])
+        out = capsys.readouterr().out
+
+    (location,) = document["locations"]
+    assert (location["peakOccupied"], location["peakCharging"]) == (2, 1)
+    assert len(location["series"]) == 24
+    assert max(point["occupied"] for point in location["series"]) == 2
+    (charger,) = document["chargePoints"]
+    assert (charger["occupiedSeconds"], charger["chargingSeconds"]) == (
+        4 * HOUR,
+        2 * HOUR,
+    )
+    assert "Garage Charger  4.0 h (17%)  2.0 h (8%)  2.0 h (8%)" in out
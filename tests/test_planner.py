@@ -0,0 +1,177 @@
+"""Tests for the tariff-optimal charge schedule planner."""
+
+import copy
+import json
+import time
+
+import httpx
+import pytest
+import respx
+
+pytest.importorskip("numpy")
+
+from evnex.api import Evnex  # noqa: E402
+from evnex.planner import (  # noqa: E402
+    ChargeNeed,
+    ChargerTariff,
+    plan_schedules,
+    solve_schedules,
+)
+from evnex.profiles import ChargingProfile  # noqa: E402
+from evnex.reconcile import apply_changes  # noqa: E402
+from evnex.tariffs import TariffIndex  # noqa: E402
+
+from .test_cli_resources import DETAIL_URL, DETAIL_V3_PAYLOAD  # noqa: E402
+from .test_reconcile import LOAD_SCHEDULE, SCHEDULE_URL  # noqa: E402
+
+HOUR = 3600
+
+# Cheap from 9pm to 7am
+TIME_OF_USE = TariffIndex.build(
+    [(7 * HOUR, 0.30), (21 * HOUR, 0.15)],
+    currency="NZD",
+    timezone="Pacific/Auckland",
+)
+
+
+def test_energy_is_scheduled_in_the_cheapest_slots_first():
+    solved = solve_schedules(
+        [ChargerTariff("cp-1", TIME_OF_USE, 32)],
+        {"cp-1": ChargeNeed("cp-1", energy=30_000)},
+    )["cp-1"]
+
+    # 16 quarter hours at 32 A from 9pm, then 10 A to make up the rest,
+    # rather than at the dearer 6pm start of the window
+    assert solved.profile == ChargingProfile(
+        ((0, 32), (HOUR, 10), (HOUR + 900, 0), (21 * HOUR, 32))
+    )
+    assert solved.energy == pytest.approx(30_015)
+    assert solved.cost == pytest.approx(30.015 * 0.15)
+    assert solved.shortfall == 0
+
+
+def test_a_need_larger_than_the_window_fills_it_and_reports_the_shortfall():
+    three_phase = ChargerTariff("cp-3", TIME_OF_USE, 16, phases=3)
+    need = ChargeNeed(
+        "cp-3", energy=50_000, available_from=12 * HOUR, ready_by=14 * HOUR
+    )
+    solved = solve_schedules([three_phase], {"cp-3": need})["cp-3"]
+
+    assert solved.profile == ChargingProfile(((0, 0), (12 * HOUR, 16), (14 * HOUR, 0)))
+    assert solved.energy == 16 * 230 * 3 * 2
+    assert solved.shortfall == 50_000 - solved.energy
+    # Chargers without a need are left out
+    assert solve_schedules([three_phase], {}) == {}
+
+
+def test_a_slot_across_a_change_of_rate_is_priced_at_its_mean_rate():
+    half_past = TariffIndex.build(
+        [(7 * HOUR, 0.30), (21.5 * HOUR, 0.15)], currency="NZD"
+    )
+    need = ChargeNeed("cp-1", energy=7360, available_from=21 * HOUR, ready_by=22 * HOUR)
+    solved = solve_schedules(
+        [ChargerTariff("cp-1", half_past, 32)], {"cp-1": need}, slot_seconds=HOUR
+    )["cp-1"]
+
+    assert solved.profile == ChargingProfile(((0, 0), (21 * HOUR, 32), (22 * HOUR, 0)))
+    assert solved.cost == pytest.approx(7.36 * (0.30 + 0.15) / 2)
+
+
+def test_the_minimum_current_is_taken_off_the_slot_before():
+    # Two quarter hours at 32 A and 2 A's worth more
+    need = ChargeNeed("cp-1", energy=66 * 57.5, available_from=21 * HOUR)
+    solved = solve_schedules([ChargerTariff("cp-1", TIME_OF_USE, 32)], {"cp-1": need})[
+        "cp-1"
+    ]
+
+    # The last slot is raised to 6 A and the one before gives up 4 A, so the
+    # need is met exactly rather than overshot by 4 A's worth
+    assert solved.profile == ChargingProfile(
+        (
+            (0, 0),
+            (21 * HOUR, 32),
+            (21 * HOUR + 900, 28),
+            (21 * HOUR + 1800, 6),
+            (21 * HOUR + 2700, 0),
+        )
+    )
+    assert solved.energy == pytest.approx(66 * 57.5)
+    # A charger that cannot reach the minimum is not scheduled at all
+    weak = solve_schedules([ChargerTariff("cp-1", TIME_OF_USE, 5)], {"cp-1": need})
+    assert weak["cp-1"].profile == ChargingProfile(((0, 0),))
+
+
+def test_hundreds_of_chargers_are_solved_at_once():
+    chargers = [
+        ChargerTariff(
+            f"cp-{index}", TIME_OF_USE, [16, 32][index % 2], 1 + 2 * (index % 3 == 0)
+        )
+        for index in range(500)
+    ]
+    needs = {
+        c.charge_point_id: ChargeNeed(c.charge_point_id, 1000 * (index % 40))
+        for index, c in enumerate(chargers)
+    }
+    started = time.perf_counter()
+    solved = solve_schedules(chargers, needs, slot_seconds=300)
+
+    assert time.perf_counter() - started < 1
+    for charger in chargers:
+        schedule = solved[charger.charge_point_id]
+        need = needs[charger.charge_point_id].energy
+        assert schedule.shortfall == 0
+        assert need <= schedule.energy
+        limits = {limit for _, limit in schedule.profile.periods}
+        assert limits <= {0} | set(range(6, int(charger.max_current) + 1))
+
+
+async def test_only_schedules_that_differ_are_written(resumed_auth):
+    client = Evnex(auth=resumed_auth)
+    need = ChargeNeed("cp-0000001", energy=7360, available_from=22 * HOUR)
+    # The flat tariff makes the earliest slots in the window the cheapest
+    planned = ChargingProfile(((0, 0), (22 * HOUR, 32), (23 * HOUR, 0)))
+    already = copy.deepcopy(DETAIL_V3_PAYLOAD)
+    already["data"]["attributes"]["profiles"]["chargeSchedule"] = {
+        "enabled": True,
+        "chargingSchedulePeriods": planned.to_v3(),
+    }
+    with respx.mock:
+        detail = respx.get(DETAIL_URL).mock(
+            return_value=httpx.Response(200, json=DETAIL_V3_PAYLOAD)
+        )
+        write = respx.put(SCHEDULE_URL).mock(
+            return_value=httpx.Response(200, json={"data": LOAD_SCHEDULE})
+        )
+        plan = await plan_schedules(client, [need])
+        results = await apply_changes(client, plan)
+        detail.mock(return_value=httpx.Response(200, json=already))
+        replan = await plan_schedules(client, [need])
+
+    (change,) = plan.changes
+    assert change.desired.profile == planned
+    assert [result.ok for result in results] == [True]
+    sent = json.loads(write.calls.last.request.content)
+    assert sent["chargingProfilePeriods"] == planned.to_v2()
+    assert (replan.changes, replan.in_sync) == ((), ("cp-0000001",))
+
+
+async def test_a_charger_without_a_tariff_is_an_error_not_an_abort(resumed_auth):
+    client = Evnex(auth=resumed_auth)
+    untariffed = copy.deepcopy(DETAIL_V3_PAYLOAD)
+    untariffed["data"]["attributes"]["electricityCost"]["tariffs"] = []
+    needs = [
+        ChargeNeed("cp-0000001", energy=7360, available_from=22 * HOUR),
+        ChargeNeed("cp-0000002", energy=7360, available_from=22 * HOUR),
+    ]
+    with respx.mock:
+        respx.get(DETAIL_URL).mock(
+            return_value=httpx.Response(200, json=DETAIL_V3_PAYLOAD)
+        )
+        respx.get(DETAIL_URL.replace("cp-0000001", "cp-0000002")).mock(
+            return_value=httpx.Response(200, json=untariffed)
+        )
+        plan = await plan_schedules(client, needs)
+
+    assert [change.charge_point_id for change in plan.changes] == ["cp-0000001"]
+    assert list(plan.errors) == ["cp-0000002"]
+    assert "at least one rate" in plan.errors["cp-0000002"]
@@ -0,0 +1,129 @@
+"""Tests for the shared fleet poller and the `evnex serve` endpoints."""
+
+import asyncio
+import copy
+import json
+
+import httpx
+import respx
+
+from evnex.cli._http import start_server
+from evnex.cli._serve import fleet_handler
+from evnex.poller import FleetPoller
+
+from .test_cli_resources import (
+    CONNECTOR_SUMMARY_PAYLOAD,
+    CONNECTOR_SUMMARY_URL,
+    CP_URL,
+    TWO_CHARGE_POINTS_PAYLOAD,
+)
+
+
+def _listing(status="AVAILABLE"):
+    payload = copy.deepcopy(TWO_CHARGE_POINTS_PAYLOAD)
+    payload["data"]["items"][1]["connectors"][0]["ocppStatus"] = status
+    return payload
+
+
+def _mock(listing):
+    route = respx.get(CP_URL).mock(return_value=httpx.Response(200, json=listing))
+    respx.get(CONNECTOR_SUMMARY_URL).mock(
+        return_value=httpx.Response(200, json=CONNECTOR_SUMMARY_PAYLOAD)
+    )
+    return route
+
+
+async def test_only_changed_resources_are_published(client):
+    poller = FleetPoller(client, "org-0000")
+    with respx.mock:
+        _mock(_listing())
+        with poller.subscribe() as changes:
+            assert await poller.refresh()
+            first = {changes.get_nowait().name for _ in range(changes.qsize())}
+            _mock(_listing("UNAVAILABLE"))
+            await poller.refresh()
+            second = [changes.get_nowait() for _ in range(changes.qsize())]
+
+    assert first == {"charge-points", "connectors", "sessions", "summary"}
+    assert [state.name for state in second] == ["connectors"]
+    assert second[0].version == 2
+    assert poller.state("summary").version == 1
+    statuses = [c["ocppStatus"] for c in poller.state("connectors").data]
+    assert "UNAVAILABLE" in statuses
+
+
+async def test_failed_poll_serves_last_good_state_flagged(client):
+    poller = FleetPoller(client, "org-0000")
+    with respx.mock:
+        _mock(_listing())
+        await poller.refresh()
+        respx.get(CP_URL).mock(return_value=httpx.Response(400))
+        assert not await poller.refresh()
+
+    state = poller.state("charge-points")
+    assert len(state.data) == 2
+    assert state.error is not None
+    assert state.to_dict(poller.stale_after)["stale"] is True
+
+
+async def _get(port, path):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    return reader, writer
+
+
+async def test_endpoints_serve_from_memory(client):
+    poller = FleetPoller(client, "org-0000")
+    with respx.mock:
+        listing = _mock(_listing())
+        await poller.refresh()
+        server = await start_server(fleet_handler(poller), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            responses = []
+            for path in ("/charge-points", "/charge-points", "/", "/nope"):
+                reader, _ = await _get(port, path)
+                responses.append(await reader.read())
+
+    assert listing.call_count == 1
+    head, body = responses[0].split(b"\r\n\r\n", 1)
+    assert head.startswith(b"HTTP/1.1 200 OK")
+    document = json.loads(body)
+    assert [cp["id"] for cp in document["data"]] == ["cp-0000001", "cp-0000002"]
+    assert document["version"] == 1 and document["stale"] is False
+    index = json.loads(responses[2].split(b"\r\n\r\n", 1)[1])
+    assert set(index["resources"]) == {
+        "charge-points",
+        "connectors",
+        "sessions",
+        "summary",
+    }
+    assert responses[3].startswith(b"HTTP/1.1 404")
+
+
+async def test_event_stream_sends_state_then_changes(client):
+    poller = FleetPoller(client, "org-0000")
+    with respx.mock:
+        _mock(_listing())
+        await poller.refresh()
+        server = await start_server(fleet_handler(poller), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await _get(port, "/events")
+            await reader.readuntil(b"\r\n\r\n")
+            initial = [await reader.readuntil(b"\n\n") for _ in range(4)]
+            _mock(_listing("UNAVAILABLE"))
+            await poller.refresh()
+            change = await reader.readuntil(b"\n\n")
+            writer.close()
+
+    assert [event.split(b"\n")[0] for event in initial] == [
+        b"event: charge-points",
+        b"event: connectors",
+        b"event: sessions",
+        b"event: summary",
+    ]
+    name, data = change.decode().strip().split("\n")
+    assert name == "event: connectors"
+    assert json.loads(data.removeprefix("data: "))["version"] == 2
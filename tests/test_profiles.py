@@ -0,0 +1,67 @@
+"""Tests for charging profile compilation."""
+
+import pytest
+from pydantic import ValidationError
+
+from evnex.profiles import ChargingProfile, ProfileError
+from evnex.schema.charge_points import EvnexChargeProfileSegment
+from evnex.schema.v3.charge_points import EvnexChargeSchedulePeriod
+
+
+def test_segments_are_sorted_merged_and_clamped():
+    profile = ChargingProfile.compile(
+        [
+            {"start": 79200, "limit": 0},
+            {"start": 3600, "limit": 40},
+            {"start": 0, "limit": 32},
+            {"start": 7200, "limit": 0},
+        ],
+        max_current=32,
+    )
+
+    # 01:00 at 40 A is clamped to 32 A, which repeats 00:00; 22:00 repeats 02:00
+    assert profile.to_v2() == [{"start": 0, "limit": 32}, {"start": 7200, "limit": 0}]
+    assert profile.limit_at(3 * 3600) == 0
+    assert profile.limit_at(86400 + 60) == 32
+
+
+def test_v2_and_v3_forms_compile_to_the_same_profile():
+    v2 = ChargingProfile.compile(
+        [
+            EvnexChargeProfileSegment(start=0, limit=16),
+            {"start": 25200, "limit": 0},
+        ]
+    )
+    v3 = ChargingProfile.compile(
+        [
+            EvnexChargeSchedulePeriod(startPeriod=0.0, limit=16.0),
+            {"startPeriod": 25200.0, "limit": 0.0},
+        ]
+    )
+
+    assert v2 == v3
+    assert v2.digest == v3.digest
+    assert v3.to_v3() == [
+        {"startPeriod": 0, "limit": 16},
+        {"startPeriod": 25200, "limit": 0},
+    ]
+    assert v2.digest != ChargingProfile.compile([(0, 16)], duration=3600).digest
+
+
+@pytest.mark.parametrize(
+    "segments, duration",
+    [
+        ([(86400, 10)], 86400),
+        ([(1800, 10)], 900),
+        ([(0, -1)], 86400),
+        ([(0, 10), (0, 16)], 86400),
+    ],
+)
+def test_invalid_profiles_are_rejected(segments, duration):
+    with pytest.raises(ProfileError):
+        ChargingProfile.compile(segments, duration=duration)
+
+
+def test_malformed_segments_fail_validation():
+    with pytest.raises(ValidationError):
+        ChargingProfile.compile([{"start": 0}])
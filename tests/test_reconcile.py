@@ -0,0 +1,298 @@
+"""Tests for desired-state reconciliation and `evnex apply`."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+import respx
+
+from evnex.api import Evnex
+from evnex.profiles import ChargingProfile, ProfileError
+from evnex.reconcile import (
+    DesiredStateError,
+    Schedule,
+    Setting,
+    apply_changes,
+    load_desired_state,
+    parse_desired_state,
+    plan_changes,
+)
+
+from .test_cli_resources import (
+    BASE,
+    CHARGE_POINTS_PAYLOAD,
+    CP_URL,
+    DETAIL_URL,
+    DETAIL_V3_PAYLOAD,
+    USER_PAYLOAD,
+    USER_URL,
+    _charge_point_item,
+    _charge_points,
+    run,
+)
+
+V2_DETAIL_URL = f"{BASE}/v2/apps/charge-points/cp-0000001"
+SCHEDULE_URL = f"{V2_DETAIL_URL}/charge-schedule"
+LOAD_URL = f"{V2_DETAIL_URL}/load-management"
+
+LOAD_SCHEDULE = {
+    "duration": 86400,
+    "enabled": False,
+    "timezone": "Pacific/Auckland",
+    "units": "A",
+    "chargingProfilePeriods": [{"start": 0, "limit": 32}],
+}
+V2_DETAIL_PAYLOAD = {
+    "data": {
+        **_charge_point_item("cp-0000001", "Garage Charger", "SN0000001"),
+        "configuration": {"maxCurrent": 32, "plugAndCharge": False},
+        "electricityCost": {"currency": "NZD", "costs": [{"cost": 0.25, "start": 0}]},
+        "loadSchedule": LOAD_SCHEDULE,
+    }
+}
+
+# What the fixtures are already configured with
+IN_SYNC = {
+    "defaults": {
+        "chargeSchedule": {
+            "periods": [
+                {"start": "00:00", "limit": 32},
+                {"start": "12:00", "limit": 32},
+                {"start": "22:00", "limit": 0},
+            ]
+        },
+        "loadManagement": {"enabled": False},
+    },
+    "chargePoints": "all",
+}
+
+
+def _mock_reads():
+    respx.get(DETAIL_URL).mock(return_value=httpx.Response(200, json=DETAIL_V3_PAYLOAD))
+    respx.get(V2_DETAIL_URL).mock(
+        return_value=httpx.Response(200, json=V2_DETAIL_PAYLOAD)
+    )
+    return (
+        respx.put(SCHEDULE_URL).mock(
+            return_value=httpx.Response(200, json={"data": LOAD_SCHEDULE})
+        ),
+        respx.put(LOAD_URL).mock(
+            return_value=httpx.Response(200, json={"data": LOAD_SCHEDULE})
+        ),
+    )
+
+
+async def test_a_compiled_profile_is_sent_over_the_duration_asked_for(
+    resumed_auth,
+):
+    client = Evnex(auth=resumed_auth)
+    profile = ChargingProfile.compile([(0, 32), (3 * 86400, 16)], duration=7 * 86400)
+    with respx.mock:
+        _, load = _mock_reads()
+        await client.set_charger_load_profile("cp-0000001", profile, duration=7 * 86400)
+        await client.set_charger_load_profile(
+            "cp-0000001", profile.clamped(16), duration=14 * 86400
+        )
+        with pytest.raises(ProfileError):
+            await client.set_charger_load_profile("cp-0000001", profile)
+    sent = [json.loads(call.request.content) for call in load.calls]
+    assert [body["duration"] for body in sent] == [7 * 86400, 14 * 86400]
+    assert sent[1]["chargingProfilePeriods"] == [{"start": 0, "limit": 16}]
+
+
+def test_schedules_are_compared_as_canonical_profiles():
+    state = parse_desired_state(IN_SYNC)
+    desired = state.defaults[Setting.CHARGE_SCHEDULE]
+
+    # Sorted, in seconds, and the redundant 12:00 period merged away
+    assert desired == Schedule(True, ChargingProfile(((0, 32), (79200, 0))))
+    current = ChargingProfile.compile([(79200.0, 0.0), (0.0, 32.0)])
+    assert desired.satisfied_by(Schedule(True, current))
+    assert not desired.satisfied_by(Schedule(False, current))
+    # Without periods only the enabled state is compared
+    assert Schedule(False).satisfied_by(Schedule(False, current))
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        {"chargePoints": {"cp-1": {"chargeSchedule": {"enabled": True}}}},
+        {"chargePoints": {"cp-1": {"solar": {"enabled": False}}}},
+        {"chargePoints": "some"},
+        {"defaults": {}, "chargePoints": "all", "extra": 1},
+        {"chargePoints": {"cp-1": {"loadManagement": {"periods": [{"start": 0}]}}}},
+        {
+            "defaults": {
+                "chargeSchedule": {"periods": [{"start": "25:00", "limit": 1}]}
+            },
+            "chargePoints": "all",
+        },
+    ],
+)
+def test_malformed_documents_are_rejected(document):
+    with pytest.raises(DesiredStateError):
+        parse_desired_state(document)
+
+
+async def test_an_unchanged_fleet_costs_reads_only(resumed_auth):
+    client = Evnex(auth=resumed_auth)
+    state = parse_desired_state(IN_SYNC)
+    with respx.mock:
+        writes = _mock_reads()
+        plan = await plan_changes(
+            client, state, charge_points=_charge_points(CHARGE_POINTS_PAYLOAD)
+        )
+        await apply_changes(client, plan)
+
+    assert plan.changes == ()
+    assert plan.in_sync == ("cp-0000001",)
+    assert [route.call_count for route in writes] == [0, 0]
+
+
+async def test_load_schedules_are_compared_over_their_own_duration(resumed_auth):
+    client = Evnex(auth=resumed_auth)
+    weekly = {**LOAD_SCHEDULE, "duration": 7 * 86400, "enabled": True}
+    state = parse_desired_state(
+        {
+            "defaults": {
+                "loadManagement": {"periods": [{"start": "00:00", "limit": 32}]}
+            },
+            "chargePoints": "all",
+        }
+    )
+    with respx.mock:
+        respx.get(V2_DETAIL_URL).mock(
+            return_value=httpx.Response(
+                200,
+                json={"data": {**V2_DETAIL_PAYLOAD["data"], "loadSchedule": weekly}},
+            )
+        )
+        plan = await plan_changes(
+            client, state, charge_points=_charge_points(CHARGE_POINTS_PAYLOAD)
+        )
+    assert (plan.changes, plan.in_sync) == ((), ("cp-0000001",))
+
+    # A change is written over the duration the charger already uses
+    state = parse_desired_state(
+        {
+            "defaults": {
+                "loadManagement": {"periods": [{"start": "00:00", "limit": 16}]}
+            },
+            "chargePoints": "all",
+        }
+    )
+    with respx.mock:
+        respx.get(V2_DETAIL_URL).mock(
+            return_value=httpx.Response(
+                200,
+                json={"data": {**V2_DETAIL_PAYLOAD["data"], "loadSchedule": weekly}},
+            )
+        )
+        plan = await plan_changes(
+            client, state, charge_points=_charge_points(CHARGE_POINTS_PAYLOAD)
+        )
+    (change,) = plan.changes
+    assert change.kwargs["duration"] == 7 * 86400
+
+
+async def test_only_drifted_settings_are_written(resumed_auth):
+    client = Evnex(auth=resumed_auth)
+    state = parse_desired_state(
+        {
+            **IN_SYNC,
+            "chargePoints": {
+                "cp-0000001": {
+                    "chargeSchedule": {
+                        "periods": [
+                            {"start": 0, "limit": 16},
+                            {"start": "22:00", "limit": 0},
+                        ]
+                    }
+                }
+            },
+        }
+    )
+    with respx.mock:
+        schedule_put, load_put = _mock_reads()
+        plan = await plan_changes(
+            client, state, charge_points=_charge_points(CHARGE_POINTS_PAYLOAD)
+        )
+        results = await apply_changes(client, plan)
+
+    assert [change.setting for change in plan.changes] == [Setting.CHARGE_SCHEDULE]
+    assert plan.changes[0].describe() == (
+        "enabled: 00:00 32 A, 22:00 0 A -> enabled: 00:00 16 A, 22:00 0 A"
+    )
+    assert [result.ok for result in results] == [True]
+    assert load_put.call_count == 0
+    sent = json.loads(schedule_put.calls.last.request.content)
+    assert sent["enabled"] is True
+    assert sent["chargingProfilePeriods"] == [
+        {"limit": 16, "start": 0},
+        {"limit": 0, "start": 79200},
+    ]
+
+
+async def test_unknown_charge_points_are_rejected_before_reading(resumed_auth):
+    state = parse_desired_state(
+        {"chargePoints": {"cp-missing": {"loadManagement": {"enabled": False}}}}
+    )
+    with pytest.raises(DesiredStateError, match="cp-missing"):
+        await plan_changes(
+            Evnex(auth=resumed_auth),
+            state,
+            charge_points=_charge_points(CHARGE_POINTS_PAYLOAD),
+        )
+
+
+def test_desired_state_is_read_from_yaml(tmp_path):
+    pytest.importorskip("yaml")
+    desired = tmp_path / "fleet.yaml"
+    desired.write_text(
+        """
+defaults:
+  chargeSchedule:
+    periods:
+      - {start: "00:00", limit: 32}
+      - {start: "12:00", limit: 32}
+      - {start: "22:00", limit: 0}
+  loadManagement:
+    enabled: false
+chargePoints: all
+"""
+    )
+    assert load_desired_state(desired) == parse_desired_state(IN_SYNC)
+
+
+@pytest.fixture
+def signed_in(resumed_auth, monkeypatch):
+    async def fake_signed_in(args):
+        return resumed_auth
+
+    monkeypatch.setattr("evnex.cli._resources.signed_in_auth", fake_signed_in)
+
+
+async def test_apply_prints_the_plan_and_writes_changes(signed_in, capsys, tmp_path):
+    desired = tmp_path / "fleet.json"
+    document = {
+        **IN_SYNC,
+        "defaults": {
+            "loadManagement": {"enabled": True, "periods": [{"start": 0, "limit": 24}]}
+        },
+    }
+    await asyncio.to_thread(desired.write_text, json.dumps(document))
+    with respx.mock:
+        respx.get(USER_URL).mock(return_value=httpx.Response(200, json=USER_PAYLOAD))
+        respx.get(CP_URL).mock(
+            return_value=httpx.Response(200, json=CHARGE_POINTS_PAYLOAD)
+        )
+        schedule_put, load_put = _mock_reads()
+        await run(["apply", str(desired), "--yes"])
+
+    plan, results = capsys.readouterr().out.split(
+        "Charge point    Setting         Result"
+    )
+    assert "loadManagement  disabled: 00:00 32 A  enabled: 00:00 24 A" in plan
+    assert "loadManagement  ok" in results
+    assert (schedule_put.call_count, load_put.call_count) == (0, 1)
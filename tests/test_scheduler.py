@@ -0,0 +1,164 @@
+"""Tests for priority request scheduling: class order, caps, starvation
+protection, and commands overtaking queued background reads.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+import respx
+
+from evnex.api import Evnex
+from evnex.scheduler import (
+    Priority,
+    RequestScheduler,
+    SchedulerPolicy,
+    request_priority,
+)
+
+from .test_cli_resources import CP_URL, OVERRIDE_URL
+
+ONE_AT_A_TIME = SchedulerPolicy(max_in_flight=1, caps={})
+
+
+async def _queue(scheduler, priority, order, hold=None):
+    async with scheduler.slot(priority):
+        order.append(priority)
+        if hold is not None:
+            await hold.wait()
+
+
+async def test_higher_classes_are_admitted_first():
+    scheduler = RequestScheduler(ONE_AT_A_TIME)
+    order = []
+    release = asyncio.Event()
+    first = asyncio.create_task(_queue(scheduler, Priority.BACKGROUND, order, release))
+    await asyncio.sleep(0)
+    queued = [
+        asyncio.create_task(_queue(scheduler, priority, order))
+        for priority in (
+            Priority.BACKGROUND,
+            Priority.FOREGROUND,
+            Priority.BACKGROUND,
+            Priority.COMMAND,
+        )
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.stats.waiting[Priority.BACKGROUND] == 2
+    release.set()
+    await asyncio.gather(first, *queued)
+
+    assert order == [
+        Priority.BACKGROUND,
+        Priority.COMMAND,
+        Priority.FOREGROUND,
+        Priority.BACKGROUND,
+        Priority.BACKGROUND,
+    ]
+    assert scheduler.stats.admitted[Priority.BACKGROUND] == 3
+
+
+async def test_class_caps_keep_room_for_other_classes():
+    scheduler = RequestScheduler(
+        SchedulerPolicy(max_in_flight=3, caps={Priority.BACKGROUND: 1})
+    )
+    release = asyncio.Event()
+    order = []
+    tasks = [
+        asyncio.create_task(_queue(scheduler, priority, order, release))
+        for priority in (Priority.BACKGROUND, Priority.BACKGROUND, Priority.COMMAND)
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.stats.in_flight[Priority.BACKGROUND] == 1
+    assert scheduler.stats.in_flight[Priority.COMMAND] == 1
+    assert scheduler.stats.waiting[Priority.BACKGROUND] == 1
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+async def test_the_default_caps_keep_a_slot_for_commands():
+    scheduler = RequestScheduler()
+    release = asyncio.Event()
+    order = []
+    reads = [
+        asyncio.create_task(_queue(scheduler, priority, order, release))
+        for priority in [Priority.FOREGROUND] * 7 + [Priority.BACKGROUND] * 4
+    ]
+    await asyncio.sleep(0)
+    # Both read classes are at their caps, with more of each queued
+    assert scheduler.stats.waiting[Priority.FOREGROUND] == 1
+    assert scheduler.stats.waiting[Priority.BACKGROUND] == 1
+
+    command = asyncio.create_task(_queue(scheduler, Priority.COMMAND, order))
+    await asyncio.wait_for(command, 1)
+    assert order[-1] is Priority.COMMAND
+    release.set()
+    await asyncio.gather(*reads)
+
+
+async def test_long_waits_are_served_ahead_of_their_class():
+    scheduler = RequestScheduler(
+        SchedulerPolicy(max_in_flight=1, caps={}, max_wait=0.01)
+    )
+    order = []
+    release = asyncio.Event()
+    holder = asyncio.create_task(_queue(scheduler, Priority.FOREGROUND, order, release))
+    await asyncio.sleep(0)
+    starving = asyncio.create_task(_queue(scheduler, Priority.BACKGROUND, order))
+    await asyncio.sleep(0.02)
+    fresh = asyncio.create_task(_queue(scheduler, Priority.COMMAND, order))
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(holder, starving, fresh)
+
+    assert order[1:] == [Priority.BACKGROUND, Priority.COMMAND]
+    assert scheduler.stats.promoted == 1
+
+
+async def test_cancelled_waiters_do_not_leak_slots():
+    scheduler = RequestScheduler(ONE_AT_A_TIME)
+    release = asyncio.Event()
+    holder = asyncio.create_task(_queue(scheduler, Priority.FOREGROUND, [], release))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(_queue(scheduler, Priority.BACKGROUND, []))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    release.set()
+    await holder
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert scheduler.stats.in_flight == dict.fromkeys(Priority, 0)
+    assert sum(scheduler.stats.waiting.values()) == 0
+
+
+async def test_commands_overtake_queued_background_reads(resumed_auth):
+    client = Evnex(
+        auth=resumed_auth,
+        scheduler=RequestScheduler(SchedulerPolicy(max_in_flight=1, caps={})),
+    )
+    sent = []
+
+    async def slow_read(request):
+        sent.append("read")
+        await asyncio.sleep(0.02)
+        return httpx.Response(200, json={"data": {"items": []}})
+
+    def command(request):
+        sent.append("command")
+        return httpx.Response(200, json={})
+
+    with respx.mock:
+        respx.get(CP_URL).mock(side_effect=slow_read)
+        respx.post(OVERRIDE_URL).mock(side_effect=command)
+        with request_priority(Priority.BACKGROUND):
+            reads = [
+                asyncio.create_task(client.get_org_charge_points("org-0000"))
+                for _ in range(4)
+            ]
+        await asyncio.sleep(0.005)
+        await client.set_charge_point_override("cp-0000001", charge_now=True)
+        await asyncio.gather(*reads)
+
+    # Only the read already in flight went before the command
+    assert sent == ["read", "command", "read", "read", "read"]
@@ -0,0 +1,223 @@
+"""Tests for streaming session export and `evnex sessions export`."""
+
+import asyncio
+import csv
+import io
+import json
+import sys
+
+import httpx
+import pytest
+import respx
+from tenacity import wait_none
+
+from evnex.api import Evnex
+from evnex.session_export import COLUMNS, SessionFetchError, stream_sessions
+
+from .test_cli_resources import (
+    BASE,
+    CP_URL,
+    SESSIONS_PAYLOAD,
+    TWO_CHARGE_POINTS_PAYLOAD,
+    USER_PAYLOAD,
+    USER_URL,
+    _charge_point_item,
+    _charge_points,
+    run,
+)
+
+
+@pytest.fixture
+def signed_in(resumed_auth, monkeypatch):
+    async def fake_signed_in(args):
+        return resumed_auth
+
+    monkeypatch.setattr("evnex.cli._resources.signed_in_auth", fake_signed_in)
+
+
+def _mock_fleet():
+    respx.get(USER_URL).mock(return_value=httpx.Response(200, json=USER_PAYLOAD))
+    respx.get(CP_URL).mock(
+        return_value=httpx.Response(200, json=TWO_CHARGE_POINTS_PAYLOAD)
+    )
+    respx.get(url__regex=rf"{BASE}/charge-points/cp-\d+/sessions").mock(
+        return_value=httpx.Response(200, json=SESSIONS_PAYLOAD)
+    )
+
+
+async def test_csv_export_writes_a_flat_row_per_session(signed_in, tmp_path, capsys):
+    output = tmp_path / "sessions.csv"
+    with respx.mock:
+        _mock_fleet()
+        await run(["sessions", "export", "--all", "--output", str(output)])
+
+    text = await asyncio.to_thread(output.read_text)
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert tuple(rows[0]) == COLUMNS
+    assert len(rows) == 4
+    assert {row["chargePointName"] for row in rows} == {
+        "Garage Charger",
+        "Driveway Charger",
+    }
+    finished = next(row for row in rows if row["sessionId"] == "session-0000002")
+    assert finished["endDate"] == "2024-06-01T09:00:00+00:00"
+    assert (finished["energyWh"], finished["cost"], finished["currency"]) == (
+        "7000.0",
+        "1.96",
+        "NZD",
+    )
+    in_progress = next(row for row in rows if row["sessionId"] == "session-0000001")
+    assert (in_progress["endDate"], in_progress["cost"]) == ("", "")
+    assert "Exported 4 session(s) from 2 charge point(s)" in capsys.readouterr().err
+
+
+async def test_ndjson_export_streams_sessions_since_a_date(signed_in, capsys):
+    with respx.mock:
+        _mock_fleet()
+        await run(
+            [
+                "sessions",
+                "export",
+                "--charge-point",
+                "Garage",
+                "--format",
+                "ndjson",
+                "--since",
+                "2024-06-02",
+            ]
+        )
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["sessionId"] for line in lines] == ["session-0000001"]
+
+
+async def test_parquet_export_writes_a_row_per_session(signed_in, tmp_path, capsys):
+    pq = pytest.importorskip("pyarrow.parquet")
+    output = tmp_path / "sessions.parquet"
+    with respx.mock:
+        _mock_fleet()
+        await run(
+            ["sessions", "export", "--all", "--format", "parquet", "-o", str(output)]
+        )
+
+    table = await asyncio.to_thread(pq.read_table, output)
+    assert tuple(table.column_names) == COLUMNS
+    rows = table.to_pylist()
+    assert len(rows) == 4
+    finished = next(row for row in rows if row["sessionId"] == "session-0000002")
+    assert (finished["energyWh"], finished["cost"]) == (7000.0, 1.96)
+    assert "Exported 4 session(s) from 2 charge point(s)" in capsys.readouterr().err
+
+
+async def test_parquet_export_needs_an_output_file_and_pyarrow(
+    signed_in, tmp_path, monkeypatch
+):
+    with pytest.raises(SystemExit) as exited:
+        await run(["sessions", "export", "--format", "parquet"])
+    assert exited.value.code == 2
+    # As if pyarrow were not installed
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with respx.mock, pytest.raises(SystemExit) as exited:
+        _mock_fleet()
+        await run(
+            [
+                "sessions",
+                "export",
+                "--all",
+                "--format",
+                "parquet",
+                "-o",
+                str(tmp_path / "s.parquet"),
+            ]
+        )
+    assert exited.value.code == 2
+
+
+async def test_fetches_are_bounded_and_failures_skipped(resumed_auth, monkeypatch):
+    monkeypatch.setattr(Evnex.get_charge_point_sessions.retry, "wait", wait_none())
+    client = Evnex(auth=resumed_auth)
+    fleet = _charge_points(
+        {
+            "data": {
+                "items": [
+                    _charge_point_item(f"cp-{i:07}", f"Charger {i}", f"SN{i:07}")
+                    for i in range(20)
+                ]
+            }
+        }
+    )
+    in_flight = peak = 0
+
+    async def sessions(request, route):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        if request.url.path.endswith("cp-0000003/sessions"):
+            return httpx.Response(404, json={"message": "Not found"})
+        return httpx.Response(200, json=SESSIONS_PAYLOAD)
+
+    with respx.mock:
+        respx.get(url__regex=rf"{BASE}/charge-points/cp-\d+/sessions").mock(
+            side_effect=sessions
+        )
+        failed = {}
+        exported = [
+            charge_point.id
+            async for charge_point, _ in stream_sessions(
+                client, fleet, concurrency=3, failed=failed
+            )
+        ]
+        # Without somewhere to record them, failures are raised at the end
+        with pytest.raises(SessionFetchError, match="cp-0000003") as raised:
+            async for _ in stream_sessions(client, fleet, concurrency=3):
+                pass
+
+    assert peak <= 3
+    assert sorted(exported) == sorted(cp.id for cp in fleet if cp.id != "cp-0000003")
+    assert list(failed) == list(raised.value.failed) == ["cp-0000003"]
+
+
+async def test_stopping_early_leaves_no_fetches_running(resumed_auth):
+    client = Evnex(auth=resumed_auth)
+    fleet = _charge_points(
+        {
+            "data": {
+                "items": [
+                    _charge_point_item(f"cp-{i:07}", f"Charger {i}", f"SN{i:07}")
+                    for i in range(20)
+                ]
+            }
+        }
+    )
+    with respx.mock:
+        respx.get(url__regex=rf"{BASE}/charge-points/cp-\d+/sessions").mock(
+            return_value=httpx.Response(200, json=SESSIONS_PAYLOAD)
+        )
+        stream = stream_sessions(client, fleet, concurrency=3)
+        await anext(stream)
+        await stream.aclose()
+
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+async def test_export_covers_the_fleet_and_fails_on_a_missing_charger(
+    signed_in, monkeypatch, capsys
+):
+    monkeypatch.setattr(Evnex.get_charge_point_sessions.retry, "wait", wait_none())
+    with respx.mock:
+        respx.get(f"{BASE}/charge-points/cp-0000002/sessions").mock(
+            return_value=httpx.Response(404, json={"message": "Not found"})
+        )
+        _mock_fleet()
+        with pytest.raises(SystemExit) as exited:
+            await run(["sessions", "export", "--format", "ndjson"])
+        assert exited.value.code == 1
+        captured = capsys.readouterr()
+        assert len(captured.out.splitlines()) == 2
+        assert "Exported 2 session(s) from 1 charge point(s)" in captured.err
+        assert "Failed Driveway Charger (cp-0000002)" in captured.err
+
+        await run(["sessions", "export", "--format", "ndjson", "--skip-errors"])
+        assert "Failed Driveway Charger" in capsys.readouterr().err
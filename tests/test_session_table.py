@@ -0,0 +1,180 @@
+"""Tests for the columnar session table."""
+
+import copy
+import gc
+import tracemalloc
+from datetime import UTC, datetime
+
+import httpx
+import pytest
+import respx
+
+np = pytest.importorskip("numpy")
+
+from evnex.analytics import GroupBy, SessionColumns, rollup  # noqa: E402
+from evnex.api import Evnex  # noqa: E402
+from evnex.schema.v3.charge_points import EvnexChargePointSession  # noqa: E402
+from evnex.session_table import SessionTable, fetch_session_table  # noqa: E402
+
+from .test_cli_resources import (  # noqa: E402
+    BASE,
+    SESSIONS_PAYLOAD,
+    TWO_CHARGE_POINTS_PAYLOAD,
+    _charge_points,
+)
+
+FINISHED = {
+    "id": "session-0000003",
+    "type": "session",
+    "attributes": {
+        "connectorId": "2",
+        "evseId": "2",
+        "sessionStatus": "Completed",
+        "authorizationMethod": "RFID",
+        "createdDate": "2024-06-03T08:00:00Z",
+        "startDate": "2024-06-03T08:00:00Z",
+        "chargingStarted": "2024-06-03T08:01:00Z",
+        "chargingStopped": "2024-06-03T09:30:00Z",
+        "endDate": "2024-06-03T10:00:00Z",
+        "updatedDate": "2024-06-03T10:00:00Z",
+        "totalPowerUsage": 10500,
+        "totalCarbonUsage": 1.2,
+        "totalChargingTime": 5340,
+        "totalDuration": 7200,
+        "totalEnergyUsage": {"total": 10500, "distributionByTariff": [1, 2]},
+        "totalCost": {"currency": "NZD", "amount": 2.94, "distribution": None},
+        "transaction": {
+            "meterStart": 1000,
+            "meterStop": 11500,
+            "startDate": "2024-06-03T08:00:00Z",
+            "endDate": "2024-06-03T10:00:00Z",
+            "reason": "EVDisconnected",
+        },
+        "electricityCost": {
+            "currency": "NZD",
+            "tariffType": "Flat",
+            "tariffs": [{"start": 0, "rate": 0.28, "type": "Flat"}],
+        },
+    },
+    "relationships": {
+        "location": {"data": {"id": "loc-1", "type": "location"}},
+        "organisation": {"data": {"id": "org-1", "type": "organisation"}},
+    },
+}
+
+RAW = {
+    "cp-0000001": SESSIONS_PAYLOAD["data"],
+    "cp-0000002": [FINISHED],
+}
+
+
+def test_rows_read_back_what_the_api_sent():
+    table = SessionTable.from_json(RAW)
+
+    assert len(table) == 3
+    assert table.charge_point.labels == ("cp-0000001", "cp-0000002")
+    assert table.status.values() == ["InProgress", "Completed", "Completed"]
+    assert table.currency.values() == [None, "NZD", "NZD"]
+    row = table[-1]
+    assert (row.id, row.charge_point, row.location) == (
+        "session-0000003",
+        "cp-0000002",
+        "loc-1",
+    )
+    assert row.start == datetime(2024, 6, 3, 8, tzinfo=UTC)
+    assert (row.energy, row.cost, row.stop_reason) == (10500.0, 2.94, "EVDisconnected")
+    assert table[0].end is None and table[0].cost is None
+    with pytest.raises(IndexError):
+        table[3]
+
+    completed = table.take(table.status.codes == table.status.code_of("Completed"))
+    assert [row.id for row in completed] == ["session-0000002", "session-0000003"]
+    assert completed.energy.tolist() == [7000.0, 10500.0]
+
+
+def test_rows_convert_back_to_models():
+    table = SessionTable.from_json(RAW)
+    original = EvnexChargePointSession.model_validate(FINISHED)
+    restored = table.to_session(2)
+
+    dropped = {"electricityCost": True, "totalEnergyUsage": {"distributionByTariff"}}
+    assert restored.attributes.model_dump(
+        exclude=dropped
+    ) == original.attributes.model_dump(exclude=dropped)
+    assert restored.relationships.location.data.id == "loc-1"
+    assert restored.relationships.chargePoint.data.id == "cp-0000002"
+    # Validated models give the same table as their JSON
+    validated = {
+        cp_id: [EvnexChargePointSession.model_validate(s) for s in sessions]
+        for cp_id, sessions in RAW.items()
+    }
+    from_models = SessionTable.from_sessions(validated)
+    assert from_models.ids.tolist() == table.ids.tolist()
+    np.testing.assert_array_equal(from_models.start, table.start)
+    np.testing.assert_array_equal(from_models.cost, table.cost)
+    assert [
+        s.model_dump(exclude={"relationships"})
+        for s in table.take([0, 1]).to_sessions()
+    ] == [s.model_dump(exclude={"relationships"}) for s in validated["cp-0000001"]]
+
+
+def test_a_table_takes_a_fraction_of_the_memory_of_models():
+    raw = {}
+    for cp in range(20):
+        sessions = []
+        for index in range(250):
+            session = copy.deepcopy(FINISHED)
+            session["id"] = f"session-{cp:03}-{index:05}"
+            sessions.append(session)
+        raw[f"cp-{cp:07}"] = sessions
+
+    def traced(build):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            built = build()
+            return built, tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+    models, model_bytes = traced(
+        lambda: [
+            EvnexChargePointSession.model_validate(s)
+            for sessions in raw.values()
+            for s in sessions
+        ]
+    )
+    table, table_bytes = traced(lambda: SessionTable.from_json(raw))
+
+    assert len(table) == len(models) == 5000
+    assert table_bytes * 10 < model_bytes
+    assert table.nbytes < table_bytes
+
+
+async def test_a_fetched_table_rolls_up_like_the_models(resumed_auth):
+    client = Evnex(auth=resumed_auth)
+    charge_points = _charge_points(TWO_CHARGE_POINTS_PAYLOAD)
+    with respx.mock:
+        respx.get(f"{BASE}/charge-points/cp-0000001/sessions").mock(
+            return_value=httpx.Response(200, json=SESSIONS_PAYLOAD)
+        )
+        respx.get(f"{BASE}/charge-points/cp-0000002/sessions").mock(
+            return_value=httpx.Response(200, json={"data": [FINISHED]})
+        )
+        table = await fetch_session_table(client, charge_points)
+
+    locations = {"cp-0000001": "loc-home", "cp-0000002": "loc-1"}
+    columns = SessionColumns.from_table(table, locations)
+    expected = SessionColumns.from_sessions(
+        {
+            cp_id: table.take(table.charge_point.codes == code).to_sessions()
+            for code, cp_id in enumerate(table.charge_point.labels)
+        },
+        locations,
+    )
+    now = datetime(2024, 6, 4, tzinfo=UTC).timestamp()
+    for by in (GroupBy.CHARGE_POINT, GroupBy.LOCATION, GroupBy.CONNECTOR):
+        assert (
+            rollup(columns, by, now=now).rows() == rollup(expected, by, now=now).rows()
+        )
+    assert columns.currencies == {"NZD"}
@@ -0,0 +1,162 @@
+"""Tests for fleet snapshots, poller restore and `--offline` reads."""
+
+import asyncio
+import json
+from datetime import UTC, datetime
+
+import httpx
+import pytest
+import respx
+
+np = pytest.importorskip("numpy")
+
+from evnex.poller import FleetPoller  # noqa: E402
+from evnex.schema.v3.locations import EvnexLocation  # noqa: E402
+from evnex.session_table import SessionTable  # noqa: E402
+from evnex.snapshot import SnapshotError, open_snapshot, write_snapshot  # noqa: E402
+
+from .test_cli_resources import (  # noqa: E402
+    BASE,
+    CP_URL,
+    LOCATIONS_PAYLOAD,
+    LOCATIONS_URL,
+    SESSIONS_PAYLOAD,
+    TWO_CHARGE_POINTS_PAYLOAD,
+    USER_PAYLOAD,
+    USER_URL,
+    _charge_points,
+    run,
+)
+from .test_poller import _listing, _mock  # noqa: E402
+from .test_session_table import RAW  # noqa: E402
+
+WRITTEN_AT = datetime(2024, 6, 4, 12, tzinfo=UTC)
+
+
+@pytest.fixture
+def signed_in(resumed_auth, monkeypatch):
+    async def fake_signed_in(args):
+        return resumed_auth
+
+    monkeypatch.setattr("evnex.cli._resources.signed_in_auth", fake_signed_in)
+
+
+def test_a_snapshot_round_trips_every_section(tmp_path):
+    path = tmp_path / "fleet.evnx"
+    charge_points = _charge_points(TWO_CHARGE_POINTS_PAYLOAD)
+    locations = [EvnexLocation.model_validate(i) for i in LOCATIONS_PAYLOAD["data"]]
+    table = SessionTable.from_json(RAW)
+    write_snapshot(
+        path,
+        charge_points=charge_points,
+        locations=locations,
+        sessions=table,
+        resources={"summary": {"AVAILABLE": 2}},
+        org_id="org-0000",
+        written_at=WRITTEN_AT,
+    )
+
+    snapshot = open_snapshot(path)
+    assert (snapshot.written_at, snapshot.org_id) == (WRITTEN_AT, "org-0000")
+    assert snapshot.charge_points == charge_points
+    assert snapshot.locations == locations
+    assert snapshot.resources == {"summary": {"AVAILABLE": 2}}
+    sessions = snapshot.sessions
+    assert sessions.ids.tolist() == table.ids.tolist()
+    assert sessions.status.values() == table.status.values()
+    np.testing.assert_array_equal(sessions.cost, table.cost)
+    # Columns view the mapped file rather than copying it
+    assert not sessions.energy.flags.owndata
+    assert not sessions.energy.flags.writeable
+    assert sessions.to_session(2) == table.to_session(2)
+
+    # Replacing the file leaves the open snapshot reading the old one
+    write_snapshot(path, charge_points=charge_points[:1])
+    assert len(snapshot.sessions) == 3
+    replaced = open_snapshot(path)
+    assert len(replaced.charge_points) == 1
+    assert replaced.sessions is replaced.locations is None
+    assert [p.name for p in tmp_path.iterdir()] == ["fleet.evnx"]
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "fleet.evnx"
+    for content in (b"", b"not a snapshot at all"):
+        path.write_bytes(content)
+        with pytest.raises(SnapshotError, match="not an evnex snapshot"):
+            open_snapshot(path)
+
+
+async def test_a_restarted_poller_serves_its_snapshot_until_polled(client, tmp_path):
+    path = tmp_path / "fleet.evnx"
+    poller = FleetPoller(client, "org-0000", snapshot=path)
+    with respx.mock:
+        _mock(_listing())
+        await poller.refresh()
+    served = poller.state("connectors").data
+
+    restarted = FleetPoller(client, "org-0000", snapshot=path)
+    assert await restarted.restore()
+    state = restarted.state("connectors")
+    assert state.data == served
+    assert state.version == 1
+    assert state.to_dict(restarted.stale_after)["stale"] is True
+
+    with respx.mock:
+        _mock(_listing("UNAVAILABLE"))
+        await restarted.refresh()
+    assert restarted.state("connectors").error is None
+    saved = await asyncio.to_thread(open_snapshot, path)
+    statuses = [c["ocppStatus"] for c in saved.resources["connectors"]]
+    assert "UNAVAILABLE" in statuses
+
+
+async def test_listings_read_offline_from_a_saved_snapshot(signed_in, tmp_path, capsys):
+    path = str(tmp_path / "fleet.evnx")
+    with respx.mock:
+        respx.get(USER_URL).mock(return_value=httpx.Response(200, json=USER_PAYLOAD))
+        respx.get(CP_URL).mock(
+            return_value=httpx.Response(200, json=TWO_CHARGE_POINTS_PAYLOAD)
+        )
+        respx.get(LOCATIONS_URL).mock(
+            return_value=httpx.Response(200, json=LOCATIONS_PAYLOAD)
+        )
+        respx.get(url__regex=rf"{BASE}/charge-points/cp-\d+/sessions").mock(
+            return_value=httpx.Response(200, json=SESSIONS_PAYLOAD)
+        )
+        await run(["snapshot", "save", "--sessions", "--snapshot", path])
+    assert "2 charge point(s)" in capsys.readouterr().out
+
+    # Any API call would fail: respx rejects unmocked requests
+    with respx.mock:
+        await run(["charge-points", "list", "--offline", "--snapshot", path])
+        assert "Driveway Charger" in capsys.readouterr().out
+        await run(
+            [
+                "sessions",
+                "list",
+                "--offline",
+                "--snapshot",
+                path,
+                "--charge-point",
+                "Garage",
+                "--jsonl",
+            ]
+        )
+        lines = capsys.readouterr().out.splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [
+            "session-0000001",
+            "session-0000002",
+        ]
+        await run(["locations", "list", "--offline", "--snapshot", path, "--json"])
+        assert len(json.loads(capsys.readouterr().out)) == len(
+            LOCATIONS_PAYLOAD["data"]
+        )
+
+
+async def test_offline_reads_need_a_snapshot(tmp_path, capsys):
+    missing = str(tmp_path / "missing.evnx")
+    with pytest.raises(SystemExit) as exit:
+        await run(["charge-points", "list", "--offline", "--snapshot", missing])
+    assert exit.value.code == 2
+    assert "evnex snapshot save" in capsys.readouterr().err
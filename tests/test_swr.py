@@ -0,0 +1,148 @@
+"""Tests for stale-while-revalidate reads."""
+
+import asyncio
+
+import httpx
+import pytest
+import respx
+
+from evnex.api import Evnex
+from evnex.swr import SWRPolicy, SWRReader
+
+from .test_cli_resources import (
+    CHARGE_POINTS_PAYLOAD,
+    CP_URL,
+    DETAIL_URL,
+    DETAIL_V3_PAYLOAD,
+    LOCATIONS_PAYLOAD,
+    LOCATIONS_URL,
+    TWO_CHARGE_POINTS_PAYLOAD,
+)
+
+
+async def _settle(reader):
+    await asyncio.gather(*reader._refreshes.values(), return_exceptions=True)
+
+
+async def test_fresh_reads_are_served_from_memory(resumed_auth):
+    reader = SWRReader(Evnex(auth=resumed_auth), SWRPolicy(soft_ttl=60))
+    with respx.mock:
+        route = respx.get(LOCATIONS_URL).mock(
+            return_value=httpx.Response(200, json=LOCATIONS_PAYLOAD)
+        )
+        first = await reader.get_org_locations("org-0000")
+        second = await reader.get_org_locations("org-0000")
+
+    assert route.call_count == 1
+    assert second.value == first.value
+    assert not second.stale and second.error is None
+
+
+async def test_stale_reads_return_at_once_and_refresh_once(resumed_auth):
+    reader = SWRReader(Evnex(auth=resumed_auth), SWRPolicy(soft_ttl=0, max_age=60))
+    with respx.mock:
+        route = respx.get(CP_URL).mock(
+            side_effect=[
+                httpx.Response(200, json=CHARGE_POINTS_PAYLOAD),
+                httpx.Response(200, json=TWO_CHARGE_POINTS_PAYLOAD),
+            ]
+        )
+        await reader.get_org_charge_points("org-0000")
+        stale = [await reader.get_org_charge_points("org-0000") for _ in range(3)]
+        await _settle(reader)
+        refreshed = await reader.get_org_charge_points("org-0000")
+
+    assert route.call_count == 2
+    assert all(read.stale and len(read.value) == 1 for read in stale)
+    assert len(refreshed.value) == 2
+
+
+async def test_failed_refreshes_keep_serving_the_last_good_result(resumed_auth):
+    reader = SWRReader(Evnex(auth=resumed_auth), SWRPolicy(soft_ttl=0, max_age=60))
+    with respx.mock:
+        respx.get(CP_URL).mock(
+            side_effect=[
+                httpx.Response(200, json=CHARGE_POINTS_PAYLOAD),
+                httpx.Response(503),
+            ]
+        )
+        await reader.get_org_charge_points("org-0000")
+        await reader.get_org_charge_points("org-0000")
+        await _settle(reader)
+        read = await reader.get_org_charge_points("org-0000")
+
+    assert read.stale
+    assert read.value[0].id == CHARGE_POINTS_PAYLOAD["data"]["items"][0]["id"]
+    assert "503" in read.error
+
+
+async def test_refreshes_under_way_are_discarded_by_invalidate(resumed_auth):
+    reader = SWRReader(Evnex(auth=resumed_auth), SWRPolicy(soft_ttl=0, max_age=60))
+    requested = asyncio.Event()
+    release = asyncio.Event()
+
+    async def before_the_change(request):
+        requested.set()
+        await release.wait()
+        return httpx.Response(200, json=CHARGE_POINTS_PAYLOAD)
+
+    with respx.mock:
+        route = respx.get(CP_URL).mock(
+            side_effect=[
+                httpx.Response(200, json=CHARGE_POINTS_PAYLOAD),
+                before_the_change,
+                httpx.Response(200, json=TWO_CHARGE_POINTS_PAYLOAD),
+            ]
+        )
+        await reader.get_org_charge_points("org-0000")
+        # Stale, so a background refresh starts and reads the old listing
+        await reader.get_org_charge_points("org-0000")
+        await requested.wait()
+        reader.invalidate()
+        release.set()
+        await _settle(reader)
+        read = await reader.get_org_charge_points("org-0000")
+
+    assert route.call_count == 3
+    assert len(read.value) == 2
+
+
+async def test_slow_refreshes_time_out_and_expired_results_are_refetched(
+    resumed_auth,
+):
+    reader = SWRReader(
+        Evnex(auth=resumed_auth), SWRPolicy(soft_ttl=0, max_age=0.05, timeout=0.01)
+    )
+    calls = []
+
+    async def detail(request):
+        calls.append(request)
+        if len(calls) == 2:
+            await asyncio.sleep(1)
+        return httpx.Response(200, json=DETAIL_V3_PAYLOAD)
+
+    with respx.mock:
+        respx.get(DETAIL_URL).mock(side_effect=detail)
+        await reader.get_charge_point_detail_v3("cp-0000001")
+        await reader.get_charge_point_detail_v3("cp-0000001")
+        await _settle(reader)
+        timed_out = await reader.get_charge_point_detail_v3("cp-0000001")
+        await asyncio.sleep(0.06)
+        refetched = await reader.get_charge_point_detail_v3("cp-0000001")
+
+    assert timed_out.error == "TimeoutError"
+    assert refetched.error is None and refetched.age < 0.05
+
+
+async def test_expired_results_are_not_served_when_the_api_fails(resumed_auth):
+    reader = SWRReader(Evnex(auth=resumed_auth), SWRPolicy(soft_ttl=0, max_age=0))
+    with respx.mock:
+        respx.get(CP_URL).mock(
+            side_effect=[
+                httpx.Response(200, json=CHARGE_POINTS_PAYLOAD),
+                httpx.Response(403),
+            ]
+        )
+        await reader.get_org_charge_points("org-0000")
+        with pytest.raises(httpx.HTTPStatusError):
+            await reader.get_org_charge_points("org-0000")
@@ -0,0 +1,97 @@
+"""Tests for the blocking EvnexSync facade and its background event loop."""
+
+import threading
+
+import httpx
+import pytest
+import respx
+
+from evnex.fleet import get_fleet_status
+from evnex.sync import EvnexSync
+
+from .test_cli_resources import (
+    BASE,
+    CHARGE_POINTS_PAYLOAD,
+    CONNECTOR_SUMMARY_PAYLOAD,
+    CONNECTOR_SUMMARY_URL,
+    CP_URL,
+    DETAIL_V3_PAYLOAD,
+    USER_PAYLOAD,
+    USER_URL,
+)
+
+
+@pytest.fixture
+def evnex(resumed_auth):
+    with EvnexSync(auth=resumed_auth) as facade:
+        yield facade
+
+
+def test_client_methods_block_until_done(evnex):
+    with respx.mock:
+        respx.get(USER_URL).mock(return_value=httpx.Response(200, json=USER_PAYLOAD))
+        respx.get(CP_URL).mock(
+            return_value=httpx.Response(200, json=CHARGE_POINTS_PAYLOAD)
+        )
+        user = evnex.get_user_detail()
+        charge_points = evnex.get_org_charge_points()
+
+    assert user.organisations[0].id == evnex.org_id == "org-0000"
+    assert [cp.id for cp in charge_points] == ["cp-0000001"]
+
+
+def test_concurrent_callers_share_one_pool(evnex):
+    clients = set()
+
+    def fetch():
+        evnex.get_org_charge_points(org_id="org-0000")
+        clients.add(id(evnex.client.httpx_client))
+
+    with respx.mock:
+        route = respx.get(CP_URL).mock(
+            return_value=httpx.Response(200, json=CHARGE_POINTS_PAYLOAD)
+        )
+        threads = [threading.Thread(target=fetch) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert route.call_count == 8
+    assert len(clients) == 1
+
+
+def test_map_and_call_batch_on_the_loop(evnex):
+    with respx.mock:
+        detail = respx.get(url__regex=rf"{BASE}/charge-points/cp-\d+$").mock(
+            return_value=httpx.Response(200, json=DETAIL_V3_PAYLOAD)
+        )
+        respx.get(CP_URL).mock(
+            return_value=httpx.Response(200, json=CHARGE_POINTS_PAYLOAD)
+        )
+        respx.get(CONNECTOR_SUMMARY_URL).mock(
+            return_value=httpx.Response(200, json=CONNECTOR_SUMMARY_PAYLOAD)
+        )
+        details = evnex.map("get_charge_point_detail_v3", ["cp-1", "cp-2", "cp-3"])
+        fleet = evnex.call(lambda client: get_fleet_status(client, "org-0000"))
+
+    assert detail.call_count == 3
+    assert [d.data.attributes.name for d in details] == ["Garage Charger"] * 3
+    assert fleet.summary.available == 3
+
+
+def test_errors_propagate_to_the_caller(evnex):
+    with respx.mock:
+        respx.get(CP_URL).mock(return_value=httpx.Response(400))
+        with pytest.raises(httpx.HTTPStatusError):
+            evnex.get_org_charge_points(org_id="org-0000")
+
+
+def test_unknown_and_closed(resumed_auth):
+    evnex = EvnexSync(auth=resumed_auth)
+    with pytest.raises(AttributeError):
+        evnex.map("_request", [])
+    evnex.close()
+    evnex.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        evnex.get_user_detail()
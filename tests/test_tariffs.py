@@ -0,0 +1,129 @@
+"""Tests for tariff-indexed energy pricing."""
+
+import random
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from evnex.profiles import ChargingProfile
+from evnex.schema.charge_points import EvnexElectricityCost as EvnexElectricityCostV2
+from evnex.schema.v3.charge_points import EvnexChargePointSession
+from evnex.schema.v3.cost import EvnexElectricityCost
+from evnex.tariffs import TariffError, TariffIndex
+
+AUCKLAND = ZoneInfo("Pacific/Auckland")
+HOUR = 3600
+
+# Cheap overnight, dear from 7am to 9pm
+TIME_OF_USE = EvnexElectricityCost.model_validate(
+    {
+        "currency": "NZD",
+        "tariffType": "TimeOfUse",
+        "tariffs": [
+            {"start": 21 * HOUR, "rate": 0.15, "type": "TimeOfUse"},
+            {"start": 7 * HOUR, "rate": 0.30, "type": "TimeOfUse"},
+        ],
+    }
+)
+
+
+def _at(hour, day=1):
+    """POSIX seconds at a local time in June 2024, when NZ is on UTC+12."""
+    return datetime(2024, 6, day, tzinfo=AUCKLAND).timestamp() + hour * HOUR
+
+
+@pytest.fixture
+def index():
+    return TariffIndex.from_v3(TIME_OF_USE, "Pacific/Auckland")
+
+
+def test_spans_are_split_across_tariff_boundaries(index):
+    # Before the first start, the last rate carries over from the day before
+    assert index.starts == (0, 7 * HOUR, 21 * HOUR)
+    assert index.rate_at(3 * HOUR) == 0.15
+    # An hour either side of 7am
+    assert index.price(10_000, _at(6), _at(8)) == pytest.approx(2.25)
+    # Two whole days, plus the night either side of them
+    day_rate = (7 * 0.15 + 14 * 0.30 + 3 * 0.15) / 24
+    assert index.price(20_000, _at(0), _at(48)) == pytest.approx(20 * day_rate)
+    assert index.price(1000, _at(22, day=1), _at(30, day=1)) == pytest.approx(0.15)
+
+
+def test_v2_costs_index_the_same_way():
+    v2 = EvnexElectricityCostV2.model_validate(
+        {
+            "currency": "NZD",
+            "costs": [
+                {"start": 0, "cost": 0.15},
+                {"start": 7 * HOUR, "cost": 0.30},
+                {"start": 21 * HOUR, "cost": 0.15},
+            ],
+        }
+    )
+    index = TariffIndex.from_v2(v2, "Pacific/Auckland")
+    assert index.price(10_000, _at(6), _at(8)) == pytest.approx(2.25)
+    with pytest.raises(TariffError):
+        TariffIndex.build([], currency="NZD")
+    with pytest.raises(TariffError):
+        TariffIndex.build([(0, 0.2)], currency="NZD", timezone="Mars/Olympus")
+
+
+def test_sessions_are_reconciled_against_their_reported_cost(index):
+    def session(session_id, start, end, energy, cost):
+        return EvnexChargePointSession.model_validate(
+            {
+                "id": session_id,
+                "type": "session",
+                "attributes": {
+                    "startDate": datetime.fromtimestamp(start - HOUR, AUCKLAND),
+                    "chargingStarted": datetime.fromtimestamp(start, AUCKLAND),
+                    "chargingStopped": datetime.fromtimestamp(end, AUCKLAND),
+                    "endDate": datetime.fromtimestamp(end, AUCKLAND),
+                    "totalPowerUsage": energy,
+                    "totalCost": cost and {"currency": "NZD", "amount": cost},
+                },
+            }
+        )
+
+    in_progress = session("s3", _at(1), _at(2), 1000, None)
+    in_progress.attributes.endDate = in_progress.attributes.chargingStopped = None
+    checks = index.reconcile(
+        [
+            session("s1", _at(6), _at(8), 10_000, 2.25),
+            session("s2", _at(12), _at(13), 7000, 1.50),
+            in_progress,
+        ]
+    )
+
+    assert [check.session_id for check in checks] == ["s1", "s2"]
+    assert [round(check.difference, 2) for check in checks] == [0, -0.6]
+
+
+def test_a_hypothetical_schedule_is_priced_from_local_midnight(index):
+    overnight = ChargingProfile(((0, 32), (7 * HOUR, 0)))
+    daytime = ChargingProfile(((0, 0), (9 * HOUR, 32), (16 * HOUR, 0)))
+    day = datetime(2024, 6, 1, 12, tzinfo=AUCKLAND)
+
+    energy, cost = index.price_profile(overnight, day)
+    assert energy == 32 * 230 * 7
+    assert cost == pytest.approx(energy / 1000 * 0.15)
+    # The same energy in the day costs twice as much
+    assert index.price_profile(daytime, day)[1] == pytest.approx(2 * cost)
+
+
+def test_thousands_of_sessions_price_quickly(index):
+    rng = random.Random(2)
+    spans = []
+    for _ in range(100_000):
+        start = _at(rng.uniform(0, 365 * 24))
+        spans.append((rng.uniform(0, 50_000), start, start + rng.uniform(0, 12 * HOUR)))
+    started = time.perf_counter()
+    costs = index.price_many(spans)
+
+    assert time.perf_counter() - started < 1
+    assert all(
+        0.15 * energy / 1000 - 1e-9 <= cost <= 0.30 * energy / 1000 + 1e-9
+        for cost, (energy, _, _) in zip(costs, spans, strict=True)
+    )
@@ -0,0 +1,101 @@
+"""Tests for adaptive per-charger command timeouts."""
+
+import json
+
+import httpx
+import pytest
+import respx
+
+from evnex.api import Evnex
+from evnex.timeouts import CommandTimeoutPolicy, CommandTimeouts
+
+from .test_cli_resources import DETAIL_URL, DETAIL_V3_PAYLOAD, OVERRIDE_URL
+
+
+def test_unknown_charger_uses_the_command_default():
+    timeouts = CommandTimeouts()
+    assert timeouts.timeout_for("cp-1", 15) == 15
+    assert timeouts.timeout_for("cp-1") == timeouts.policy.initial_timeout
+
+
+def test_fast_charger_fails_fast():
+    timeouts = CommandTimeouts()
+    for _ in range(10):
+        timeouts.observe("cp-1", 0.5)
+    # Converges on the floor rather than the fixed 10 s
+    assert timeouts.timeout_for("cp-1", 10) == timeouts.policy.floor
+
+
+def test_slow_charger_gets_a_longer_timeout():
+    timeouts = CommandTimeouts()
+    for seconds in (9, 14, 11, 16, 12):
+        timeouts.observe("cp-cell", seconds)
+    assert timeouts.timeout_for("cp-cell", 10) > 16
+    assert timeouts.timeout_for("cp-cell", 10) <= timeouts.policy.ceiling
+
+
+def test_timeouts_back_off_until_a_success():
+    policy = CommandTimeoutPolicy(floor=1, ceiling=30)
+    timeouts = CommandTimeouts(policy)
+    timeouts.observe_timeout("cp-1")
+    assert timeouts.timeout_for("cp-1", 5) == 10
+    timeouts.observe_timeout("cp-1")
+    timeouts.observe_timeout("cp-1")
+    assert timeouts.timeout_for("cp-1", 5) == 30  # clamped to the ceiling
+    timeouts.observe("cp-1", 2.0)
+    assert timeouts.timeout_for("cp-1", 5) == 5
+    assert timeouts.stats("cp-1").timeouts == 3
+
+
+def test_cellular_chargers_start_with_a_longer_timeout():
+    timeouts = CommandTimeouts()
+    timeouts.note_connection("cp-cell", "Cell")
+    timeouts.note_connection("cp-wifi", "Wifi")
+    assert timeouts.timeout_for("cp-cell", 10) == 20
+    assert timeouts.timeout_for("cp-wifi", 10) == 10
+    assert timeouts.stats("cp-cell").connection_type == "Cell"
+
+
+def test_policy_rejects_inverted_bounds():
+    with pytest.raises(ValueError):
+        CommandTimeoutPolicy(floor=10, ceiling=5)
+
+
+async def test_client_learns_from_commands_and_detail(resumed_auth):
+    timeouts = CommandTimeouts()
+    client = Evnex(auth=resumed_auth, command_timeouts=timeouts)
+    detail = json.loads(json.dumps(DETAIL_V3_PAYLOAD))
+    detail["data"]["attributes"]["connectionConfiguration"] = {
+        "automaticallyManaged": True,
+        "preferredConnectionType": "Cell",
+        "updatedDate": "2024-06-01T00:00:00Z",
+        "wifiConnected": False,
+    }
+    with respx.mock:
+        respx.get(DETAIL_URL).mock(return_value=httpx.Response(200, json=detail))
+        route = respx.post(OVERRIDE_URL).mock(return_value=httpx.Response(200, json={}))
+        await client.get_charge_point_detail_v3("cp-0000001")
+        await client.set_charge_point_override("cp-0000001", charge_now=True)
+
+    # The first command is seeded from its fixed default, doubled for cellular
+    sent_timeout = route.calls[0].request.extensions["timeout"]["read"]
+    assert sent_timeout == 20
+    stats = client.command_timeouts.all_stats()["cp-0000001"]
+    assert stats.samples == 1
+    assert stats.connection_type == "Cell"
+
+
+async def test_command_timeout_is_recorded(resumed_auth):
+    client = Evnex(auth=resumed_auth, command_timeouts=CommandTimeouts())
+    with respx.mock:
+        respx.post(OVERRIDE_URL).mock(side_effect=httpx.ReadTimeout("offline"))
+        with pytest.raises(httpx.ReadTimeout):
+            await client.set_charge_point_override("cp-0000001", charge_now=True)
+    assert client.command_timeouts.stats("cp-0000001").timeouts == 1
+
+
+async def test_fixed_timeouts_without_tracking(client):
+    with respx.mock:
+        route = respx.post(OVERRIDE_URL).mock(return_value=httpx.Response(200, json={}))
+        await client.set_charge_point_override("cp-0000001", charge_now=True)
+    assert route.calls[0].request.extensions["timeout"]["read"] == 10